@@ -0,0 +1,155 @@
+import argparse
+import json
+import math
+import time
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+BACKEND_NAME = "orjson" if orjson is not None else "json"
+DEFAULT_BENCHMARK_PATH = Path("ZOMBIEPROPERTIES_UPDATED.json")
+
+# orjson reads integers wider than 64 bits as floats; the stdlib keeps them exact.
+# Any run of 19+ digits sends the document to the stdlib parser.
+DIGIT_MASK = bytes(48 if 48 <= byte <= 57 else 32 for byte in range(256))
+LONG_DIGIT_RUN = b"0" * 19
+
+
+def has_long_digit_run(data):
+    return LONG_DIGIT_RUN in data.translate(DIGIT_MASK)
+
+
+def loads(data):
+    if orjson is not None and not has_long_digit_run(data):
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # NaN, a BOM or a bad document: let the stdlib accept it or raise its own error.
+            pass
+    return json.loads(data.decode("utf-8"))
+
+
+def load_path(path):
+    return loads(Path(path).read_bytes())
+
+
+def stdlib_separators(indent):
+    if indent is None:
+        return (",", ":")
+    return (",", ": ")
+
+
+def floats_match_stdlib(value, default=None):
+    # orjson and json.dumps spell floats the same way only inside this range.
+    pending = [value]
+    while pending:
+        item = pending.pop()
+        if isinstance(item, (str, bool, int)) or item is None:
+            continue
+        if isinstance(item, float):
+            if not math.isfinite(item):
+                return False
+            magnitude = abs(item)
+            if magnitude and not 1e-4 <= magnitude < 1e16:
+                return False
+        elif isinstance(item, dict):
+            pending.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            pending.extend(item)
+        elif default is not None:
+            pending.append(default(item))
+        else:
+            return False
+    return True
+
+
+def dumps(value, indent=None, default=None):
+    """Same text as json.dumps(value, indent=indent, separators=stdlib_separators(indent))."""
+    if orjson is not None and indent in (None, 2):
+        try:
+            if floats_match_stdlib(value, default):
+                option = orjson.OPT_INDENT_2 if indent == 2 else 0
+                text = orjson.dumps(value, default=default, option=option).decode("utf-8")
+                if text.isascii():
+                    return text
+        except (orjson.JSONEncodeError, TypeError):
+            pass
+    return json.dumps(value, default=default, indent=indent, separators=stdlib_separators(indent))
+
+
+def time_call(function, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - started
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def run_benchmark(path, repeat):
+    data = Path(path).read_bytes()
+    document = json.loads(data.decode("utf-8"))
+    if loads(data) != document:
+        raise ValueError(f"{BACKEND_NAME} decoded {path} differently from json")
+
+    rows = [
+        (
+            "load",
+            time_call(lambda: json.loads(data.decode("utf-8")), repeat),
+            time_call(lambda: loads(data), repeat),
+        )
+    ]
+    for indent in (None, 2):
+        expected = json.dumps(document, indent=indent, separators=stdlib_separators(indent))
+        if dumps(document, indent=indent) != expected:
+            raise ValueError(f"{BACKEND_NAME} output differs from json for indent={indent}")
+        rows.append(
+            (
+                f"dump indent={indent}",
+                time_call(
+                    lambda: json.dumps(document, indent=indent, separators=stdlib_separators(indent)),
+                    repeat,
+                ),
+                time_call(lambda: dumps(document, indent=indent), repeat),
+            )
+        )
+
+    print(f"{path} ({len(data)} bytes), best of {repeat}, backend: {BACKEND_NAME}")
+    for label, stdlib_seconds, backend_seconds in rows:
+        print(
+            f"  {label:<16} json {stdlib_seconds * 1000:8.2f} ms   "
+            f"{BACKEND_NAME} {backend_seconds * 1000:8.2f} ms   "
+            f"x{stdlib_seconds / backend_seconds:.2f}"
+        )
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Compare the selected JSON backend with the stdlib json module."
+    )
+    parser.add_argument(
+        "path",
+        nargs="?",
+        type=Path,
+        default=DEFAULT_BENCHMARK_PATH,
+        help=f"JSON file to load and re-encode. Default: {DEFAULT_BENCHMARK_PATH}",
+    )
+    parser.add_argument("--repeat", type=int, default=10, help="Runs per measurement. Default: 10")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.repeat < 1:
+        raise SystemExit("--repeat must be at least 1")
+    run_benchmark(args.path, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
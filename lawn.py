@@ -0,0 +1,79 @@
+LAWN_COLUMN_REGIONS = {
+    "back": (0, 4),
+    "middle": (3, 5),
+    "front": (5, 8),
+}
+
+
+def bit_span(low, high):
+    if low > high:
+        return 0
+    if low < 0:
+        raise ValueError(f"lawn coordinate {low} cannot be negative")
+    return ((1 << (high - low + 1)) - 1) << low
+
+
+def bits_of(values):
+    mask = 0
+    for value in values:
+        if value < 0:
+            raise ValueError(f"lawn coordinate {value} cannot be negative")
+        mask |= 1 << value
+    return mask
+
+
+def iter_bits(mask):
+    while mask:
+        low_bit = mask & -mask
+        yield low_bit.bit_length() - 1
+        mask ^= low_bit
+
+
+def region_column_mask(region_names, column_regions=LAWN_COLUMN_REGIONS):
+    mask = 0
+    for region_name in region_names:
+        mask |= bit_span(*column_regions[region_name])
+    return mask
+
+
+class LawnOccupancy:
+    """Taken lawn cells, kept as one row bitmask per column (bit y of column x set
+    means cell (x, y) is taken). A whole column of candidate cells is checked
+    against it with a single AND."""
+
+    def __init__(self, cells=()):
+        self.columns = {}
+        self.update(cells)
+
+    def add(self, x, y):
+        self.add_rows(x, bits_of((y,)))
+
+    def add_rows(self, x, row_mask):
+        self.columns[x] = self.columns.get(x, 0) | row_mask
+
+    def update(self, cells):
+        for x, y in cells:
+            self.add(x, y)
+
+    def copy(self):
+        occupancy = LawnOccupancy()
+        occupancy.columns = dict(self.columns)
+        return occupancy
+
+    def __contains__(self, cell):
+        x, y = cell
+        return y >= 0 and bool(self.columns.get(x, 0) >> y & 1)
+
+    def __iter__(self):
+        for x in sorted(self.columns):
+            for y in iter_bits(self.columns[x]):
+                yield x, y
+
+    def __len__(self):
+        return sum(rows.bit_count() for rows in self.columns.values())
+
+    def fits(self, x, row_mask):
+        return not self.columns.get(x, 0) & row_mask
+
+    def free_cells(self, columns, row_mask):
+        return [(x, y) for x in columns for y in iter_bits(row_mask & ~self.columns.get(x, 0))]
@@ -1,17 +1,32 @@
+import argparse
+import bisect
 import copy
+import hashlib
+import heapq
 import json
+import multiprocessing
+import os
 import random
 import re
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+import json_backend
+from lawn import LAWN_COLUMN_REGIONS, LawnOccupancy, bit_span, bits_of, iter_bits
+from sampling import ShrinkingWeightedSampler, WeightedSampler
+
 APP_DIR = Path(getattr(sys, "_MEIPASS", Path(__file__).resolve().parent))
 
 templates=["farfuture"]
-chosenone=random.choice(templates)
+chosenone=random.Random().choice(templates)
 DEFAULT_TEMPLATE_PATH = Path(chosenone+".json")
 DEFAULT_TYPES_PATH = Path("ZOMBIETYPES_UPDATED.json")
 DEFAULT_PROPS_PATH = Path("ZOMBIEPROPERTIES_UPDATED.json")
+DEFAULT_CATALOG_SNAPSHOT_NAME = ".zombie_catalog.snapshot"
+CATALOG_SNAPSHOT_VERSION = 3
+ZOMBIE_CATALOG_CACHE = {}
 
 DEFAULT_AMBUSH_WAVE_MESSAGES = {
     "egypt_imp": "Feline Frenzy!",
@@ -113,14 +128,26 @@ DEFAULT_STAMPEDE_MODULES = [
     "RTID(StampedeDinoSpawns@LevelModules)",
 ]
 
-def generate_random_railcarts():
+class LevelRandom:
+    def __init__(self, seed=None):
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(64)
+        self.seed = seed
+
+    def stream(self, *path):
+        # String seeds are hashed with SHA-512, so a named stream is the same in
+        # every process and never shifts when another subsystem draws more numbers.
+        return random.Random("/".join(str(part) for part in (self.seed, *path)))
+
+
+def generate_random_railcarts(rng):
     rails = []
     railcarts = []
-    num_rails = random.randint(3, 5)
+    num_rails = rng.randint(3, 5)
     for _ in range(num_rails):
-        column = random.randint(0, 8)
-        row_start = random.randint(0, 3)
-        length = random.randint(2, 5)
+        column = rng.randint(0, 8)
+        row_start = rng.randint(0, 3)
+        length = rng.randint(2, 5)
         row_end = min(row_start + length - 1, 4)
         rails.append({"Column": column, "RowEnd": row_end, "RowStart": row_start})
         max_carts = 1
@@ -129,10 +156,10 @@ def generate_random_railcarts():
         if length >= 5:
             max_carts = 3
         num_carts = 1
-        if random.random() < 0.3:  # 30% chance for more
-            num_carts = random.randint(1, max_carts)
+        if rng.random() < 0.3:  # 30% chance for more
+            num_carts = rng.randint(1, max_carts)
         rows = list(range(row_start, row_end + 1))
-        random.shuffle(rows)
+        rng.shuffle(rows)
         for i in range(num_carts):
             if i < len(rows):
                 railcarts.append({"Column": column, "Row": rows[i]})
@@ -159,6 +186,10 @@ DEFAULT_JAM_STYLE_OVERRIDES = {
     "eighties_armor4": "jam_all",
 }
 
+WAVE_FILL_MODES = ("greedy", "knapsack")
+FROST_WIND_PATTERNS = ("split", "left", "right", "alternate", "random")
+# Wave costs are WavePointCost / 100, so the knapsack works in WavePointCost units.
+WAVE_POINT_SCALE = 100
 JAM_ALL_STYLE = "jam_all"
 
 DINO_PTERO_SUPPORT_ZOMBIES = {
@@ -191,8 +222,7 @@ def resolve_input_path(path):
 def load_json_file(path, label):
     resolved_path = resolve_input_path(path)
     try:
-        with resolved_path.open("r", encoding="utf-8") as file:
-            return json.load(file)
+        return json_backend.load_path(resolved_path)
     except FileNotFoundError as exc:
         raise FileNotFoundError(f"{label} file not found: {resolved_path}") from exc
     except json.JSONDecodeError as exc:
@@ -217,6 +247,16 @@ def as_int(value, field_name):
         raise ValueError(f"{field_name} must be an integer, got {value!r}") from exc
 
 
+def copy_config_value(value):
+    # Only the top level is copied; nested values stay shared with the template
+    # and must be replaced, not mutated, by callers.
+    if isinstance(value, dict):
+        return dict(value)
+    if isinstance(value, list):
+        return list(value)
+    return value
+
+
 def parse_int_range(raw_range, field_name):
     if not isinstance(raw_range, list) or len(raw_range) != 2:
         raise ValueError(f"{field_name} must be [min, max]")
@@ -258,21 +298,44 @@ def make_alias_lookup(objects):
     return lookup
 
 
-def get_zombie_type_aliases(types_objects):
-    alias_set = set()
-    for obj in types_objects:
-        if obj.get("objclass") != "ZombieType":
-            continue
-        aliases = obj.get("aliases")
-        if not isinstance(aliases, list):
-            continue
-        for alias in aliases:
-            if isinstance(alias, str) and alias:
-                alias_set.add(alias)
-    return alias_set
+class AliasAllocator:
+    def __init__(self, aliases=()):
+        self.reserved = set(aliases)
+        self.next_suffix = {}
+
+    def __contains__(self, alias):
+        return alias in self.reserved
+
+    def __iter__(self):
+        return iter(self.reserved)
+
+    def __len__(self):
+        return len(self.reserved)
+
+    def add(self, alias):
+        self.reserved.add(alias)
+
+    def allocate(self, base_alias):
+        if base_alias not in self.reserved:
+            self.reserved.add(base_alias)
+            return base_alias
+
+        # Aliases are never released, so every suffix below the stored one is
+        # still taken and probing can resume where the last allocation stopped.
+        idx = self.next_suffix.get(base_alias, 2)
+        alias = f"{base_alias}_{idx}"
+        while alias in self.reserved:
+            idx += 1
+            alias = f"{base_alias}_{idx}"
+        self.next_suffix[base_alias] = idx + 1
+        self.reserved.add(alias)
+        return alias
 
 
 def make_unique_alias(base_alias, existing_aliases):
+    if isinstance(existing_aliases, AliasAllocator):
+        return existing_aliases.allocate(base_alias)
+
     alias = base_alias
     idx = 2
     while alias in existing_aliases:
@@ -308,28 +371,6 @@ def extract_portal_group_suffix(zombie_alias):
     return parts[-1] if parts else str(zombie_alias).strip()
 
 
-def build_zombie_type_metadata(types_objects):
-    metadata = {}
-    for obj in types_objects:
-        if obj.get("objclass") != "ZombieType":
-            continue
-        aliases = obj.get("aliases")
-        if not isinstance(aliases, list):
-            continue
-        objdata = obj.get("objdata", {})
-        raw_home_world = str(objdata.get("HomeWorld", "")).strip().lower()
-        portal_world = normalize_portal_world_name(raw_home_world)
-        for alias in aliases:
-            if not isinstance(alias, str) or not alias:
-                continue
-            metadata[alias] = {
-                "raw_home_world": raw_home_world,
-                "portal_world": portal_world,
-                "suffix": extract_portal_group_suffix(alias),
-            }
-    return metadata
-
-
 def normalize_generated_portal_group_modes(raw_modes, field_name):
     if raw_modes is None:
         return list(DEFAULT_GENERATED_PORTAL_GROUP_MODES)
@@ -462,86 +503,317 @@ def collect_initial_zombie_aliases(initial_cfg, variant_alias_to_roll=None):
     return aliases
 
 
-def resolve_zombie_weights(selected_pool, types_objects, props_objects):
-    type_lookup = {}
-    for obj in types_objects:
-        if obj.get("objclass") != "ZombieType":
-            continue
-        aliases = obj.get("aliases")
-        if not isinstance(aliases, list):
-            continue
-        for alias in aliases:
-            if isinstance(alias, str) and alias and alias not in type_lookup:
-                type_lookup[alias] = obj
+def resolve_zombie_properties_entry(zombie_alias, type_entry, props_lookup):
+    properties_rtid = type_entry.get("objdata", {}).get("Properties")
+    if not properties_rtid:
+        return None, None, f'"{zombie_alias}": missing objdata.Properties in ZombieTypes'
 
-    props_lookup = make_alias_lookup(props_objects)
+    try:
+        props_alias = extract_rtid_name(
+            properties_rtid,
+            f"ZombieTypes[{zombie_alias}].objdata.Properties",
+        )
+    except ValueError as exc:
+        return None, None, f'"{zombie_alias}": {exc}'
+
+    props_entry = props_lookup.get(props_alias)
+    if props_entry is None:
+        return (
+            props_alias,
+            None,
+            f'"{zombie_alias}": properties alias "{props_alias}" not found in ZombieProperties',
+        )
+    return props_alias, props_entry, None
+
+
+class ZombieCatalog:
+    def __init__(
+        self,
+        type_entries,
+        props_entries,
+        props_aliases,
+        metadata,
+        costs,
+        cost_errors,
+        jam_styles,
+    ):
+        self.type_entries = type_entries
+        self.props_entries = props_entries
+        self.props_aliases = props_aliases
+        self.metadata = metadata
+        self.costs = costs
+        self.cost_errors = cost_errors
+        self.jam_styles = jam_styles
+        self.aliases = set(type_entries)
+
+    @classmethod
+    def from_objects(cls, types_objects, props_objects):
+        props_lookup = make_alias_lookup(props_objects)
+        type_entries = {}
+        props_entries = {}
+        props_aliases = {}
+        metadata = {}
+        costs = {}
+        cost_errors = {}
+        jam_styles = {}
+
+        for obj in types_objects:
+            if obj.get("objclass") != "ZombieType":
+                continue
+            aliases = obj.get("aliases")
+            if not isinstance(aliases, list):
+                continue
+            objdata = obj.get("objdata", {})
+            raw_home_world = str(objdata.get("HomeWorld", "")).strip().lower()
+            portal_world = normalize_portal_world_name(raw_home_world)
 
-    zombie_costs = {}
-    errors = []
+            for zombie_alias in aliases:
+                if not isinstance(zombie_alias, str) or not zombie_alias:
+                    continue
+                # Portal metadata is last-wins, every other lookup keeps the first type entry.
+                metadata[zombie_alias] = {
+                    "raw_home_world": raw_home_world,
+                    "portal_world": portal_world,
+                    "suffix": extract_portal_group_suffix(zombie_alias),
+                }
+                if zombie_alias in type_entries:
+                    continue
+                type_entries[zombie_alias] = obj
 
-    for zombie_alias in selected_pool:
-        type_entry = type_lookup.get(zombie_alias)
-        if type_entry is None:
-            errors.append(f'"{zombie_alias}": alias not found in ZombieTypes')
-            continue
+                props_alias, props_entry, error = resolve_zombie_properties_entry(
+                    zombie_alias,
+                    obj,
+                    props_lookup,
+                )
+                if error is not None:
+                    cost_errors[zombie_alias] = error
+                    continue
+                props_aliases[zombie_alias] = props_alias
+                props_entries[zombie_alias] = props_entry
+
+                props_objdata = props_entry.get("objdata", {})
+                jam_style = props_objdata.get("JamStyle")
+                if isinstance(jam_style, str) and jam_style.strip():
+                    jam_styles[zombie_alias] = jam_style.strip()
+
+                cost_raw = props_objdata.get("WavePointCost")
+                if cost_raw is None:
+                    cost_errors[zombie_alias] = (
+                        f'"{zombie_alias}": properties "{props_alias}" missing objdata.WavePointCost'
+                    )
+                    continue
+                try:
+                    cost_value = as_number(
+                        cost_raw,
+                        f"ZombieProperties[{props_alias}].objdata.WavePointCost",
+                    )
+                except ValueError as exc:
+                    cost_errors[zombie_alias] = f'"{zombie_alias}": {exc}'
+                    continue
+                costs[zombie_alias] = cost_value / 100.0
+
+        return cls(
+            type_entries,
+            props_entries,
+            props_aliases,
+            metadata,
+            costs,
+            cost_errors,
+            jam_styles,
+        )
 
-        properties_rtid = type_entry.get("objdata", {}).get("Properties")
-        if not properties_rtid:
-            errors.append(f'"{zombie_alias}": missing objdata.Properties in ZombieTypes')
-            continue
+    @classmethod
+    def from_snapshot(cls, state):
+        return cls(
+            state["type_entries"],
+            state["props_entries"],
+            state["props_aliases"],
+            state["metadata"],
+            state["costs"],
+            state["cost_errors"],
+            state["jam_styles"],
+        )
 
-        try:
-            props_alias = extract_rtid_name(
-                properties_rtid,
-                f"ZombieTypes[{zombie_alias}].objdata.Properties",
-            )
-        except ValueError as exc:
-            errors.append(f'"{zombie_alias}": {exc}')
-            continue
+    def to_snapshot(self):
+        # Plain JSON containers only: the snapshot is stored as JSON, so reading
+        # it never runs code.
+        return {
+            "type_entries": self.type_entries,
+            "props_entries": self.props_entries,
+            "props_aliases": self.props_aliases,
+            "metadata": self.metadata,
+            "costs": self.costs,
+            "cost_errors": self.cost_errors,
+            "jam_styles": self.jam_styles,
+        }
 
-        props_entry = props_lookup.get(props_alias)
-        if props_entry is None:
-            errors.append(
-                f'"{zombie_alias}": properties alias "{props_alias}" not found in ZombieProperties'
-            )
-            continue
+    def __contains__(self, zombie_alias):
+        return zombie_alias in self.type_entries
 
-        cost_raw = props_entry.get("objdata", {}).get("WavePointCost")
-        if cost_raw is None:
-            errors.append(
-                f'"{zombie_alias}": properties "{props_alias}" missing objdata.WavePointCost'
-            )
+    def type_entry(self, zombie_alias):
+        return self.type_entries.get(zombie_alias)
+
+    def properties_entry(self, zombie_alias):
+        return self.props_entries.get(zombie_alias)
+
+    def cost(self, zombie_alias):
+        return self.costs.get(zombie_alias)
+
+    def jam_style(self, zombie_alias):
+        return self.jam_styles.get(zombie_alias)
+
+    def portal_world(self, zombie_alias, default_world="modern"):
+        return self.metadata.get(zombie_alias, {}).get("portal_world", default_world)
+
+    def portal_group_suffix(self, zombie_alias):
+        metadata = self.metadata.get(zombie_alias)
+        if metadata is None:
+            return extract_portal_group_suffix(zombie_alias)
+        return metadata["suffix"]
+
+
+def get_catalog_source_key(path):
+    stat = path.stat()
+    return {"path": str(path), "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+
+def hash_catalog_source(path):
+    with path.open("rb") as file:
+        return hashlib.sha1(file.read()).hexdigest()
+
+
+def read_catalog_snapshot(snapshot_path, source_paths):
+    try:
+        snapshot = json_backend.load_path(snapshot_path)
+    except (OSError, ValueError):
+        # The snapshot is only a cache: a missing, truncated or older (pickled)
+        # file means rebuild.
+        return None
+    if not isinstance(snapshot, dict) or snapshot.get("version") != CATALOG_SNAPSHOT_VERSION:
+        return None
+
+    stored_sources = snapshot.get("sources")
+    if not isinstance(stored_sources, list) or len(stored_sources) != len(source_paths):
+        return None
+    for stored, source_path in zip(stored_sources, source_paths):
+        if not isinstance(stored, dict):
+            return None
+        current = get_catalog_source_key(source_path)
+        if stored.get("path") != current["path"]:
+            return None
+        if stored.get("mtime_ns") == current["mtime_ns"] and stored.get("size") == current["size"]:
             continue
+        # mtime alone is not trusted: touched-but-identical files keep the snapshot.
+        if stored.get("sha1") != hash_catalog_source(source_path):
+            return None
+    try:
+        return ZombieCatalog.from_snapshot(snapshot["catalog"])
+    except (KeyError, TypeError):
+        return None
 
+
+def write_catalog_snapshot(snapshot_path, source_paths, catalog):
+    snapshot = {
+        "version": CATALOG_SNAPSHOT_VERSION,
+        "sources": [
+            dict(get_catalog_source_key(path), sha1=hash_catalog_source(path))
+            for path in source_paths
+        ],
+        "catalog": catalog.to_snapshot(),
+    }
+    temp_path = snapshot_path.with_name(snapshot_path.name + ".tmp")
+    try:
+        temp_path.write_text(json_backend.dumps(snapshot), encoding="utf-8")
+        os.replace(temp_path, snapshot_path)
+    except OSError:
+        # A read-only install (e.g. a frozen exe) just skips the snapshot.
         try:
-            cost_value = as_number(
-                cost_raw,
-                f"ZombieProperties[{props_alias}].objdata.WavePointCost",
-            )
-        except ValueError as exc:
-            errors.append(f'"{zombie_alias}": {exc}')
-            continue
+            temp_path.unlink()
+        except OSError:
+            pass
+
+
+def get_zombie_catalog(types_file, props_file, use_snapshot=True):
+    types_path = resolve_input_path(types_file).resolve()
+    props_path = resolve_input_path(props_file).resolve()
+    source_paths = [types_path, props_path]
+    for source_path, label in ((types_path, "Zombie types"), (props_path, "Zombie properties")):
+        if not source_path.exists():
+            raise FileNotFoundError(f"{label} file not found: {source_path}")
+
+    cache_key = tuple(
+        tuple(get_catalog_source_key(source_path).values())
+        for source_path in source_paths
+    )
+    catalog = ZOMBIE_CATALOG_CACHE.get(cache_key)
+    if catalog is None:
+        catalog = load_zombie_catalog(types_file, props_file, source_paths, use_snapshot)
+        ZOMBIE_CATALOG_CACHE.clear()
+        ZOMBIE_CATALOG_CACHE[cache_key] = catalog
+    return catalog
+
+
+def load_zombie_catalog(types_file, props_file, source_paths, use_snapshot=True):
+    types_path, props_path = source_paths
+
+    # The snapshot always sits next to the props file; templates can only turn it off.
+    snapshot_path = props_path.with_name(DEFAULT_CATALOG_SNAPSHOT_NAME) if use_snapshot else None
+
+    if snapshot_path is not None:
+        catalog = read_catalog_snapshot(snapshot_path, source_paths)
+        if catalog is not None:
+            return catalog
+
+    types_data = load_json_file(types_path, "Zombie types")
+    props_data = load_json_file(props_path, "Zombie properties")
+    types_objects = types_data.get("objects", [])
+    props_objects = props_data.get("objects", [])
+    if not isinstance(types_objects, list):
+        raise ValueError(f"{types_file} must contain an 'objects' array")
+    if not isinstance(props_objects, list):
+        raise ValueError(f"{props_file} must contain an 'objects' array")
+
+    catalog = ZombieCatalog.from_objects(types_objects, props_objects)
+    if snapshot_path is not None:
+        write_catalog_snapshot(snapshot_path, source_paths, catalog)
+    return catalog
+
+
+def resolve_zombie_sources(template):
+    sources = template.get("zombie_sources", {})
+    if not isinstance(sources, dict):
+        raise ValueError("zombie_sources must be an object")
+    types_file = Path(str(sources.get("types_file", DEFAULT_TYPES_PATH)))
+    props_file = Path(str(sources.get("props_file", DEFAULT_PROPS_PATH)))
+    catalog_snapshot = sources.get("catalog_snapshot")
+    if catalog_snapshot is None:
+        catalog_snapshot = True
+    elif not isinstance(catalog_snapshot, bool):
+        raise ValueError("zombie_sources.catalog_snapshot must be true or false")
+    return types_file, props_file, catalog_snapshot
+
+
+def resolve_zombie_weights(selected_pool, zombie_catalog):
+    costs = zombie_catalog.costs
+    cost_errors = zombie_catalog.cost_errors
+
+    zombie_costs = {}
+    errors = []
 
-        zombie_costs[zombie_alias] = cost_value / 100.0
+    for zombie_alias in selected_pool:
+        if zombie_alias in costs:
+            zombie_costs[zombie_alias] = costs[zombie_alias]
+        elif zombie_alias in cost_errors:
+            errors.append(cost_errors[zombie_alias])
+        else:
+            errors.append(f'"{zombie_alias}": alias not found in ZombieTypes')
 
     if errors:
         raise ValueError("Zombie weight extraction failed:\n- " + "\n- ".join(errors))
     return zombie_costs
 
 
-def resolve_zombie_jam_styles(selected_pool, types_objects, props_objects, overrides=None):
-    type_lookup = {}
-    for obj in types_objects:
-        if obj.get("objclass") != "ZombieType":
-            continue
-        aliases = obj.get("aliases")
-        if not isinstance(aliases, list):
-            continue
-        for alias in aliases:
-            if isinstance(alias, str) and alias and alias not in type_lookup:
-                type_lookup[alias] = obj
-
-    props_lookup = make_alias_lookup(props_objects)
+def resolve_zombie_jam_styles(selected_pool, zombie_catalog, overrides=None):
     overrides = overrides or {}
     jam_styles = {}
 
@@ -551,41 +823,76 @@ def resolve_zombie_jam_styles(selected_pool, types_objects, props_objects, overr
             jam_styles[zombie_alias] = override_style.strip()
             continue
 
-        type_entry = type_lookup.get(zombie_alias)
-        if type_entry is None:
-            continue
-
-        properties_rtid = type_entry.get("objdata", {}).get("Properties")
-        if not properties_rtid:
-            continue
+        jam_style = zombie_catalog.jam_style(zombie_alias)
+        if jam_style is not None:
+            jam_styles[zombie_alias] = jam_style
 
-        try:
-            props_alias = extract_rtid_name(
-                properties_rtid,
-                f"ZombieTypes[{zombie_alias}].objdata.Properties",
-            )
-        except ValueError:
-            continue
+    return jam_styles
 
-        props_entry = props_lookup.get(props_alias)
-        if props_entry is None:
-            continue
 
-        jam_style = props_entry.get("objdata", {}).get("JamStyle")
-        if isinstance(jam_style, str) and jam_style.strip():
-            jam_styles[zombie_alias] = jam_style.strip()
+class RequiredZombieQueue:
+    def __init__(self, zombie_names, zombie_costs):
+        buckets = {}
+        for order, zombie_name in enumerate(zombie_names):
+            buckets.setdefault(zombie_costs[zombie_name], []).append((order, zombie_name))
+        self.costs = sorted(buckets)
+        self.buckets = [buckets[cost] for cost in self.costs]
+        # Entries are never shifted out of a bucket: taken ones are flagged and
+        # each bucket keeps the index of its first entry still queued.
+        self.taken = [bytearray(len(bucket)) for bucket in self.buckets]
+        self.heads = [0] * len(self.buckets)
+        self.size = len(zombie_names)
+
+    def __len__(self):
+        return self.size
+
+    def next_queued(self, bucket_idx, position):
+        taken = self.taken[bucket_idx]
+        while position < len(taken) and taken[position]:
+            position += 1
+        return position
+
+    def take(self, bucket_idx, position):
+        self.taken[bucket_idx][position] = 1
+        if position == self.heads[bucket_idx]:
+            self.heads[bucket_idx] = self.next_queued(bucket_idx, position + 1)
+        self.size -= 1
+        return self.buckets[bucket_idx][position][1]
+
+    def pop(self, max_cost, validator=None):
+        # Buckets above the budget are never visited. The affordable bucket heads
+        # are compared in shuffle order, so the first valid entry matches a
+        # front-to-back scan of the original order.
+        limit = bisect.bisect_right(self.costs, max_cost + 1e-9)
+        heads = []
+        for bucket_idx in range(limit):
+            position = self.heads[bucket_idx]
+            if position < len(self.buckets[bucket_idx]):
+                heads.append((self.buckets[bucket_idx][position][0], bucket_idx, position))
+        if not heads:
+            return None
 
-    return jam_styles
+        _, bucket_idx, position = min(heads)
+        if validator is None or validator(self.buckets[bucket_idx][position][1]):
+            return self.take(bucket_idx, position)
+
+        # The front entry was rejected: merge the affordable buckets past it.
+        heapq.heapify(heads)
+        while heads:
+            _, bucket_idx, position = heapq.heappop(heads)
+            bucket = self.buckets[bucket_idx]
+            if validator(bucket[position][1]):
+                return self.take(bucket_idx, position)
+            position = self.next_queued(bucket_idx, position + 1)
+            if position < len(bucket):
+                heapq.heappush(heads, (bucket[position][0], bucket_idx, position))
+        return None
 
 
-def pop_required_zombie(required_zombies, zombie_costs, max_cost, validator=None):
-    for idx, zombie_name in enumerate(required_zombies):
-        if zombie_costs[zombie_name] > (max_cost + 1e-9):
-            continue
-        if validator is not None and not validator(zombie_name):
-            continue
-        return required_zombies.pop(idx)
-    return None
+def pop_required_zombie(required_zombies, max_cost, validator=None):
+    if not required_zombies:
+        return None
+    return required_zombies.pop(max_cost, validator=validator)
 
 
 def normalize_string_list(value, field_name):
@@ -626,21 +933,13 @@ def get_config_weight(config, field_name, default=1.0):
     return weight
 
 
-def pick_weighted_dict(entries, field_name):
-    total_weight = sum(entry["weight"] for entry in entries)
-    if total_weight <= 0:
+def pick_sampled_dict(rng, entries, sampler, field_name):
+    if sampler.total() <= 0:
         raise ValueError(f"{field_name} must contain at least one entry with weight > 0")
+    return entries[sampler.pick(rng)]
 
-    roll = random.uniform(0.0, total_weight)
-    running = 0.0
-    for entry in entries:
-        running += entry["weight"]
-        if roll <= running:
-            return entry
-    return entries[-1]
 
-
-def resolve_wave_structure(wave_cfg):
+def resolve_wave_structure(rng, wave_cfg):
     def pick_wave_int(field_name, range_field_name, default_range):
         if field_name in wave_cfg:
             value = as_int(wave_cfg.get(field_name), f"wave_settings.{field_name}")
@@ -650,7 +949,7 @@ def resolve_wave_structure(wave_cfg):
                 low, high = default_range
             else:
                 low, high = parse_int_range(raw_range, f"wave_settings.{range_field_name}")
-            value = random.randint(low, high)
+            value = rng.randint(low, high)
         if value <= 0:
             raise ValueError(f"wave_settings.{field_name} must be > 0")
         return value
@@ -685,7 +984,7 @@ def resolve_wave_structure(wave_cfg):
     return flag_interval, flag_count, wave_count
 
 
-def build_plantfood_waves(wave_cfg, wave_count, flag_interval):
+def build_plantfood_waves(rng, wave_cfg, wave_count, flag_interval):
     plantfood_mode = str(wave_cfg.get("plantfood_mode", "auto")).strip().lower()
     if plantfood_mode == "auto":
         plantfood_mode = "interval_jittered" if "plantfood_interval" in wave_cfg else "count_range"
@@ -695,13 +994,13 @@ def build_plantfood_waves(wave_cfg, wave_count, flag_interval):
         max_pf = as_int(wave_cfg.get("max_pf", 3), "wave_settings.max_pf")
         if max_pf < min_pf:
             raise ValueError("wave_settings.max_pf cannot be lower than wave_settings.min_pf")
-        pf_count = min(random.randint(min_pf, max_pf), wave_count)
-        return set(random.sample(range(1, wave_count + 1), pf_count))
+        pf_count = min(rng.randint(min_pf, max_pf), wave_count)
+        return set(rng.sample(range(1, wave_count + 1), pf_count))
 
     if plantfood_mode == "fixed_count":
         pf_count = as_int(wave_cfg.get("plantfood_count", 0), "wave_settings.plantfood_count")
         pf_count = max(0, min(pf_count, wave_count))
-        return set(random.sample(range(1, wave_count + 1), pf_count))
+        return set(rng.sample(range(1, wave_count + 1), pf_count))
 
     if plantfood_mode in {"interval", "interval_jittered"}:
         interval = as_int(wave_cfg.get("plantfood_interval", 8), "wave_settings.plantfood_interval")
@@ -725,7 +1024,7 @@ def build_plantfood_waves(wave_cfg, wave_count, flag_interval):
                     candidates = non_flag_candidates
             sample_count = min(per_interval, len(candidates))
             if sample_count > 0:
-                pf_waves.update(random.sample(candidates, sample_count))
+                pf_waves.update(rng.sample(candidates, sample_count))
         return pf_waves
 
     raise ValueError(
@@ -801,13 +1100,13 @@ def expand_zombie_roll_pool(roll_pool, zombie_variant_groups):
     return expanded_pool
 
 
-def pick_zombie_variant_alias(zombie_name, zombie_variant_groups=None):
+def pick_zombie_variant_alias(rng, zombie_name, zombie_variant_groups=None):
     if zombie_variant_groups is None:
         return zombie_name
     variants = zombie_variant_groups.get(zombie_name)
     if not variants:
         return zombie_name
-    return random.choice(variants)
+    return rng.choice(variants)
 
 
 def register_zombie_usage(zombies_used, zombie_name, zombie_variant_groups=None):
@@ -818,7 +1117,7 @@ def register_zombie_usage(zombies_used, zombie_name, zombie_variant_groups=None)
         zombies_used.update(zombie_variant_groups[zombie_name])
 
 
-def apply_zombie_pool_dependencies(selected_pool, dependency_cfg, variant_alias_to_roll=None):
+def apply_zombie_pool_dependencies(rng, selected_pool, dependency_cfg, variant_alias_to_roll=None):
     if dependency_cfg is None:
         return selected_pool[:]
     if not isinstance(dependency_cfg, list):
@@ -873,7 +1172,7 @@ def apply_zombie_pool_dependencies(selected_pool, dependency_cfg, variant_alias_
                 if add_any_count < 1:
                     raise ValueError(f"{entry_label}.add_any_count must be >= 1")
                 candidates = [alias for alias in requires_any if alias not in pool_set]
-                random.shuffle(candidates)
+                rng.shuffle(candidates)
                 for zombie_name in candidates[:add_any_count]:
                     resolved_pool.append(zombie_name)
                     pool_set.add(zombie_name)
@@ -882,7 +1181,7 @@ def apply_zombie_pool_dependencies(selected_pool, dependency_cfg, variant_alias_
     return resolved_pool
 
 
-def prepare_wave_companion_rules(raw_rules, zombie_costs, variant_alias_to_roll=None):
+def prepare_wave_companion_rules(raw_rules, zombie_costs, variant_alias_to_roll=None, zombie_classes=None):
     if raw_rules is None:
         return {}
     if not isinstance(raw_rules, list):
@@ -1001,9 +1300,74 @@ def prepare_wave_companion_rules(raw_rules, zombie_costs, variant_alias_to_roll=
                     f"with conflicting {field_name}"
                 )
 
+    for zombie_name, rule in prepared.items():
+        compile_wave_companion_rule(zombie_name, rule, prepared, zombie_costs, zombie_classes)
+
     return prepared
 
 
+def collect_requires_all_closure(zombie_name, companion_rules):
+    closure = []
+    seen = {zombie_name}
+    pending = list(reversed(companion_rules[zombie_name]["requires_all"]))
+    while pending:
+        companion = pending.pop()
+        if companion in seen:
+            continue
+        seen.add(companion)
+        closure.append(companion)
+        companion_rule = companion_rules.get(companion)
+        if companion_rule is not None:
+            pending.extend(reversed(companion_rule["requires_all"]))
+    return closure
+
+
+def compile_wave_companion_rule(zombie_name, rule, companion_rules, zombie_costs, zombie_classes=None):
+    # Companion costs never change during a level, so everything that does not
+    # depend on the wave's current contents is worked out once here.
+    closure = collect_requires_all_closure(zombie_name, companion_rules)
+    closure_flag_mask = 0
+    for index, companion in enumerate(closure):
+        if is_flag_zombie(companion, zombie_classes):
+            closure_flag_mask |= 1 << index
+    rule["requires_all_closure"] = closure
+    rule["requires_all_flag_mask"] = closure_flag_mask
+    rule["requires_all_cost"] = sum(zombie_costs[alias] for alias in closure)
+
+    rule["requires_any_options"] = {}
+    rule["max_extra_cost"] = {}
+    has_negative_cost = any(
+        zombie_costs[alias] < 0 for alias in closure + rule["requires_any"]
+    )
+    for allow_flag_zombies in (True, False):
+        options = [
+            alias
+            for alias in rule["requires_any"]
+            if alias in zombie_costs and (allow_flag_zombies or not is_flag_zombie(alias, zombie_classes))
+        ]
+        option_costs = sorted(zombie_costs[alias] for alias in options)
+        rule["requires_any_options"][allow_flag_zombies] = (options, option_costs)
+
+        # Extra cost when none of the companions are in the wave yet. With
+        # non-negative costs this bounds every other wave state from above.
+        max_extra_cost = None
+        if not has_negative_cost and (allow_flag_zombies or not closure_flag_mask):
+            max_extra_cost = rule["requires_all_cost"]
+            min_any_count = rule["requires_any_count_range"][0]
+            if min_any_count > 0:
+                needed = min_any_count - (1 if zombie_name in options else 0)
+                if not options:
+                    max_extra_cost = None
+                elif needed > 0:
+                    if rule["requires_any_allow_duplicates"]:
+                        max_extra_cost += option_costs[0] * needed
+                    elif len(option_costs) >= needed:
+                        max_extra_cost += sum(option_costs[:needed])
+                    else:
+                        max_extra_cost = None
+        rule["max_extra_cost"][allow_flag_zombies] = max_extra_cost
+
+
 def is_flag_zombie_alias(zombie_name):
     if not isinstance(zombie_name, str) or not zombie_name.strip():
         return False
@@ -1022,16 +1386,47 @@ def is_flag_zombie_alias(zombie_name):
     return True
 
 
-def is_flag_zombie_reference(zombie_ref):
+def resolve_zombie_reference_alias(zombie_ref):
     if not isinstance(zombie_ref, str) or not zombie_ref.strip():
-        return False
+        return None
     cleaned = zombie_ref.strip()
     if cleaned.startswith("RTID("):
         try:
             cleaned = extract_rtid_name(cleaned, "zombie_ref")
         except ValueError:
-            return False
-    return is_flag_zombie_alias(cleaned)
+            return None
+    return cleaned
+
+
+def is_8bit_zombie_alias(zombie_name):
+    return "eighties" in zombie_name and "8bit" in zombie_name
+
+
+def classify_zombie_alias(zombie_alias):
+    return {
+        "flag": is_flag_zombie_alias(zombie_alias),
+        "eight_bit": is_8bit_zombie_alias(zombie_alias),
+    }
+
+
+def build_zombie_class_table(zombie_aliases):
+    return {zombie_alias: classify_zombie_alias(zombie_alias) for zombie_alias in zombie_aliases}
+
+
+def get_zombie_class(zombie_alias, zombie_classes):
+    # Aliases outside the resolved pool (rolled variants, event-only picks) are
+    # classified on first use and kept in the same table.
+    zombie_class = zombie_classes.get(zombie_alias)
+    if zombie_class is None:
+        zombie_class = classify_zombie_alias(zombie_alias)
+        zombie_classes[zombie_alias] = zombie_class
+    return zombie_class
+
+
+def is_flag_zombie(zombie_alias, zombie_classes=None):
+    if zombie_classes is None:
+        return is_flag_zombie_alias(zombie_alias)
+    return get_zombie_class(zombie_alias, zombie_classes)["flag"]
 
 
 def can_spawn_zombie_in_wave(
@@ -1041,25 +1436,22 @@ def can_spawn_zombie_in_wave(
     wave_counts,
     zombie_costs,
     companion_rules,
-    zombie_jam_styles=None,
     allow_flag_zombies=True,
     active_jam=None,
+    zombie_classes=None,
 ):
-    if not allow_flag_zombies and is_flag_zombie_alias(zombie_name):
+    if not allow_flag_zombies and is_flag_zombie(zombie_name, zombie_classes):
         return False
 
     active_jam_names = get_active_jam_names(active_jam)
 
-    # jam-related styles are used for preference only, not hard exclusion.
-    # jam_all zombies are eligible in every jam.
-    # eighties_8bit variants are still restricted to jam_8bit.
-    if zombie_jam_styles is not None:
-        jam_style = zombie_jam_styles.get(zombie_name)
-        if jam_style == JAM_ALL_STYLE:
-            pass
-
-    # Restrict eighties_8bit variants to only spawn during jam_8bit
-    if "eighties" in zombie_name and "8bit" in zombie_name:
+    # Jam styles only bias candidate preference (apply_jam_candidate_bias); the one
+    # hard rule is that eighties_8bit variants spawn only during jam_8bit.
+    if zombie_classes is not None:
+        is_8bit = get_zombie_class(zombie_name, zombie_classes)["eight_bit"]
+    else:
+        is_8bit = is_8bit_zombie_alias(zombie_name)
+    if is_8bit:
         if "jam_8bit" not in active_jam_names:
             return False
 
@@ -1071,60 +1463,324 @@ def can_spawn_zombie_in_wave(
     if rule is None:
         return True
 
+    required_cost = get_wave_companion_cost(
+        zombie_name,
+        rule,
+        wave_present,
+        wave_counts,
+        zombie_costs,
+        allow_flag_zombies=allow_flag_zombies,
+    )
+    if required_cost is None:
+        return False
+    return (base_cost + required_cost) <= (remaining + 1e-9)
+
+
+def get_wave_companion_cost(
+    zombie_name,
+    rule,
+    wave_present,
+    wave_counts,
+    zombie_costs,
+    allow_flag_zombies=True,
+):
+    max_extra_cost = rule["max_extra_cost"][allow_flag_zombies]
+    if max_extra_cost is not None and not wave_present:
+        return max_extra_cost
+
     required_cost = 0.0
-    for companion in rule["requires_all"]:
-        if companion == zombie_name or companion in wave_present:
+    flag_mask = 0 if allow_flag_zombies else rule["requires_all_flag_mask"]
+    for index, companion in enumerate(rule["requires_all_closure"]):
+        if companion in wave_present:
             continue
-        if not allow_flag_zombies and is_flag_zombie_alias(companion):
-            return False
-        companion_cost = zombie_costs.get(companion)
-        if companion_cost is None:
-            return False
-        required_cost += companion_cost
+        if flag_mask >> index & 1:
+            return None
+        required_cost += zombie_costs[companion]
 
     if rule["requires_any_count_range"][0] > 0:
-        valid_any_candidates = [
-            alias
-            for alias in rule["requires_any"]
-            if alias in zombie_costs and (allow_flag_zombies or not is_flag_zombie_alias(alias))
-        ]
+        valid_any_candidates, candidate_costs = rule["requires_any_options"][allow_flag_zombies]
         if not valid_any_candidates:
-            return False
+            return None
         current_any_count = sum(wave_counts.get(alias, 0) for alias in valid_any_candidates)
         if zombie_name in valid_any_candidates:
             current_any_count += 1
         additional_needed = max(0, rule["requires_any_count_range"][0] - current_any_count)
         if additional_needed > 0:
-            candidate_costs = sorted(zombie_costs[alias] for alias in valid_any_candidates)
             if rule["requires_any_allow_duplicates"]:
                 required_cost += candidate_costs[0] * additional_needed
             else:
                 if len(candidate_costs) < additional_needed:
-                    return False
+                    return None
                 required_cost += sum(candidate_costs[:additional_needed])
 
-    return (base_cost + required_cost) <= (remaining + 1e-9)
+    return required_cost
+
+
+def prepare_wave_fill_pool(
+    spendable_pool,
+    zombie_costs,
+    zombie_cost_rank,
+    companion_rules,
+    allow_flag_zombies=True,
+    active_jam=None,
+    zombie_classes=None,
+):
+    if zombie_classes is None:
+        zombie_classes = {}
+    allow_8bit = "jam_8bit" in get_active_jam_names(active_jam)
+    names = []
+    costs = []
+    for zombie_name in sorted(spendable_pool, key=zombie_cost_rank.__getitem__):
+        zombie_class = get_zombie_class(zombie_name, zombie_classes)
+        if not allow_flag_zombies and zombie_class["flag"]:
+            continue
+        if zombie_class["eight_bit"] and not allow_8bit:
+            continue
+        names.append(zombie_name)
+        costs.append(zombie_costs[zombie_name])
+    return {
+        "names": names,
+        "costs": costs,
+        "companion_rules": companion_rules,
+        "allow_flag_zombies": allow_flag_zombies,
+    }
+
+
+def collect_wave_fill_candidates(fill_pool, remaining, wave_present, wave_counts, zombie_costs):
+    # Same result as filtering with can_spawn_zombie_in_wave, but zombies above
+    # the remaining budget are cut off with one bisect and only zombies with
+    # companion rules need a per-pick check.
+    limit = remaining + 1e-9
+    affordable_count = bisect.bisect_right(fill_pool["costs"], limit)
+    companion_rules = fill_pool["companion_rules"]
+    candidates = []
+    for index in range(affordable_count):
+        zombie_name = fill_pool["names"][index]
+        rule = companion_rules.get(zombie_name)
+        if rule is None:
+            candidates.append(zombie_name)
+            continue
+        max_extra_cost = rule["max_extra_cost"][fill_pool["allow_flag_zombies"]]
+        if max_extra_cost is not None and fill_pool["costs"][index] + max_extra_cost <= limit:
+            candidates.append(zombie_name)
+            continue
+        required_cost = get_wave_companion_cost(
+            zombie_name,
+            rule,
+            wave_present,
+            wave_counts,
+            zombie_costs,
+            allow_flag_zombies=fill_pool["allow_flag_zombies"],
+        )
+        if required_cost is not None and fill_pool["costs"][index] + required_cost <= limit:
+            candidates.append(zombie_name)
+    return candidates
+
+
+def scale_wave_cost(cost):
+    return int(round(cost * WAVE_POINT_SCALE))
 
 
-def pick_greedy_zombie(candidates, zombie_costs, greediness):
-    ordered = sorted(candidates, key=zombie_costs.__getitem__)
-    if len(ordered) == 1:
-        return ordered[0]
+def scale_wave_budget(points):
+    return int(points * WAVE_POINT_SCALE + 1e-6)
+
+
+def build_wave_fill_reachable(fill_pool, budget):
+    # Bitset of every point total reachable with any multiset of the wave's
+    # rule-free zombies (bit n set = n units reachable). Each zombie is added
+    # with doubling shifts, so a cost c costs log(budget / c) big-int ORs.
+    limit = scale_wave_budget(budget)
+    if limit < 0:
+        return 1
+    mask = (1 << (limit + 1)) - 1
+    reachable = 1
+    for zombie_name, cost in zip(fill_pool["names"], fill_pool["costs"]):
+        if zombie_name in fill_pool["companion_rules"]:
+            continue
+        step = scale_wave_cost(cost)
+        if step <= 0 or step > limit:
+            continue
+        while step <= limit:
+            reachable |= (reachable << step) & mask
+            step *= 2
+    return reachable
+
+
+def get_best_wave_fill(reachable, budget_units):
+    if budget_units < 0:
+        return -1
+    return (reachable & ((1 << (budget_units + 1)) - 1)).bit_length() - 1
+
+
+def filter_knapsack_candidates(
+    candidates,
+    fill_pool,
+    reachable,
+    remaining,
+    wave_present,
+    wave_counts,
+    zombie_costs,
+):
+    budget_units = scale_wave_budget(remaining)
+    companion_rules = fill_pool["companion_rules"]
+    best_total = -1
+    best_candidates = []
+    for zombie_name in candidates:
+        pick_cost = zombie_costs[zombie_name]
+        rule = companion_rules.get(zombie_name)
+        if rule is not None:
+            pick_cost += get_wave_companion_cost(
+                zombie_name,
+                rule,
+                wave_present,
+                wave_counts,
+                zombie_costs,
+                allow_flag_zombies=fill_pool["allow_flag_zombies"],
+            )
+        pick_units = scale_wave_cost(pick_cost)
+        fill_total = pick_units + get_best_wave_fill(reachable, budget_units - pick_units)
+        if fill_total > best_total:
+            best_total = fill_total
+            best_candidates = [zombie_name]
+        elif fill_total == best_total:
+            best_candidates.append(zombie_name)
+    return best_candidates
+
+
+def build_zombie_cost_rank(zombie_pool, zombie_costs):
+    ordered = sorted(zombie_pool, key=lambda zombie_name: (zombie_costs[zombie_name], zombie_name))
+    return {zombie_name: rank for rank, zombie_name in enumerate(ordered)}
+
+
+def pick_greedy_zombie(rng, ordered_candidates, greediness):
+    # ordered_candidates must already be in zombie cost-rank order, so the
+    # greedy window is picked by index instead of sorting on every pick.
+    candidate_count = len(ordered_candidates)
+    if candidate_count == 1:
+        return ordered_candidates[0]
 
     if greediness >= 0.5:
-        choice_count = max(1, int(len(ordered) * greediness))
-        return random.choice(ordered[len(ordered) - choice_count :])
+        choice_count = max(1, int(candidate_count * greediness))
+        return ordered_candidates[candidate_count - choice_count + rng.randrange(choice_count)]
+
+    choice_count = max(1, int(candidate_count * (1 - greediness)))
+    return ordered_candidates[rng.randrange(choice_count)]
+
+
+class WaveTypeTable:
+    # Shared per level: every distinct spawn alias gets one id and one RTID string.
+    def __init__(self, zombie_rtid):
+        self.zombie_rtid = zombie_rtid
+        self.ids = {}
+        self.aliases = []
+        self.types = []
+
+    def type_id(self, alias):
+        type_id = self.ids.get(alias)
+        if type_id is None:
+            type_id = len(self.aliases)
+            self.ids[alias] = type_id
+            self.aliases.append(alias)
+            self.types.append(self.zombie_rtid.get(alias, f"RTID({alias}@ZombieTypes)"))
+        return type_id
+
+
+class WaveZombies:
+    # Spawns are kept as parallel type-id/row columns indexed by entry id;
+    # order holds the entry ids in output order. Rows are None in plank levels.
+    def __init__(self, type_table):
+        self.type_table = type_table
+        self.type_ids = []
+        self.rows = []
+        self.order = []
+
+    def __len__(self):
+        return len(self.order)
+
+    def append(self, alias, row=None):
+        self.order.append(len(self.type_ids))
+        self.type_ids.append(self.type_table.type_id(alias))
+        self.rows.append(row)
+
+    def entry_aliases(self):
+        aliases = self.type_table.aliases
+        return [aliases[type_id] for type_id in self.type_ids]
+
+    def entry_types(self):
+        types = self.type_table.types
+        return [types[type_id] for type_id in self.type_ids]
+
+    def to_objects(self):
+        types = self.type_table.types
+        type_ids = self.type_ids
+        rows = self.rows
+        objects = []
+        for entry in self.order:
+            row = rows[entry]
+            if row is None:
+                objects.append({"Type": types[type_ids[entry]]})
+            else:
+                objects.append({"Row": str(row), "Type": types[type_ids[entry]]})
+        return objects
 
-    choice_count = max(1, int(len(ordered) * (1 - greediness)))
-    return random.choice(ordered[:choice_count])
+
+def encode_level_value(value):
+    if isinstance(value, WaveZombies):
+        return value.to_objects()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def write_level_json(file, level, json_indent=None):
+    # Matches json.dump(level, file, indent=json_indent) byte for byte, but encodes
+    # level["objects"] one entry at a time so only one object is ever materialized.
+    if json_indent is None:
+        separators = (",", ":")
+        indent = None
+    else:
+        separators = (",", ": ")
+        indent = " " * json_indent
+
+    def newline(depth):
+        if indent is None:
+            return ""
+        return "\n" + indent * depth
+
+    def encode(value, depth):
+        text = json_backend.dumps(value, indent=json_indent, default=encode_level_value)
+        if indent is None:
+            return text
+        return text.replace("\n", newline(depth))
+
+    file.write("{")
+    for key_index, (key, value) in enumerate(level.items()):
+        if key_index:
+            file.write(separators[0])
+        file.write(newline(1) + json.dumps(key) + separators[1])
+        if key != "objects":
+            file.write(encode(value, 1))
+            continue
+
+        file.write("[")
+        wrote_object = False
+        for level_object in value:
+            if wrote_object:
+                file.write(separators[0])
+            file.write(newline(2) + encode(level_object, 2))
+            wrote_object = True
+        if wrote_object:
+            file.write(newline(1))
+        file.write("]")
+    if level:
+        file.write(newline(0))
+    file.write("}")
 
 
 def append_wave_zombie(
+    rng,
     zombies_list,
     wave_present,
     wave_counts,
     zombie_name,
-    zombie_rtid,
     spawn_row_range,
     planks,
     zombies_used=None,
@@ -1134,35 +1790,25 @@ def append_wave_zombie(
     if wave_counts is not None:
         wave_counts[zombie_name] = wave_counts.get(zombie_name, 0) + 1
     register_zombie_usage(zombies_used, zombie_name, zombie_variant_groups)
-    spawn_alias = pick_zombie_variant_alias(zombie_name, zombie_variant_groups)
-    spawn_rtid = zombie_rtid.get(spawn_alias, f"RTID({spawn_alias}@ZombieTypes)")
+    spawn_alias = pick_zombie_variant_alias(rng, zombie_name, zombie_variant_groups)
 
     if not planks:
-        zombies_list.append(
-            {
-                "Row": str(random.randint(*spawn_row_range)),
-                "Type": spawn_rtid,
-            }
-        )
+        zombies_list.append(spawn_alias, rng.randint(*spawn_row_range))
     else:
-        zombies_list.append(
-            {
-                "Type": spawn_rtid,
-            }
-        )
+        zombies_list.append(spawn_alias)
 
 
-def pick_wave_companion_target(existing_count, count_range, candidates, remaining, zombie_costs, allow_duplicates):
+def pick_wave_companion_target(rng, existing_count, count_range, candidates, remaining, zombie_costs, allow_duplicates):
     min_count, max_count = count_range
     if max_count <= existing_count or not candidates:
         return existing_count
 
     feasible_totals = []
+    candidate_costs = sorted(zombie_costs[alias] for alias in candidates if alias in zombie_costs)
+    if not candidate_costs:
+        return existing_count
     for desired_total in range(existing_count + 1, max_count + 1):
         additions_needed = desired_total - existing_count
-        candidate_costs = sorted(zombie_costs[alias] for alias in candidates if alias in zombie_costs)
-        if not candidate_costs:
-            break
         if allow_duplicates:
             required_cost = candidate_costs[0] * additions_needed
         else:
@@ -1174,20 +1820,20 @@ def pick_wave_companion_target(existing_count, count_range, candidates, remainin
 
     preferred_totals = [total for total in feasible_totals if total >= min_count]
     if preferred_totals:
-        return random.choice(preferred_totals)
+        return rng.choice(preferred_totals)
     if feasible_totals:
         return feasible_totals[-1]
     return existing_count
 
 
 def add_requires_any_companions(
+    rng,
     candidates,
     count_range,
     remaining,
     zombies_list,
     wave_present,
     wave_counts,
-    zombie_rtid,
     spawn_row_range,
     planks,
     zombie_costs,
@@ -1196,6 +1842,7 @@ def add_requires_any_companions(
     prefer_cheapest=False,
     zombies_used=None,
     zombie_variant_groups=None,
+    zombie_classes=None,
 ):
     if count_range[1] <= 0:
         return remaining, []
@@ -1203,13 +1850,14 @@ def add_requires_any_companions(
     valid_candidates = [
         alias
         for alias in candidates
-        if alias in zombie_costs and (allow_flag_zombies or not is_flag_zombie_alias(alias))
+        if alias in zombie_costs and (allow_flag_zombies or not is_flag_zombie(alias, zombie_classes))
     ]
     if not valid_candidates:
         return remaining, []
 
     existing_count = sum(wave_counts.get(alias, 0) for alias in valid_candidates)
     target_total = pick_wave_companion_target(
+        rng,
         existing_count,
         count_range,
         valid_candidates,
@@ -1233,14 +1881,14 @@ def add_requires_any_companions(
         if prefer_cheapest:
             companion = min(affordable, key=zombie_costs.__getitem__)
         else:
-            companion = random.choice(affordable)
+            companion = rng.choice(affordable)
         remaining -= zombie_costs[companion]
         append_wave_zombie(
+            rng,
             zombies_list,
             wave_present,
             wave_counts,
             companion,
-            zombie_rtid,
             spawn_row_range,
             planks,
             zombies_used=zombies_used,
@@ -1254,14 +1902,14 @@ def add_requires_any_companions(
     return remaining, added
 
 
-def schedule_followup_wave_companions(pending_by_wave, zombie_name, companion_rules, current_wave, wave_count):
+def schedule_followup_wave_companions(rng, pending_by_wave, zombie_name, companion_rules, current_wave, wave_count):
     rule = companion_rules.get(zombie_name)
     if rule is None or rule["followup_wave_count_range"][1] <= 0:
         return
     if rule["followup_requires_any_count_range"][1] <= 0 or not rule["requires_any"]:
         return
 
-    followup_count = random.randint(*rule["followup_wave_count_range"])
+    followup_count = rng.randint(*rule["followup_wave_count_range"])
     for offset in range(1, followup_count + 1):
         target_wave = current_wave + offset
         if target_wave > wave_count:
@@ -1275,33 +1923,33 @@ def schedule_followup_wave_companions(pending_by_wave, zombie_name, companion_ru
         )
 
 
-def refresh_non_basic_pool(active_non_basics, non_basics_set, new_count, retained_count):
+def refresh_non_basic_pool(rng, active_non_basics, non_basics_set, new_count, retained_count):
     retained = set()
     if active_non_basics and retained_count > 0:
-        kept = random.sample(sorted(active_non_basics), min(retained_count, len(active_non_basics)))
+        kept = rng.sample(sorted(active_non_basics), min(retained_count, len(active_non_basics)))
         retained.update(kept)
 
     additions = set()
-    fresh_candidates = list(non_basics_set - active_non_basics)
+    fresh_candidates = sorted(non_basics_set - active_non_basics)
     if new_count > 0 and fresh_candidates:
-        additions.update(random.sample(fresh_candidates, min(new_count, len(fresh_candidates))))
+        additions.update(rng.sample(fresh_candidates, min(new_count, len(fresh_candidates))))
 
     remaining_slots = max(0, new_count - len(additions))
     if remaining_slots > 0:
-        fallback_candidates = list((non_basics_set - retained) - additions)
+        fallback_candidates = sorted((non_basics_set - retained) - additions)
         if fallback_candidates:
-            additions.update(random.sample(fallback_candidates, min(remaining_slots, len(fallback_candidates))))
+            additions.update(rng.sample(fallback_candidates, min(remaining_slots, len(fallback_candidates))))
 
     return retained | additions
 
 
 def add_required_wave_companions(
+    rng,
     zombie_name,
     remaining,
     zombies_list,
     wave_present,
     wave_counts,
-    zombie_rtid,
     spawn_row_range,
     planks,
     zombie_costs,
@@ -1309,21 +1957,22 @@ def add_required_wave_companions(
     allow_flag_zombies=True,
     zombies_used=None,
     zombie_variant_groups=None,
+    zombie_classes=None,
 ):
     rule = companion_rules.get(zombie_name)
     if rule is None:
         return remaining
 
-    for companion in rule["requires_all"]:
-        if companion == zombie_name or companion in wave_present:
+    for companion in rule["requires_all_closure"]:
+        if companion in wave_present:
             continue
         remaining -= zombie_costs[companion]
         append_wave_zombie(
+            rng,
             zombies_list,
             wave_present,
             wave_counts,
             companion,
-            zombie_rtid,
             spawn_row_range,
             planks,
             zombies_used=zombies_used,
@@ -1331,13 +1980,13 @@ def add_required_wave_companions(
         )
 
     remaining, _ = add_requires_any_companions(
-        rule["requires_any"],
+        rng,
+        rule["requires_any_options"][allow_flag_zombies][0],
         rule["requires_any_count_range"],
         remaining,
         zombies_list,
         wave_present,
         wave_counts,
-        zombie_rtid,
         spawn_row_range,
         planks,
         zombie_costs,
@@ -1349,19 +1998,22 @@ def add_required_wave_companions(
         ),
         zombies_used=zombies_used,
         zombie_variant_groups=zombie_variant_groups,
+        zombie_classes=zombie_classes,
     )
 
     return remaining
 
 
-def get_enabled_ambushes(events_cfg, zombies_used, wave_zombies=None):
+def compile_ambush_table(events_cfg, zombies_used, context=None):
     available = []
 
     def add_weighted(kind, config, field_name):
         weight = get_config_weight(config, f"{field_name}.weight")
         if weight <= 0:
-            return
-        available.append({"kind": kind, "config": config, "weight": weight})
+            return None
+        entry = {"kind": kind, "config": config, "weight": weight}
+        available.append(entry)
+        return entry
 
     market_cfg = events_cfg.get("market", {})
     if market_cfg.get("enabled", False):
@@ -1486,9 +2138,9 @@ def get_enabled_ambushes(events_cfg, zombies_used, wave_zombies=None):
             raise ValueError("events.dino_ambushes entries must be objects")
         if not dino_cfg.get("enabled", True):
             continue
-        if wave_zombies is not None and not dino_event_has_spawnable_actions(dino_cfg, wave_zombies):
-            continue
-        add_weighted("dino_ambush", dino_cfg, f"events.dino_ambushes[{idx}]")
+        entry = add_weighted("dino_ambush", dino_cfg, f"events.dino_ambushes[{idx}]")
+        if entry is not None:
+            entry["dino_actions"] = compile_dino_actions(dino_cfg)
 
     tide_cfgs = events_cfg.get("tide_changes", [])
     if not isinstance(tide_cfgs, list):
@@ -1501,26 +2153,55 @@ def get_enabled_ambushes(events_cfg, zombies_used, wave_zombies=None):
             continue
         add_weighted("tide_change", tide_cfg, f"events.tide_changes[{idx}]")
 
-    return available
+    if context is not None:
+        for entry in available:
+            compile_config = AMBUSH_BUILDERS[entry["kind"]].get("compile")
+            if compile_config is not None:
+                entry["compiled"] = compile_config(entry["config"], context)
+
+    return {
+        "entries": available,
+        "sampler": WeightedSampler([entry["weight"] for entry in available]),
+        "has_dino": any("dino_actions" in entry for entry in available),
+        "by_rows": {},
+    }
+
 
+def get_enabled_ambushes(ambush_table, wave_zombies=None):
+    # Returns the enabled entries with an alias sampler over them; both are cached per row set.
+    if wave_zombies is None or not ambush_table["has_dino"]:
+        return ambush_table["entries"], ambush_table["sampler"]
 
-def build_generated_portal_mode_groups(group_mode, portal_pool, zombie_type_metadata, zombie_costs):
+    wave_rows_by_alias, any_rows = collect_wave_dino_support_rows(wave_zombies)
+    ptero_rows = get_dino_required_rows("ptero", wave_rows_by_alias, any_rows)
+    rows_key = (frozenset(ptero_rows), frozenset(any_rows))
+    enabled = ambush_table["by_rows"].get(rows_key)
+    if enabled is None:
+        available = [
+            entry
+            for entry in ambush_table["entries"]
+            if "dino_actions" not in entry
+            or dino_actions_can_spawn(entry["dino_actions"], ptero_rows, any_rows)
+        ]
+        enabled = (available, WeightedSampler([entry["weight"] for entry in available]))
+        ambush_table["by_rows"][rows_key] = enabled
+    return enabled
+
+
+def build_generated_portal_mode_groups(group_mode, portal_pool, zombie_catalog, zombie_costs):
     if group_mode == "random":
         return [{"key": "random", "zombies": portal_pool[:], "weight": len(portal_pool)}]
 
     grouped = {}
     for zombie_alias in portal_pool:
         if group_mode == "same_world":
-            group_key = zombie_type_metadata.get(zombie_alias, {}).get("portal_world", "modern")
+            group_key = zombie_catalog.portal_world(zombie_alias)
         elif group_mode == "same_cost":
             if zombie_alias not in zombie_costs:
                 continue
             group_key = round(zombie_costs[zombie_alias], 6)
         elif group_mode == "same_suffix":
-            group_key = zombie_type_metadata.get(zombie_alias, {}).get(
-                "suffix",
-                extract_portal_group_suffix(zombie_alias),
-            )
+            group_key = zombie_catalog.portal_group_suffix(zombie_alias)
         else:
             raise ValueError(f"Unsupported generated portal mode: {group_mode}")
         grouped.setdefault(group_key, []).append(zombie_alias)
@@ -1532,38 +2213,37 @@ def build_generated_portal_mode_groups(group_mode, portal_pool, zombie_type_meta
     ]
 
 
-def pick_generated_portal_zombies(
-    group_mode,
-    portal_pool,
-    zombie_count_range,
-    zombie_type_metadata,
-    zombie_costs,
-):
-    min_count, max_count = zombie_count_range
+def compile_generated_portal_groups(group_mode, portal_pool, zombie_count_range, zombie_catalog, zombie_costs):
     groups = build_generated_portal_mode_groups(
         group_mode,
         portal_pool,
-        zombie_type_metadata,
+        zombie_catalog,
         zombie_costs,
     )
     eligible_groups = [
         group
         for group in groups
-        if len(group["zombies"]) >= min_count
+        if len(group["zombies"]) >= zombie_count_range[0]
     ]
+    return eligible_groups, WeightedSampler([group["weight"] for group in eligible_groups])
+
+
+def pick_generated_portal_zombies(rng, mode_groups, zombie_count_range):
+    min_count, max_count = zombie_count_range
+    eligible_groups, group_sampler = mode_groups
     if not eligible_groups:
         return None, None
 
-    chosen_group = pick_weighted_dict(eligible_groups, "events.generated_portals.group_modes")
+    chosen_group = pick_sampled_dict(rng, eligible_groups, group_sampler, "events.generated_portals.group_modes")
     group_zombies = chosen_group["zombies"]
-    target_count = random.randint(min_count, min(max_count, len(group_zombies)))
-    return random.sample(group_zombies, target_count), chosen_group
+    target_count = rng.randint(min_count, min(max_count, len(group_zombies)))
+    return rng.sample(group_zombies, target_count), chosen_group
 
 
-def choose_generated_portal_world(zombies, zombie_type_metadata, default_world):
+def choose_generated_portal_world(zombies, zombie_catalog, default_world):
     worlds = []
     for zombie_alias in zombies:
-        portal_world = zombie_type_metadata.get(zombie_alias, {}).get("portal_world", default_world)
+        portal_world = zombie_catalog.portal_world(zombie_alias, default_world)
         portal_world = normalize_portal_world_name(portal_world, fallback_world=default_world)
         if portal_world not in worlds:
             worlds.append(portal_world)
@@ -1591,13 +2271,15 @@ def normalize_time_between_spawns(raw_value, field_name):
 
 
 def build_generated_portal_objects(
+    rng,
     portal_cfg,
     default_zombie_pool,
     all_zombie_aliases,
     zombie_costs,
-    zombie_type_metadata,
+    zombie_catalog,
     existing_aliases,
     variant_alias_to_roll=None,
+    zombie_classes=None,
 ):
     if portal_cfg is None:
         return [], [], {}
@@ -1640,7 +2322,7 @@ def build_generated_portal_objects(
     portal_pool = validated_pool
 
     if bool(portal_cfg.get("exclude_flag_zombies", False)):
-        portal_pool = [alias for alias in portal_pool if not is_flag_zombie_alias(alias)]
+        portal_pool = [alias for alias in portal_pool if not is_flag_zombie(alias, zombie_classes)]
     if len(portal_pool) < zombie_count_range[0]:
         raise ValueError(
             f"{field_prefix}.zombie_pool must contain at least "
@@ -1667,21 +2349,29 @@ def build_generated_portal_objects(
         f"{field_prefix}.time_between_spawns",
     )
 
-    portal_count = random.randint(*portal_count_range)
+    portal_count = rng.randint(*portal_count_range)
     portal_objects = []
     generated_pool = []
     portal_costs = {}
 
+    # Groups depend only on the pool, so they and their samplers are built once;
+    # every mode with an eligible group yields zombies for every portal.
+    mode_groups = [
+        (group_mode, compile_generated_portal_groups(
+            group_mode,
+            portal_pool,
+            zombie_count_range,
+            zombie_catalog,
+            zombie_costs,
+        ))
+        for group_mode in group_modes
+    ]
+    mode_sampler = WeightedSampler([1.0 for _, (eligible_groups, _) in mode_groups if eligible_groups])
+
     for portal_index in range(1, portal_count + 1):
         eligible_modes = []
-        for group_mode in group_modes:
-            portal_zombies, chosen_group = pick_generated_portal_zombies(
-                group_mode,
-                portal_pool,
-                zombie_count_range,
-                zombie_type_metadata,
-                zombie_costs,
-            )
+        for group_mode, groups in mode_groups:
+            portal_zombies, chosen_group = pick_generated_portal_zombies(rng, groups, zombie_count_range)
             if portal_zombies:
                 eligible_modes.append(
                     {
@@ -1697,11 +2387,11 @@ def build_generated_portal_objects(
                 f"{field_prefix} could not build a portal with the current zombie_pool and group_modes"
             )
 
-        chosen_mode = pick_weighted_dict(eligible_modes, f"{field_prefix}.group_modes")
+        chosen_mode = pick_sampled_dict(rng, eligible_modes, mode_sampler, f"{field_prefix}.group_modes")
         portal_zombies = chosen_mode["zombies"]
         portal_world = choose_generated_portal_world(
             portal_zombies,
-            zombie_type_metadata,
+            zombie_catalog,
             default_world,
         )
 
@@ -1764,11 +2454,8 @@ def build_generated_portal_objects(
     return portal_objects, generated_pool, portal_costs
 
 
-def build_portal_spawn_event(wave, ambush_count, portal_cfg, portal_costs, max_cost):
-    alias_prefix = str(portal_cfg.get("alias_prefix", "PortalSpawn"))
-    event_name = str(portal_cfg.get("event_name", "portal_spawn")).strip() or "portal_spawn"
-    alias = f"{alias_prefix}{wave}_{ambush_count}_{event_name}"
-
+def compile_portal_spawn_config(portal_cfg, context):
+    portal_costs = context["portal_costs"]
     portal_pool = portal_cfg.get("portal_pool", [])
     if not isinstance(portal_pool, list) or len(portal_pool) == 0:
         raise ValueError("events.portal_spawns[].portal_pool must be a non-empty array")
@@ -1808,35 +2495,58 @@ def build_portal_spawn_event(wave, ambush_count, portal_cfg, portal_costs, max_c
             }
         )
 
-    # Filter portals that exceed max_cost and sort by cost ascending (prefer cheaper)
-    prepared_pool = [p for p in prepared_pool if p["cost"] <= max_cost]
+    # Sorted by cost ascending (prefer cheaper), so the portals within a budget
+    # are always a prefix of the pool.
     prepared_pool.sort(key=lambda p: p["cost"])
 
-    count_range = parse_int_range(
-        portal_cfg.get("portal_count_range", [1, 2]),
-        "events.portal_spawns[].portal_count_range",
-    )
-    allow_duplicate_portals = bool(portal_cfg.get("allow_duplicate_portals", False))
-    portal_count = random.randint(*count_range)
+    return {
+        "config": portal_cfg,
+        # Every pool entry rebinds alias, so the event is named after the last one.
+        "alias": alias,
+        "pool": prepared_pool,
+        "costs": [entry["cost"] for entry in prepared_pool],
+        "count_range": parse_int_range(
+            portal_cfg.get("portal_count_range", [1, 2]),
+            "events.portal_spawns[].portal_count_range",
+        ),
+        "allow_duplicate_portals": bool(portal_cfg.get("allow_duplicate_portals", False)),
+        "samplers_by_limit": {},
+    }
 
-    if not allow_duplicate_portals:
-        positive_pool = [entry for entry in prepared_pool if entry["weight"] > 0]
-        portal_count = min(portal_count, len(positive_pool))
+
+def build_portal_spawn_event(rng, compiled, max_cost):
+    portal_cfg = compiled["config"]
+    alias = compiled["alias"]
+    limit = bisect.bisect_right(compiled["costs"], max_cost)
+    affordable_pool = compiled["pool"][:limit]
+    allow_duplicate_portals = compiled["allow_duplicate_portals"]
+    portal_count = rng.randint(*compiled["count_range"])
+
+    if allow_duplicate_portals:
+        sampler = compiled["samplers_by_limit"].get(limit)
+        if sampler is None:
+            sampler = WeightedSampler([entry["weight"] for entry in affordable_pool])
+            compiled["samplers_by_limit"][limit] = sampler
+    else:
+        sampler = ShrinkingWeightedSampler([entry["weight"] for entry in affordable_pool])
+        for index, entry in enumerate(affordable_pool):
+            if entry["weight"] <= 0:
+                sampler.remove(index)
+        portal_count = min(portal_count, len(sampler))
     if portal_count <= 0:
         return None, None, 0
 
     chosen_portals = []
     chosen_costs = []
-    available_pool = prepared_pool[:]
     for _ in range(portal_count):
-        positive_pool = [entry for entry in available_pool if entry["weight"] > 0]
-        if not positive_pool:
+        if sampler.total() <= 0:
             break
-        chosen = pick_weighted_dict(positive_pool, "events.portal_spawns[].portal_pool")
+        index = sampler.pick(rng)
+        chosen = affordable_pool[index]
         chosen_portals.append(chosen["type_name"])
         chosen_costs.append(chosen["cost"])
         if not allow_duplicate_portals:
-            available_pool = [entry for entry in available_pool if entry is not chosen]
+            sampler.remove(index)
 
     if len(chosen_portals) == 0:
         return None, None, 0
@@ -1861,9 +2571,9 @@ def build_portal_spawn_event(wave, ambush_count, portal_cfg, portal_costs, max_c
         )
 
     if unique_positions:
-        spawn_positions = random.sample(all_positions, len(chosen_portals))
+        spawn_positions = rng.sample(all_positions, len(chosen_portals))
     else:
-        spawn_positions = [random.choice(all_positions) for _ in chosen_portals]
+        spawn_positions = [rng.choice(all_positions) for _ in chosen_portals]
 
     pool = [
         {"Count": 1, "Type": f"RTID({portal_type}@.)"}
@@ -1880,7 +2590,7 @@ def build_portal_spawn_event(wave, ambush_count, portal_cfg, portal_costs, max_c
             "DisplacePlants": bool(portal_cfg.get("displace_plants", True)),
             "RandomPlacement": bool(portal_cfg.get("random_placement", False)),
             "ShakeScreen": bool(portal_cfg.get("shake_screen", False)),
-            "GridClassesToDestroy": copy.deepcopy(
+            "GridClassesToDestroy": copy_config_value(
                 portal_cfg.get("grid_classes_to_destroy", [])
             ),
         },
@@ -2009,21 +2719,28 @@ def prepare_weighted_zombie_pool(
     return prepared
 
 
-def pick_weighted_entry(entries, field_name):
-    if not isinstance(entries, list) or len(entries) == 0:
-        raise ValueError(f"{field_name} must contain at least one entry")
+class MaskedWeightMatrix:
+    # Row-major weights whose rows and columns can be masked out. The cells sit in a
+    # Fenwick tree, so a pick or a masked cell costs O(log n) instead of a full rescan.
+    def __init__(self, column_count, weights):
+        self.column_count = column_count
+        self.sampler = ShrinkingWeightedSampler(weights)
+
+    def mask(self, index):
+        self.sampler.remove(index)
 
-    total_weight = sum(entry["weight"] for entry in entries)
-    if total_weight <= 0:
-        return random.choice(entries)
+    def mask_row(self, row):
+        for index in range(row * self.column_count, (row + 1) * self.column_count):
+            self.mask(index)
 
-    roll = random.uniform(0.0, total_weight)
-    running = 0.0
-    for entry in entries:
-        running += entry["weight"]
-        if roll <= running:
-            return entry
-    return entries[-1]
+    def mask_column(self, column):
+        for index in range(column, self.sampler.size, self.column_count):
+            self.mask(index)
+
+    def pick(self, rng, field_name):
+        if len(self.sampler) == 0:
+            raise ValueError(f"{field_name} must contain at least one entry")
+        return divmod(self.sampler.pick(rng), self.column_count)
 
 
 def normalize_grid_positions(raw_positions, field_name):
@@ -2263,7 +2980,7 @@ def build_initial_tide_object(tide_cfg):
     return {"module_rtid": module_rtid, "object": tide_object}
 
 
-def resolve_tide_change_amount(tide_cfg, field_prefix):
+def resolve_tide_change_amount(rng, tide_cfg, field_prefix):
     if "change_amount" in tide_cfg:
         change_amount = as_int(tide_cfg.get("change_amount"), f"{field_prefix}.change_amount")
     elif "change_amount_range" in tide_cfg:
@@ -2271,7 +2988,7 @@ def resolve_tide_change_amount(tide_cfg, field_prefix):
             tide_cfg.get("change_amount_range"),
             f"{field_prefix}.change_amount_range",
         )
-        change_amount = random.randint(low, high)
+        change_amount = rng.randint(low, high)
     elif "dry_lane_count" in tide_cfg:
         dry_lane_count = as_int(tide_cfg.get("dry_lane_count"), f"{field_prefix}.dry_lane_count")
         change_amount = 9 - dry_lane_count
@@ -2280,7 +2997,7 @@ def resolve_tide_change_amount(tide_cfg, field_prefix):
             tide_cfg.get("dry_lane_count_range", [3, 5]),
             f"{field_prefix}.dry_lane_count_range",
         )
-        dry_lane_count = random.randint(low, high)
+        dry_lane_count = rng.randint(low, high)
         change_amount = 9 - dry_lane_count
 
     if change_amount < 0 or change_amount > 8:
@@ -2288,7 +3005,7 @@ def resolve_tide_change_amount(tide_cfg, field_prefix):
     return change_amount
 
 
-def build_tide_change_event(wave, ambush_count, tide_cfg, existing_aliases):
+def build_tide_change_event(rng, wave, ambush_count, tide_cfg, existing_aliases):
     alias_prefix = str(tide_cfg.get("alias_prefix", "tide")).strip() or "tide"
     event_name = str(tide_cfg.get("event_name", "tide")).strip() or "tide"
     alias = make_unique_alias(f"{alias_prefix}{wave}_{ambush_count}_{event_name}", existing_aliases)
@@ -2298,7 +3015,7 @@ def build_tide_change_event(wave, ambush_count, tide_cfg, existing_aliases):
         "objclass": "TidalChangeWaveActionProps",
         "objdata": {
             "TidalChange": {
-                "ChangeAmount": resolve_tide_change_amount(tide_cfg, "events.tide_changes[]"),
+                "ChangeAmount": resolve_tide_change_amount(rng, tide_cfg, "events.tide_changes[]"),
                 "ChangeType": str(tide_cfg.get("change_type", "absolute")),
             }
         },
@@ -2306,32 +3023,6 @@ def build_tide_change_event(wave, ambush_count, tide_cfg, existing_aliases):
     return event_object, f"RTID({alias}@.)"
 
 
-def get_wave_entry_alias(entry):
-    if not isinstance(entry, dict):
-        return None
-    type_value = entry.get("Type")
-    if not isinstance(type_value, str) or not type_value.strip():
-        return None
-    try:
-        return extract_rtid_name(type_value, "wave_zombie.Type")
-    except ValueError:
-        return None
-
-
-def get_wave_entry_row(entry):
-    if not isinstance(entry, dict) or "Row" not in entry:
-        return None
-    try:
-        return as_int(entry.get("Row"), "wave_zombie.Row")
-    except ValueError:
-        return None
-
-
-def set_wave_entry_row(entry, row):
-    if isinstance(entry, dict) and "Row" in entry:
-        entry["Row"] = str(row)
-
-
 def get_active_jam_names(active_jam):
     if active_jam is None:
         return set()
@@ -2357,16 +3048,15 @@ def wave_row_to_dino_row(row):
     return row - 1
 
 
-def collect_wave_dino_support_rows(zombies_list):
+def collect_wave_dino_support_rows(wave_zombies):
     rows_by_alias = {}
     any_rows = set()
 
-    if not isinstance(zombies_list, list):
+    if not isinstance(wave_zombies, WaveZombies):
         return rows_by_alias, any_rows
 
-    for zombie in zombies_list:
-        alias = get_wave_entry_alias(zombie)
-        row = wave_row_to_dino_row(get_wave_entry_row(zombie))
+    for alias, row in zip(wave_zombies.entry_aliases(), wave_zombies.rows):
+        row = wave_row_to_dino_row(row)
         if alias is None or row is None or row < 0:
             continue
         alias_key = alias.casefold()
@@ -2443,36 +3133,143 @@ def can_spawn_dino_action(action_cfg, field_name, wave_rows_by_alias, any_rows):
     return len(required_rows) > 0
 
 
-def dino_event_has_spawnable_actions(dino_cfg, wave_zombies):
-    wave_rows_by_alias, any_rows = collect_wave_dino_support_rows(wave_zombies)
+def compile_dino_actions(dino_cfg):
+    compiled = []
     for idx, action_cfg in enumerate(get_dino_action_configs(dino_cfg)):
-        if can_spawn_dino_action(
-            action_cfg,
-            f"events.dino_ambushes[].actions[{idx}]",
-            wave_rows_by_alias,
-            any_rows,
-        ):
+        field_name = f"events.dino_ambushes[].actions[{idx}]"
+        dino_type = get_dino_action_type(action_cfg, field_name)
+        compiled.append((dino_type.casefold(), get_dino_action_row(action_cfg, field_name)))
+    return compiled
+
+
+def dino_actions_can_spawn(dino_actions, ptero_rows, any_rows):
+    for dino_key, requested_row in dino_actions:
+        if dino_key == "ptero":
+            required_rows = ptero_rows
+        elif dino_key == "stego":
+            required_rows = any_rows
+        else:
+            return True
+        if requested_row is not None:
+            if requested_row in required_rows:
+                return True
+        elif required_rows:
             return True
     return False
 
 
-def move_wave_entry(entries, entry, target_index):
-    current_index = None
-    for idx, candidate in enumerate(entries):
-        if candidate is entry:
-            current_index = idx
-            break
-    if current_index is None:
-        return
+class WaveLayout:
+    # Reorders a wave's entries for the layout rules. The order is a linked list
+    # with spaced integer labels, so a move is O(1) and two entries compare by
+    # label; the first entry of each type/row is cached and kept current as
+    # entries move or change rows.
+    LABEL_GAP = 1 << 16
+
+    def __init__(self, wave_zombies):
+        self.wave_zombies = wave_zombies
+        self.prev = {}
+        self.next = {}
+        self.labels = {}
+        self.head = None
+        self.tail = None
+        for entry in wave_zombies.order:
+            self.link(entry, self.tail, None)
+        self.first_by_key = {}
+        for entry in reversed(wave_zombies.order):
+            self.first_by_key[self.key(entry)] = entry
+
+    def __iter__(self):
+        entry = self.head
+        while entry is not None:
+            yield entry
+            entry = self.next[entry]
+
+    def key(self, entry):
+        return self.wave_zombies.type_ids[entry], self.wave_zombies.rows[entry]
+
+    def first_match(self, entry):
+        # Anchors are located by value, so an earlier spawn with the same type and
+        # row stands in for the anchor itself.
+        key = self.key(entry)
+        first = self.first_by_key.get(key)
+        if first is None:
+            first = next(candidate for candidate in self if self.key(candidate) == key)
+            self.first_by_key[key] = first
+        return first
+
+    def forget(self, entry):
+        key = self.key(entry)
+        if self.first_by_key.get(key) == entry:
+            # The next entry with this key is found again on demand.
+            del self.first_by_key[key]
+
+    def remember(self, entry):
+        key = self.key(entry)
+        first = self.first_by_key.get(key)
+        if first is not None and self.labels[entry] < self.labels[first]:
+            self.first_by_key[key] = entry
+
+    def relabel(self):
+        for index, entry in enumerate(self, start=1):
+            self.labels[entry] = index * self.LABEL_GAP
+
+    def link(self, entry, before, after):
+        low = self.labels[before] if before is not None else 0
+        high = self.labels[after] if after is not None else low + 2 * self.LABEL_GAP
+        if high - low < 2:
+            self.relabel()
+            low = self.labels[before] if before is not None else 0
+            high = self.labels[after]
+        self.labels[entry] = (low + high) // 2
+        self.prev[entry] = before
+        self.next[entry] = after
+        if before is None:
+            self.head = entry
+        else:
+            self.next[before] = entry
+        if after is None:
+            self.tail = entry
+        else:
+            self.prev[after] = entry
+
+    def unlink(self, entry):
+        before = self.prev[entry]
+        after = self.next[entry]
+        if before is None:
+            self.head = after
+        else:
+            self.next[before] = after
+        if after is None:
+            self.tail = before
+        else:
+            self.prev[after] = before
+
+    def set_row(self, entry, row):
+        self.forget(entry)
+        self.wave_zombies.rows[entry] = row
+        self.remember(entry)
+
+    def move_before(self, entry, anchor):
+        if entry == anchor:
+            return
+        self.forget(entry)
+        self.unlink(entry)
+        self.link(entry, self.prev[anchor], anchor)
+        self.remember(entry)
+
+    def move_after(self, entry, anchor):
+        if entry == anchor:
+            return
+        self.forget(entry)
+        self.unlink(entry)
+        self.link(entry, anchor, self.next[anchor])
+        self.remember(entry)
 
-    item = entries.pop(current_index)
-    if current_index < target_index:
-        target_index -= 1
-    target_index = max(0, min(target_index, len(entries)))
-    entries.insert(target_index, item)
+    def commit(self):
+        self.wave_zombies.order[:] = list(self)
 
 
-def apply_future_protector_layout(zombies_list, spawn_row_range):
+def apply_future_protector_layout(wave_zombies, spawn_row_range):
     blocked_aliases = {
         "future_protector",
         "eighties_glitter",
@@ -2480,12 +3277,15 @@ def apply_future_protector_layout(zombies_list, spawn_row_range):
         "eighties_breakdancer",
         "eighties_breakdancer_8bit",
     }
-    reserved_ids = set()
+    layout = WaveLayout(wave_zombies)
+    aliases = wave_zombies.entry_aliases()
+    rows = wave_zombies.rows
+    reserved = set()
 
-    for protector in list(zombies_list):
-        if get_wave_entry_alias(protector) != "future_protector":
+    for protector in list(wave_zombies.order):
+        if aliases[protector] != "future_protector":
             continue
-        protector_row = get_wave_entry_row(protector)
+        protector_row = rows[protector]
         if protector_row is None:
             continue
 
@@ -2498,24 +3298,23 @@ def apply_future_protector_layout(zombies_list, spawn_row_range):
             continue
 
         chosen = []
-        for candidate in zombies_list:
-            if candidate is protector or id(candidate) in reserved_ids:
+        for candidate in layout:
+            if candidate == protector or candidate in reserved:
                 continue
-            alias = get_wave_entry_alias(candidate)
-            if alias in blocked_aliases:
+            if aliases[candidate] in blocked_aliases:
                 continue
             chosen.append(candidate)
-            reserved_ids.add(id(candidate))
+            reserved.add(candidate)
             if len(chosen) >= len(target_rows):
                 break
 
         for row, candidate in zip(target_rows, chosen):
-            set_wave_entry_row(candidate, row)
-            protector_index = zombies_list.index(protector)
-            move_wave_entry(zombies_list, candidate, protector_index + 1)
+            layout.set_row(candidate, row)
+            layout.move_after(candidate, layout.first_match(protector))
+    layout.commit()
 
 
-def apply_glitter_layout(zombies_list, spawn_row_range, active_jam):
+def apply_glitter_layout(wave_zombies, spawn_row_range, active_jam):
     glitter_styles = {
         "eighties_glitter": "jam_pop",
         "eighties_glitter_8bit": "jam_8bit",
@@ -2526,33 +3325,32 @@ def apply_glitter_layout(zombies_list, spawn_row_range, active_jam):
         "eighties_breakdancer_8bit",
         "future_protector",
     }
-    reserved_ids = set()
+    layout = WaveLayout(wave_zombies)
+    aliases = wave_zombies.entry_aliases()
+    rows = wave_zombies.rows
+    reserved = set()
 
-    for glitter in list(zombies_list):
-        glitter_alias = get_wave_entry_alias(glitter)
-        if glitter_styles.get(glitter_alias) not in active_jam_names:
+    for glitter in list(wave_zombies.order):
+        if glitter_styles.get(aliases[glitter]) not in active_jam_names:
             continue
-        glitter_row = get_wave_entry_row(glitter)
+        glitter_row = rows[glitter]
         if glitter_row is None:
             continue
 
-        chosen = []
-        for candidate in zombies_list:
-            if candidate is glitter or id(candidate) in reserved_ids:
-                continue
-            alias = get_wave_entry_alias(candidate)
-            if alias in blocked_aliases:
-                continue
-            chosen.append(candidate)
-            reserved_ids.add(id(candidate))
+        chosen = [
+            candidate
+            for candidate in layout
+            if candidate != glitter and candidate not in reserved and aliases[candidate] not in blocked_aliases
+        ]
+        reserved.update(chosen)
 
         for candidate in chosen:
-            set_wave_entry_row(candidate, glitter_row)
-            glitter_index = zombies_list.index(glitter)
-            move_wave_entry(zombies_list, candidate, glitter_index + 1)
+            layout.set_row(candidate, glitter_row)
+            layout.move_after(candidate, layout.first_match(glitter))
+    layout.commit()
 
 
-def apply_breakdancer_layout(zombies_list, spawn_row_range, active_jam):
+def apply_breakdancer_layout(rng, wave_zombies, spawn_row_range, active_jam):
     breakdancer_styles = {
         "eighties_breakdancer": "jam_rap",
         "eighties_breakdancer_8bit": "jam_8bit",
@@ -2565,28 +3363,26 @@ def apply_breakdancer_layout(zombies_list, spawn_row_range, active_jam):
     }
     # Allow breakdancers to be companions to other breakdancers
     companion_blocked = blocked_aliases - set(breakdancer_styles)
+    order = wave_zombies.order
+    aliases = wave_zombies.entry_aliases()
+    rows = wave_zombies.rows
 
     # Collect all breakdancers that match the active jam
-    breakdancers = []
-    for zombie in zombies_list:
-        alias = get_wave_entry_alias(zombie)
-        if breakdancer_styles.get(alias) in active_jam_names:
-            row = get_wave_entry_row(zombie)
-            if row is not None:
-                breakdancers.append((zombie, row))
+    breakdancers = [
+        (entry, rows[entry])
+        for entry in order
+        if breakdancer_styles.get(aliases[entry]) in active_jam_names and rows[entry] is not None
+    ]
 
     if not breakdancers:
         return
+    layout = WaveLayout(wave_zombies)
 
-    # Collect eligible companions (all zombies not in companion_blocked, and not breakdancers themselves? Wait, user wants to allow)
-    # User says allow breakdancers in front, so remove breakdancers from blocked for companions
-    eligible_companions = [z for z in zombies_list if get_wave_entry_alias(z) not in companion_blocked]
-
-    # Remove breakdancers from eligible if we don't want them as companions, but user says allow
-    # To allow, don't remove
+    # Breakdancers may also be companions, so only the other jam leads are excluded.
+    eligible_companions = [entry for entry in order if aliases[entry] not in companion_blocked]
 
     # Shuffle to randomize
-    random.shuffle(eligible_companions)
+    rng.shuffle(eligible_companions)
 
     # Assign companions to breakdancers, each getting 1-5
     companion_index = 0
@@ -2595,27 +3391,24 @@ def apply_breakdancer_layout(zombies_list, spawn_row_range, active_jam):
         if remaining <= 0:
             num_companions = 0
         else:
-            num_companions = random.randint(1, min(5, remaining))
-        assigned = []
-        for _ in range(num_companions):
-            companion = eligible_companions[companion_index]
-            companion_index += 1
-            assigned.append(companion)
+            num_companions = rng.randint(1, min(5, remaining))
+        assigned = eligible_companions[companion_index:companion_index + num_companions]
+        companion_index += num_companions
 
         # Move assigned to dancer's row and position
         for companion in assigned:
-            set_wave_entry_row(companion, dancer_row)
-            dancer_index = zombies_list.index(dancer)
-            move_wave_entry(zombies_list, companion, dancer_index)
+            layout.set_row(companion, dancer_row)
+            layout.move_before(companion, layout.first_match(dancer))
+    layout.commit()
 
 
-def apply_wave_layout_rules(zombies_list, spawn_row_range, active_jam):
-    if not zombies_list or any("Row" not in zombie for zombie in zombies_list):
+def apply_wave_layout_rules(rng, wave_zombies, spawn_row_range, active_jam):
+    if not wave_zombies or any(row is None for row in wave_zombies.rows):
         return
-    apply_future_protector_layout(zombies_list, spawn_row_range)
+    apply_future_protector_layout(wave_zombies, spawn_row_range)
     if get_active_jam_names(active_jam):
-        apply_glitter_layout(zombies_list, spawn_row_range, active_jam)
-        apply_breakdancer_layout(zombies_list, spawn_row_range, active_jam)
+        apply_glitter_layout(wave_zombies, spawn_row_range, active_jam)
+        apply_breakdancer_layout(rng, wave_zombies, spawn_row_range, active_jam)
 
 
 def build_jam_notification_event(wave, jam_name, jam_cfg, existing_aliases):
@@ -2635,7 +3428,7 @@ def build_jam_notification_event(wave, jam_name, jam_cfg, existing_aliases):
     return event_object, f"RTID({alias}@.)"
 
 
-def build_jam_state(jam_cfg, wave_count, stage_module, zombie_jam_styles):
+def build_jam_state(rng, jam_cfg, wave_count, stage_module, zombie_jam_styles):
     if jam_cfg is None:
         return {"active_by_wave": {}, "segment_starts": {}, "preferred_pick_chance": 0.0, "off_jam_suppression_chance": 0.0}
     if not isinstance(jam_cfg, dict):
@@ -2722,30 +3515,40 @@ def build_jam_state(jam_cfg, wave_count, stage_module, zombie_jam_styles):
         if jam_weights is not None and not isinstance(jam_weights, dict):
             raise ValueError("jams.weights must be an object")
 
+        weight_by_jam = {
+            jam_name: as_number(jam_weights.get(jam_name, 1), f"jams.weights.{jam_name}")
+            for jam_name in available_jams
+        }
+        # Only the excluded previous jam changes between segments, so the candidates
+        # and their sampler are cached per exclusion (None keeps every jam).
+        candidates_by_excluded = {}
+
         current_wave = start_wave
         previous_jam = None
         while current_wave <= wave_count:
-            candidate_jams = available_jams[:]
-            if not allow_repeat and previous_jam in candidate_jams and len(candidate_jams) > 1:
-                candidate_jams = [jam for jam in candidate_jams if jam != previous_jam]
-
-            weighted = []
-            for jam_name in candidate_jams:
-                weight = as_number(
-                    jam_weights.get(jam_name, 1),
-                    f"jams.weights.{jam_name}",
-                )
-                if weight > 0:
-                    weighted.append({"jam": jam_name, "weight": weight})
+            excluded = None
+            if not allow_repeat and previous_jam in available_jams and len(available_jams) > 1:
+                excluded = previous_jam
+
+            cached = candidates_by_excluded.get(excluded)
+            if cached is None:
+                weighted = [
+                    {"jam": jam_name, "weight": weight_by_jam[jam_name]}
+                    for jam_name in available_jams
+                    if jam_name != excluded and weight_by_jam[jam_name] > 0
+                ]
+                cached = (weighted, WeightedSampler([entry["weight"] for entry in weighted]))
+                candidates_by_excluded[excluded] = cached
+            weighted, jam_sampler = cached
             if not weighted:
                 break
 
-            chosen_jam = pick_weighted_dict(weighted, "jams.weights")["jam"]
-            segment_length = random.randint(segment_min, segment_max)
+            chosen_jam = pick_sampled_dict(rng, weighted, jam_sampler, "jams.weights")["jam"]
+            segment_length = rng.randint(segment_min, segment_max)
             end_wave = min(wave_count, current_wave + segment_length - 1)
             schedule.append({"jam": chosen_jam, "start_wave": current_wave, "end_wave": end_wave})
             previous_jam = chosen_jam
-            current_wave = end_wave + 1 + random.randint(gap_min, gap_max)
+            current_wave = end_wave + 1 + rng.randint(gap_min, gap_max)
 
     active_by_wave = {}
     segment_starts = {}
@@ -2762,7 +3565,7 @@ def build_jam_state(jam_cfg, wave_count, stage_module, zombie_jam_styles):
     }
 
 
-def apply_jam_candidate_bias(valid_candidates, active_jam, jam_state, zombie_jam_styles):
+def apply_jam_candidate_bias(rng, valid_candidates, active_jam, jam_state, zombie_jam_styles):
     active_jam_names = get_active_jam_names(active_jam)
     if not active_jam_names or active_jam_names == {"jam_ballad"}:
         return valid_candidates
@@ -2778,7 +3581,7 @@ def apply_jam_candidate_bias(valid_candidates, active_jam, jam_state, zombie_jam
     if (
         non_off_jam
         and len(non_off_jam) < len(valid_candidates)
-        and random.random() < jam_state.get("off_jam_suppression_chance", 0.0)
+        and rng.random() < jam_state.get("off_jam_suppression_chance", 0.0)
     ):
         valid_candidates = non_off_jam
 
@@ -2787,16 +3590,77 @@ def apply_jam_candidate_bias(valid_candidates, active_jam, jam_state, zombie_jam
         for zombie_name in valid_candidates
         if zombie_jam_styles.get(zombie_name) in {active_jam_name, JAM_ALL_STYLE}
     ]
-    if jam_matches and random.random() < jam_state.get("preferred_pick_chance", 0.0):
+    if jam_matches and rng.random() < jam_state.get("preferred_pick_chance", 0.0):
         return jam_matches
 
     return valid_candidates
 
 
+def compile_grid_spawn_config(grid_cfg, context):
+    generation_context = context.get("generation_context") or {}
+    pool_source = str(grid_cfg.get("grid_pool_source", "")).strip()
+    compiled = {
+        "alias_prefix": str(grid_cfg.get("alias_prefix", "GridSpawn")),
+        "event_name": str(grid_cfg.get("event_name", "grid_spawn")).strip() or "grid_spawn",
+        "pool_source": pool_source,
+        "pool": None,
+        "positions": None,
+        "all_positions": None,
+        "position_count_range": None,
+        "unique_positions": bool(grid_cfg.get("unique_positions", True)),
+        "spawn_effect": str(grid_cfg.get("spawn_effect", grid_cfg.get("SpawnEffectAnimID", ""))),
+        "spawn_sound_id": str(grid_cfg.get("spawn_sound_id", grid_cfg.get("SpawnSoundID", ""))),
+        "displace_plants": bool(grid_cfg.get("displace_plants", grid_cfg.get("DisplacePlants", True))),
+        "random_placement": bool(grid_cfg.get("random_placement", grid_cfg.get("RandomPlacement", True))),
+        "shake_screen": bool(grid_cfg.get("shake_screen", grid_cfg.get("ShakeScreen", False))),
+        "grid_classes_to_destroy": grid_cfg.get("grid_classes_to_destroy", grid_cfg.get("GridClassesToDestroy", [])),
+        "consume_wave_points": bool(grid_cfg.get("consume_wave_points", True)),
+        "use_portal_costs": False,
+        "point_cost": 0.0,
+    }
+
+    if not pool_source:
+        raw_pool = grid_cfg.get("grid_pool", grid_cfg.get("GravestonePool"))
+        compiled["pool"] = tuple(normalize_grid_item_pool(raw_pool, "events.grid_spawns[].grid_pool"))
+
+    raw_positions = grid_cfg.get("positions", grid_cfg.get("SpawnPositionsPool"))
+    if raw_positions is not None:
+        compiled["positions"] = tuple(normalize_grid_positions(raw_positions, "events.grid_spawns[].positions"))
+    else:
+        spawn_x_range = parse_int_range(
+            grid_cfg.get("spawn_x_range", [0, 8]),
+            "events.grid_spawns[].spawn_x_range",
+        )
+        spawn_y_range = parse_int_range(
+            grid_cfg.get("spawn_y_range", [0, 4]),
+            "events.grid_spawns[].spawn_y_range",
+        )
+        compiled["all_positions"] = tuple(
+            {"mX": x, "mY": y}
+            for x in range(spawn_x_range[0], spawn_x_range[1] + 1)
+            for y in range(spawn_y_range[0], spawn_y_range[1] + 1)
+        )
+        if "position_count_range" in grid_cfg:
+            compiled["position_count_range"] = parse_int_range(
+                grid_cfg.get("position_count_range"),
+                "events.grid_spawns[].position_count_range",
+            )
+
+    if compiled["consume_wave_points"]:
+        portal_costs = generation_context.get("portal_costs", {})
+        use_portal_costs = bool(grid_cfg.get("use_portal_costs", bool(pool_source and portal_costs)))
+        compiled["use_portal_costs"] = bool(use_portal_costs and portal_costs and pool_source)
+        if not compiled["use_portal_costs"]:
+            compiled["point_cost"] = as_number(grid_cfg.get("point_cost", 0), "grid_spawns[].point_cost")
+
+    return compiled
+
+
 def build_grid_spawn_event(
+    rng,
     wave,
     ambush_count,
-    grid_cfg,
+    grid_spawn,
     existing_aliases,
     wave_points_remaining,
     generation_context=None,
@@ -2804,53 +3668,36 @@ def build_grid_spawn_event(
     if generation_context is None:
         generation_context = {}
 
-    alias_prefix = str(grid_cfg.get("alias_prefix", "GridSpawn"))
-    event_name = str(grid_cfg.get("event_name", "grid_spawn")).strip() or "grid_spawn"
-    alias = make_unique_alias(f"{alias_prefix}{wave}_{ambush_count}_{event_name}", existing_aliases)
+    alias = make_unique_alias(
+        f"{grid_spawn['alias_prefix']}{wave}_{ambush_count}_{grid_spawn['event_name']}",
+        existing_aliases,
+    )
 
-    pool_source = str(grid_cfg.get("grid_pool_source", "")).strip()
+    pool_source = grid_spawn["pool_source"]
     if pool_source:
         generated_grid_pools = generation_context.get("generated_grid_pools", {})
         if pool_source not in generated_grid_pools:
             raise ValueError(
                 f'events.grid_spawns[].grid_pool_source "{pool_source}" was not generated'
             )
-        pool = copy.deepcopy(generated_grid_pools[pool_source])
+        pool = [copy_config_value(pool_entry) for pool_entry in generated_grid_pools[pool_source]]
     else:
-        raw_pool = grid_cfg.get("grid_pool", grid_cfg.get("GravestonePool"))
-        pool = normalize_grid_item_pool(raw_pool, "events.grid_spawns[].grid_pool")
+        pool = [dict(pool_entry) for pool_entry in grid_spawn["pool"]]
 
-    raw_positions = grid_cfg.get("positions", grid_cfg.get("SpawnPositionsPool"))
-    if raw_positions is not None:
-        spawn_positions = normalize_grid_positions(raw_positions, "events.grid_spawns[].positions")
+    if grid_spawn["positions"] is not None:
+        spawn_positions = [dict(position) for position in grid_spawn["positions"]]
     else:
-        spawn_x_range = parse_int_range(
-            grid_cfg.get("spawn_x_range", [0, 8]),
-            "events.grid_spawns[].spawn_x_range",
-        )
-        spawn_y_range = parse_int_range(
-            grid_cfg.get("spawn_y_range", [0, 4]),
-            "events.grid_spawns[].spawn_y_range",
-        )
-        all_positions = [
-            {"mX": x, "mY": y}
-            for x in range(spawn_x_range[0], spawn_x_range[1] + 1)
-            for y in range(spawn_y_range[0], spawn_y_range[1] + 1)
-        ]
-        position_count_range = parse_int_range(
-            grid_cfg.get("position_count_range", [len(pool), len(pool)]),
-            "events.grid_spawns[].position_count_range",
-        )
-        position_count = random.randint(*position_count_range)
-        unique_positions = bool(grid_cfg.get("unique_positions", True))
-        if unique_positions and position_count > len(all_positions):
+        all_positions = grid_spawn["all_positions"]
+        position_count_range = grid_spawn["position_count_range"] or (len(pool), len(pool))
+        position_count = rng.randint(*position_count_range)
+        if grid_spawn["unique_positions"] and position_count > len(all_positions):
             raise ValueError(
                 "events.grid_spawns[] requested more unique positions than the configured spawn area allows"
             )
-        if unique_positions:
-            spawn_positions = random.sample(all_positions, position_count)
+        if grid_spawn["unique_positions"]:
+            spawn_positions = [dict(position) for position in rng.sample(all_positions, position_count)]
         else:
-            spawn_positions = [random.choice(all_positions) for _ in range(position_count)]
+            spawn_positions = [dict(rng.choice(all_positions)) for _ in range(position_count)]
 
     event_object = {
         "aliases": [alias],
@@ -2858,22 +3705,18 @@ def build_grid_spawn_event(
         "objdata": {
             "GravestonePool": pool,
             "SpawnPositionsPool": spawn_positions,
-            "SpawnEffectAnimID": str(grid_cfg.get("spawn_effect", grid_cfg.get("SpawnEffectAnimID", ""))),
-            "SpawnSoundID": str(grid_cfg.get("spawn_sound_id", grid_cfg.get("SpawnSoundID", ""))),
-            "DisplacePlants": bool(grid_cfg.get("displace_plants", grid_cfg.get("DisplacePlants", True))),
-            "RandomPlacement": bool(grid_cfg.get("random_placement", grid_cfg.get("RandomPlacement", True))),
-            "ShakeScreen": bool(grid_cfg.get("shake_screen", grid_cfg.get("ShakeScreen", False))),
-            "GridClassesToDestroy": copy.deepcopy(
-                grid_cfg.get("grid_classes_to_destroy", grid_cfg.get("GridClassesToDestroy", []))
-            ),
+            "SpawnEffectAnimID": grid_spawn["spawn_effect"],
+            "SpawnSoundID": grid_spawn["spawn_sound_id"],
+            "DisplacePlants": grid_spawn["displace_plants"],
+            "RandomPlacement": grid_spawn["random_placement"],
+            "ShakeScreen": grid_spawn["shake_screen"],
+            "GridClassesToDestroy": copy_config_value(grid_spawn["grid_classes_to_destroy"]),
         },
     }
 
-    consume = bool(grid_cfg.get("consume_wave_points", True))
-    if consume:
-        portal_costs = generation_context.get("portal_costs", {})
-        use_portal_costs = bool(grid_cfg.get("use_portal_costs", bool(pool_source and portal_costs)))
-        if use_portal_costs and portal_costs and pool_source:
+    if grid_spawn["consume_wave_points"]:
+        if grid_spawn["use_portal_costs"]:
+            portal_costs = generation_context.get("portal_costs", {})
             # Compute weighted-average portal cost across the pool, then multiply by
             # the number of positions spawned.  Each pool entry has a "Count" weight;
             # we weight each portal's cost accordingly so the budget deduction matches
@@ -2893,17 +3736,16 @@ def build_grid_spawn_event(
                 weighted_cost_sum += entry_cost * entry_weight
             avg_portal_cost = (weighted_cost_sum / total_weight) if total_weight > 0 else 0.0
             wave_points_remaining -= len(spawn_positions) * avg_portal_cost
-        else:
-            point_cost = as_number(grid_cfg.get("point_cost", 0), "grid_spawns[].point_cost")
-            if point_cost > 0:
-                wave_points_remaining -= len(spawn_positions) * point_cost
+        elif grid_spawn["point_cost"] > 0:
+            wave_points_remaining -= len(spawn_positions) * grid_spawn["point_cost"]
 
     return event_object, f"RTID({alias}@.)", wave_points_remaining
 
 
-def build_frost_wind_event(wave, ambush_count, frost_cfg, existing_aliases, wave_points_remaining):
-    if not frost_cfg.get("enabled", False):
-        return None, None, wave_points_remaining
+def compile_frost_wind_config(frost_cfg, context=None):
+    compiled = {"enabled": bool(frost_cfg.get("enabled", False))}
+    if not compiled["enabled"]:
+        return compiled
 
     raw_rows = frost_cfg.get("rows", [])
     if not isinstance(raw_rows, list) or len(raw_rows) == 0:
@@ -2941,12 +3783,36 @@ def build_frost_wind_event(wave, ambush_count, frost_cfg, existing_aliases, wave
     )
     if point_cost_per_lane < 0:
         raise ValueError("frost_cfg.point_cost_per_lane cannot be negative")
-    consume_wave_points = bool(frost_cfg.get("consume_wave_points", point_cost_per_lane > 0))
-    enforce_budget = bool(frost_cfg.get("enforce_budget", point_cost_per_lane > 0))
-    allow_partial_budget = bool(frost_cfg.get("allow_partial_budget", True))
 
-    affordable_lane_count = max_lane_count
-    if enforce_budget and point_cost_per_lane > 0:
+    pattern = frost_cfg.get("pattern", "split").lower()
+    if pattern not in FROST_WIND_PATTERNS:
+        raise ValueError(f"Unknown frost pattern: {pattern}")
+
+    compiled.update(
+        {
+            "rows": tuple(rows),
+            "min_lane_count": min_lane_count,
+            "max_lane_count": max_lane_count,
+            "point_cost_per_lane": point_cost_per_lane,
+            "consume_wave_points": bool(frost_cfg.get("consume_wave_points", point_cost_per_lane > 0)),
+            "enforce_budget": bool(frost_cfg.get("enforce_budget", point_cost_per_lane > 0)),
+            "allow_partial_budget": bool(frost_cfg.get("allow_partial_budget", True)),
+            "pattern": pattern,
+        }
+    )
+    return compiled
+
+
+def build_frost_wind_event(rng, wave, ambush_count, frost_wind, existing_aliases, wave_points_remaining):
+    if not frost_wind["enabled"]:
+        return None, None, wave_points_remaining
+
+    rows = frost_wind["rows"]
+    min_lane_count = frost_wind["min_lane_count"]
+    point_cost_per_lane = frost_wind["point_cost_per_lane"]
+
+    affordable_lane_count = frost_wind["max_lane_count"]
+    if frost_wind["enforce_budget"] and point_cost_per_lane > 0:
         affordable_lane_count = min(
             affordable_lane_count,
             int(wave_points_remaining // point_cost_per_lane),
@@ -2956,11 +3822,11 @@ def build_frost_wind_event(wave, ambush_count, frost_cfg, existing_aliases, wave
         return None, None, wave_points_remaining
 
     if affordable_lane_count < min_lane_count:
-        if not allow_partial_budget:
+        if not frost_wind["allow_partial_budget"]:
             return None, None, wave_points_remaining
         lane_count = affordable_lane_count
     else:
-        lane_count = random.randint(min_lane_count, affordable_lane_count)
+        lane_count = rng.randint(min_lane_count, affordable_lane_count)
 
     if lane_count <= 0:
         return None, None, wave_points_remaining
@@ -2968,9 +3834,9 @@ def build_frost_wind_event(wave, ambush_count, frost_cfg, existing_aliases, wave
     if lane_count >= len(rows):
         rows = sorted(rows)
     else:
-        rows = sorted(random.sample(rows, lane_count))
+        rows = sorted(rng.sample(rows, lane_count))
 
-    pattern = frost_cfg.get("pattern", "split").lower()
+    pattern = frost_wind["pattern"]
 
     winds = []
 
@@ -3018,7 +3884,7 @@ def build_frost_wind_event(wave, ambush_count, frost_cfg, existing_aliases, wave
     elif pattern == "random":
         for row in rows:
             winds.append({
-                "Direction": random.choice(["left", "right"]),
+                "Direction": rng.choice(["left", "right"]),
                 "Row": str(row)
             })
 
@@ -3056,12 +3922,13 @@ def build_frost_wind_event(wave, ambush_count, frost_cfg, existing_aliases, wave
         }
     }
 
-    if consume_wave_points and point_cost_per_lane > 0:
+    if frost_wind["consume_wave_points"] and point_cost_per_lane > 0:
         wave_points_remaining = max(0.0, wave_points_remaining - (len(winds) * point_cost_per_lane))
 
     return event_object, f"RTID({alias}@.)", wave_points_remaining
 
 def build_low_tide_events(
+    rng,
     wave,
     ambush_count,
     tide_cfg,
@@ -3073,12 +3940,13 @@ def build_low_tide_events(
     zombie_variant_groups=None,
     variant_alias_to_roll=None,
     last_tide_end=4,
+    zombie_classes=None,
 ):
     alias_prefix = str(tide_cfg.get("alias_prefix", "LowTide"))
     event_name = str(tide_cfg.get("event_name", "low_tide")).strip() or "low_tide"
 
     column_start = last_tide_end
-    column_end = 7 if last_tide_end >= 7 else random.randint(last_tide_end + 1, 7)
+    column_end = 7 if last_tide_end >= 7 else rng.randint(last_tide_end + 1, 7)
 
     objects = []
     refs = []
@@ -3095,12 +3963,12 @@ def build_low_tide_events(
         for zombie_name in cleaned_pool:
             if zombie_name not in all_zombie_aliases:
                 raise ValueError(f'events.low_tides[].zombie_pool contains "{zombie_name}" which was not found in ZombieTypes')
-            if not allow_flag_zombies and is_flag_zombie_alias(zombie_name):
+            if not allow_flag_zombies and is_flag_zombie(zombie_name, zombie_classes):
                 continue
             validated_pool.append(zombie_name)
         cleaned_pool = validated_pool
         if len(cleaned_pool) == 0:
-            return objects, refs, remaining, 7 if last_tide_end >= 7 else random.randint(last_tide_end + 1, 7)
+            return objects, refs, remaining, 7 if last_tide_end >= 7 else rng.randint(last_tide_end + 1, 7)
 
         # Select zombies like sandstorm
         use_wave_points_budget = bool(tide_cfg.get("use_wave_points_budget", True))
@@ -3110,11 +3978,11 @@ def build_low_tide_events(
         points_budget = None
         if use_wave_points_budget:
             ratio_range = parse_float_range(tide_cfg.get("points_budget_ratio_range", [0.2, 0.6]), "low_tide.points_budget_ratio_range")
-            points_budget = max(0.0, remaining * random.uniform(*ratio_range))
+            points_budget = max(0.0, remaining * rng.uniform(*ratio_range))
 
         allow_duplicate_zombies = bool(tide_cfg.get("allow_duplicate_zombies", True))
         zombies_per_spawner_range = parse_int_range(tide_cfg.get("zombies_per_spawner_range", [1, 2]), "low_tide.zombies_per_spawner_range")
-        zombie_count = random.randint(*zombies_per_spawner_range)
+        zombie_count = rng.randint(*zombies_per_spawner_range)
         if not allow_duplicate_zombies and zombie_count > len(cleaned_pool):
             zombie_count = len(cleaned_pool)
 
@@ -3138,10 +4006,10 @@ def build_low_tide_events(
                 zombie_name = candidates[0]
             elif zombie_choice_greediness >= 0.5:
                 choice_count = max(1, int(len(candidates) * zombie_choice_greediness))
-                zombie_name = random.choice(candidates[len(candidates) - choice_count :])
+                zombie_name = rng.choice(candidates[len(candidates) - choice_count :])
             else:
                 choice_count = max(1, int(len(candidates) * (1 - zombie_choice_greediness)))
-                zombie_name = random.choice(candidates[:choice_count])
+                zombie_name = rng.choice(candidates[:choice_count])
             picked_rolls.append(zombie_name)
             used_in_spawner.add(zombie_name)
             if budget_remaining is not None and enforce_budget:
@@ -3149,11 +4017,11 @@ def build_low_tide_events(
                 budget_remaining = max(0.0, budget_remaining)
 
         if len(picked_rolls) == 0:
-            return objects, refs, remaining, 7 if last_tide_end >= 7 else random.randint(last_tide_end + 1, 7)
+            return objects, refs, remaining, 7 if last_tide_end >= 7 else rng.randint(last_tide_end + 1, 7)
 
         alias = make_unique_alias(f"{alias_prefix}{wave}_{event_name}", existing_aliases)
         picked_zombies = [
-            pick_zombie_variant_alias(zombie_name, zombie_variant_groups)
+            pick_zombie_variant_alias(rng, zombie_name, zombie_variant_groups)
             for zombie_name in picked_rolls
         ]
         # Group by zombie type
@@ -3161,7 +4029,7 @@ def build_low_tide_events(
         zombie_counts = Counter(picked_rolls)
         first = True
         for zombie_name, count in zombie_counts.items():
-            zombie_alias = pick_zombie_variant_alias(zombie_name, zombie_variant_groups)
+            zombie_alias = pick_zombie_variant_alias(rng, zombie_name, zombie_variant_groups)
             alias = make_unique_alias(f"{alias_prefix}{wave}_{event_name}_{zombie_name.replace('_', '')}", existing_aliases)
             event_object = {
                 "aliases": [alias],
@@ -3210,7 +4078,7 @@ def build_low_tide_events(
             raise ValueError(
                 f'events.low_tides[].variants[{idx}].zombie_name "{zombie_name}" not found in ZombieTypes'
             )
-        if not allow_flag_zombies and is_flag_zombie_alias(zombie_name):
+        if not allow_flag_zombies and is_flag_zombie(zombie_name, zombie_classes):
             continue
 
         count = 0
@@ -3225,7 +4093,7 @@ def build_low_tide_events(
                 variant.get("zombie_count_range", tide_cfg.get("zombie_count_range", [1, 2])),
                 f"events.low_tides[].variants[{idx}].zombie_count_range",
             )
-            count = random.randint(*count_range)
+            count = rng.randint(*count_range)
         elif count_mode == "points_based":
             point_cost = variant.get("point_cost", tide_cfg.get("point_cost", all_zombie_costs.get(zombie_name)))
             if point_cost is None:
@@ -3244,7 +4112,7 @@ def build_low_tide_events(
             if max_allowed < min_count:
                 count = max_allowed
             else:
-                count = random.randint(min_count, max_allowed)
+                count = rng.randint(min_count, max_allowed)
         else:
             raise ValueError(
                 "events.low_tides[].count_mode must be 'fixed', 'range', or 'points_based'"
@@ -3280,6 +4148,7 @@ def build_low_tide_events(
 
 
 def build_grid_item_spawner_event(
+    rng,
     wave,
     ambush_count,
     spawner_cfg,
@@ -3290,6 +4159,7 @@ def build_grid_item_spawner_event(
     allow_flag_zombies=True,
     zombie_variant_groups=None,
     variant_alias_to_roll=None,
+    zombie_classes=None,
 ):
     alias_prefix = str(spawner_cfg.get("alias_prefix", "GridSpawner"))
     event_name = str(spawner_cfg.get("event_name", "grid_spawner")).strip() or "grid_spawner"
@@ -3322,7 +4192,7 @@ def build_grid_item_spawner_event(
             variant_alias_to_roll=variant_alias_to_roll,
         )
         if not allow_flag_zombies:
-            prepared_pool = [entry for entry in prepared_pool if not is_flag_zombie_alias(entry["alias"])]
+            prepared_pool = [entry for entry in prepared_pool if not is_flag_zombie(entry["alias"], zombie_classes)]
         if len(prepared_pool) == 0:
             return [], [], remaining
 
@@ -3337,13 +4207,13 @@ def build_grid_item_spawner_event(
                 spawner_cfg.get("points_budget_ratio_range", [0.2, 0.6]),
                 "events.necromancy_spawns[].points_budget_ratio_range",
             )
-            points_budget = max(0.0, base_remaining * random.uniform(*ratio_range))
+            points_budget = max(0.0, base_remaining * rng.uniform(*ratio_range))
         elif "points_budget_range" in spawner_cfg:
             absolute_range = parse_float_range(
                 spawner_cfg.get("points_budget_range"),
                 "events.necromancy_spawns[].points_budget_range",
             )
-            points_budget = max(0.0, random.uniform(*absolute_range))
+            points_budget = max(0.0, rng.uniform(*absolute_range))
 
         if "zombie_count" in spawner_cfg or "ZombieCount" in spawner_cfg:
             target_count = as_int(
@@ -3355,35 +4225,42 @@ def build_grid_item_spawner_event(
                 spawner_cfg.get("zombie_count_range", spawner_cfg.get("ZombieCountRange", [1, 1])),
                 "events.necromancy_spawns[].zombie_count_range",
             )
-            target_count = random.randint(*count_range)
+            target_count = rng.randint(*count_range)
 
         allow_duplicate_zombies = bool(spawner_cfg.get("allow_duplicate_zombies", True))
         if target_count <= 0:
             return [], [], remaining
 
+        # Used aliases and zombies priced out of the shrinking budget never come back,
+        # so they are dropped from one sampler instead of refiltering the pool per pick.
+        pool_sampler = ShrinkingWeightedSampler([entry["weight"] for entry in prepared_pool])
+        pool_costs = [all_zombie_costs.get(entry["alias"], 0.0) for entry in prepared_pool]
+        indexes_by_alias = {}
+        for index, entry in enumerate(prepared_pool):
+            indexes_by_alias.setdefault(entry["alias"], []).append(index)
+        by_cost_desc = sorted(range(len(prepared_pool)), key=lambda index: pool_costs[index], reverse=True)
+        priced_out = 0
+
         budget_remaining = points_budget
         selected_aliases = []
-        used_aliases = set()
         while len(selected_aliases) < target_count:
-            candidates = prepared_pool
-            if not allow_duplicate_zombies:
-                candidates = [entry for entry in prepared_pool if entry["alias"] not in used_aliases]
-            if len(candidates) == 0:
-                break
             if enforce_budget and budget_remaining is not None:
-                affordable = []
-                for entry in candidates:
-                    zombie_cost = all_zombie_costs.get(entry["alias"], 0.0)
+                while priced_out < len(by_cost_desc):
+                    zombie_cost = pool_costs[by_cost_desc[priced_out]]
                     if zombie_cost <= 0 or zombie_cost <= (budget_remaining + 1e-9):
-                        affordable.append(entry)
-                if len(affordable) == 0:
-                    break
-                candidates = affordable
+                        break
+                    pool_sampler.remove(by_cost_desc[priced_out])
+                    priced_out += 1
+            if len(pool_sampler) == 0:
+                break
 
-            chosen = pick_weighted_entry(candidates, "events.necromancy_spawns[].zombie_pool")
-            selected_aliases.append(pick_zombie_variant_alias(chosen["alias"], zombie_variant_groups))
-            used_aliases.add(chosen["alias"])
-            zombie_cost = all_zombie_costs.get(chosen["alias"], 0.0)
+            chosen_index = pool_sampler.pick(rng)
+            chosen = prepared_pool[chosen_index]
+            selected_aliases.append(pick_zombie_variant_alias(rng, chosen["alias"], zombie_variant_groups))
+            if not allow_duplicate_zombies:
+                for index in indexes_by_alias[chosen["alias"]]:
+                    pool_sampler.remove(index)
+            zombie_cost = pool_costs[chosen_index]
             points_spent += zombie_cost
             if budget_remaining is not None and enforce_budget:
                 budget_remaining = max(0.0, budget_remaining - zombie_cost)
@@ -3398,7 +4275,12 @@ def build_grid_item_spawner_event(
         raise ValueError("events.necromancy_spawns[] must define zombies/Zombies or zombie_pool/ZombiePool")
 
     if not allow_flag_zombies:
-        zombies = [entry for entry in zombies if not is_flag_zombie_reference(entry.get("Type"))]
+        kept_zombies = []
+        for entry in zombies:
+            zombie_alias = resolve_zombie_reference_alias(entry.get("Type"))
+            if zombie_alias is None or not is_flag_zombie(zombie_alias, zombie_classes):
+                kept_zombies.append(entry)
+        zombies = kept_zombies
         if len(zombies) == 0:
             return [], [], remaining
 
@@ -3427,8 +4309,8 @@ def build_grid_item_spawner_event(
         raw_lane_range = spawner_cfg.get("lane_count_range", [1, 3])
         lane_min, lane_max = parse_int_range(raw_lane_range, "events.necromancy_spawns[].lane_count_range")
         lane_max = min(lane_max, 5)
-        num_lanes = random.randint(lane_min, lane_max)
-        chosen_rows = sorted(random.sample(range(5), num_lanes))
+        num_lanes = rng.randint(lane_min, lane_max)
+        chosen_rows = sorted(rng.sample(range(5), num_lanes))
 
         spawn_positions = [
             {"mX": x, "mY": y} for y in chosen_rows for x in range(9)
@@ -3464,7 +4346,7 @@ def build_grid_item_spawner_event(
     return [event_object], [f"RTID({alias}@.)"], remaining
 
 
-def apply_dino_row_pressure(zombies_list, dino_row, is_ptero, zombie_rtid, fraction=0.40):
+def apply_dino_row_pressure(rng, wave_zombies, dino_row, is_ptero, ptero_support_types, fraction=0.40):
     """Reassign a fraction of eligible zombies' rows to dino_row.
 
     For ptero (is_ptero=True): only zombies whose type is in DINO_PTERO_SUPPORT_ZOMBIES
@@ -3472,33 +4354,30 @@ def apply_dino_row_pressure(zombies_list, dino_row, is_ptero, zombie_rtid, fract
     For other dinos: any zombie is eligible.
     The fraction cap ensures we never fill the *entire* wave into one row.
     """
-    # Build reverse map: RTID string -> alias
-    rtid_to_alias = {v: k for k, v in zombie_rtid.items()}
-
-    eligible_indices = []
-    for i, z in enumerate(zombies_list):
-        if "Row" not in z:
-            continue  # planks mode — no row to reassign
-        alias = rtid_to_alias.get(z.get("Type", ""), "")
-        if is_ptero:
-            if alias in DINO_PTERO_SUPPORT_ZOMBIES:
-                eligible_indices.append(i)
-        else:
-            eligible_indices.append(i)
+    rows = wave_zombies.rows
+    if is_ptero:
+        types = wave_zombies.entry_types()
+        eligible = [
+            entry
+            for entry in wave_zombies.order
+            if rows[entry] is not None and types[entry] in ptero_support_types
+        ]
+    else:
+        # Planks mode has no rows to reassign.
+        eligible = [entry for entry in wave_zombies.order if rows[entry] is not None]
 
-    if not eligible_indices:
+    if not eligible:
         return
 
     # Pick a random subset — at most `fraction` of ALL zombies, capped so we don't
     # dominate the wave.
-    max_to_move = max(1, int(len(zombies_list) * fraction))
-    count_to_move = random.randint(1, min(len(eligible_indices), max_to_move))
-    chosen = random.sample(eligible_indices, count_to_move)
-    for i in chosen:
-        zombies_list[i]["Row"] = str(dino_row)
+    max_to_move = max(1, int(len(wave_zombies) * fraction))
+    count_to_move = rng.randint(1, min(len(eligible), max_to_move))
+    for entry in rng.sample(eligible, count_to_move):
+        rows[entry] = dino_row
 
 
-def build_dino_events(wave, ambush_count, dino_cfg, existing_aliases, wave_points_remaining, wave_zombies):
+def build_dino_events(rng, wave, ambush_count, dino_cfg, existing_aliases, wave_points_remaining, wave_zombies):
     alias_prefix = str(dino_cfg.get("alias_prefix", "Dino"))
     event_name = str(dino_cfg.get("event_name", "dino")).strip() or "dino"
 
@@ -3509,12 +4388,12 @@ def build_dino_events(wave, ambush_count, dino_cfg, existing_aliases, wave_point
     refs = []
     main_action_count = 0
 
-    def pick_weighted_pool_entry(pool, label, type_field="type_name"):
-        weighted = []
+    def get_pool_weights(pool, label, type_field="type_name"):
+        weights = []
         for pool_idx, entry in enumerate(pool):
             entry_label = f"{label}[{pool_idx}]"
             if isinstance(entry, str):
-                weighted.append((entry, 1.0))
+                weights.append(1.0)
                 continue
             if not isinstance(entry, dict):
                 raise ValueError(f"{entry_label} must be a string or object")
@@ -3524,22 +4403,8 @@ def build_dino_events(wave, ambush_count, dino_cfg, existing_aliases, wave_point
             entry_weight = as_number(entry.get("weight", 1), f"{entry_label}.weight")
             if entry_weight < 0:
                 raise ValueError(f"{entry_label}.weight cannot be negative")
-            weighted.append((entry, entry_weight))
-
-        if len(weighted) == 0:
-            raise ValueError(f"{label} must contain at least one pool entry")
-
-        total_weight = sum(weight for _, weight in weighted)
-        if total_weight <= 0:
-            return random.choice([entry for entry, _ in weighted])
-
-        roll = random.uniform(0.0, total_weight)
-        running = 0.0
-        for entry, weight in weighted:
-            running += weight
-            if roll <= running:
-                return entry
-        return weighted[-1][0]
+            weights.append(entry_weight)
+        return weights
 
     def resolve_dino_row(action_cfg, field_name, dino_type):
         requested_row = get_dino_action_row(action_cfg, field_name)
@@ -3547,14 +4412,14 @@ def build_dino_events(wave, ambush_count, dino_cfg, existing_aliases, wave_point
         if required_rows is None:
             if requested_row is not None:
                 return requested_row
-            return random.randint(0, 4)
+            return rng.randint(0, 4)
         if requested_row is not None:
             if requested_row in required_rows:
                 return requested_row
             return None
         if len(required_rows) == 0:
             return None
-        return random.choice(sorted(required_rows))
+        return rng.choice(sorted(required_rows))
 
     selection_mode = str(dino_cfg.get("selection_mode", "")).strip().casefold()
     use_weighted_selection = selection_mode in {"weighted", "pool", "random_pool"}
@@ -3599,18 +4464,18 @@ def build_dino_events(wave, ambush_count, dino_cfg, existing_aliases, wave_point
         if max_count < dino_count_range[0]:
             target_count = max_count
         else:
-            target_count = random.randint(dino_count_range[0], max_count)
+            target_count = rng.randint(dino_count_range[0], max_count)
         actions_to_spawn = []
-        selection_pool = spawnable_actions[:]
-        while len(actions_to_spawn) < target_count and selection_pool:
-            chosen_action = pick_weighted_pool_entry(
-                selection_pool,
-                "events.dino_ambushes[].dinos",
-                type_field="dino_type",
-            )
-            actions_to_spawn.append(chosen_action)
+        action_weights = get_pool_weights(spawnable_actions, "events.dino_ambushes[].dinos", type_field="dino_type")
+        if allow_duplicate_dinos:
+            action_sampler = WeightedSampler(action_weights)
+        else:
+            action_sampler = ShrinkingWeightedSampler(action_weights)
+        while len(actions_to_spawn) < target_count and len(action_sampler) > 0:
+            action_idx = action_sampler.pick(rng)
+            actions_to_spawn.append(spawnable_actions[action_idx])
             if not allow_duplicate_dinos:
-                selection_pool.remove(chosen_action)
+                action_sampler.remove(action_idx)
 
     for idx, action_cfg in enumerate(actions_to_spawn):
         dino_type = get_dino_action_type(action_cfg, f"events.dino_ambushes[].actions[{idx}]")
@@ -3656,12 +4521,12 @@ def build_dino_events(wave, ambush_count, dino_cfg, existing_aliases, wave_point
             affordable = int(wave_points_remaining // same_row_point_cost)
             max_allowed = min(same_row_count_range[1], affordable)
             if max_allowed >= same_row_count_range[0]:
-                extra_count = random.randint(same_row_count_range[0], max_allowed)
+                extra_count = rng.randint(same_row_count_range[0], max_allowed)
+                same_row_sampler = WeightedSampler(
+                    get_pool_weights(same_row_pool, f"events.dino_ambushes[].actions[{idx}].same_row_pool")
+                )
                 for extra_idx in range(extra_count):
-                    extra_dino_type = pick_weighted_pool_entry(
-                        same_row_pool,
-                        f"events.dino_ambushes[].actions[{idx}].same_row_pool",
-                    )
+                    extra_dino_type = same_row_pool[same_row_sampler.pick(rng)]
                     if not isinstance(extra_dino_type, str):
                         extra_dino_type = get_dino_action_type(
                             extra_dino_type,
@@ -3692,7 +4557,7 @@ def build_dino_events(wave, ambush_count, dino_cfg, existing_aliases, wave_point
     return objects, refs, wave_points_remaining
 
 
-def build_market_event(wave, ambush_count, market_cfg):
+def build_market_event(rng, wave, ambush_count, market_cfg):
     alias_prefix = str(market_cfg.get("alias_prefix", "GridSpawn"))
     alias = f"{alias_prefix}{wave}_{ambush_count}"
 
@@ -3701,7 +4566,7 @@ def build_market_event(wave, ambush_count, market_cfg):
         "events.market.special_grid_spawn_chance",
     )
 
-    if random.random() < special_spawn_chance:
+    if rng.random() < special_spawn_chance:
         special_items = market_cfg.get("special_grid_items", [])
         if not isinstance(special_items, list) or len(special_items) == 0:
             raise ValueError("events.market.special_grid_items must be a non-empty array")
@@ -3719,7 +4584,7 @@ def build_market_event(wave, ambush_count, market_cfg):
             "events.market.special_item_spawn_y_range",
         )
         spawn_positions = [
-            {"mX": random.randint(*special_x_range), "mY": random.randint(*special_y_range)}
+            {"mX": rng.randint(*special_x_range), "mY": rng.randint(*special_y_range)}
             for _ in special_items
         ]
         spawn_effect = str(
@@ -3736,7 +4601,7 @@ def build_market_event(wave, ambush_count, market_cfg):
         )
         pool = [
             {
-                "Count": random.randint(*default_count_range),
+                "Count": rng.randint(*default_count_range),
                 "Type": f"RTID({default_item}@GridItemTypes)",
             }
         ]
@@ -3749,7 +4614,7 @@ def build_market_event(wave, ambush_count, market_cfg):
             "events.market.default_item_spawn_y_range",
         )
         spawn_positions = [
-            {"mX": random.randint(*default_x_range), "mY": random.randint(*default_y_range)}
+            {"mX": rng.randint(*default_x_range), "mY": rng.randint(*default_y_range)}
             for _ in pool
         ]
         spawn_effect = str(market_cfg.get("default_spawn_effect", ""))
@@ -3767,7 +4632,7 @@ def build_market_event(wave, ambush_count, market_cfg):
             "DisplacePlants": bool(market_cfg.get("displace_plants", True)),
             "RandomPlacement": bool(market_cfg.get("random_placement", True)),
             "ShakeScreen": bool(market_cfg.get("shake_screen", False)),
-            "GridClassesToDestroy": copy.deepcopy(
+            "GridClassesToDestroy": copy_config_value(
                 market_cfg.get("grid_classes_to_destroy", [])
             ),
         },
@@ -3776,7 +4641,7 @@ def build_market_event(wave, ambush_count, market_cfg):
     return event_object, f"RTID({alias}@.)"
 
 
-def build_sun_crash_events(wave, ambush_count, sun_cfg, sun_crash_state):
+def build_sun_crash_events(rng, wave, ambush_count, sun_cfg, sun_crash_state):
     msg_alias_prefix = str(sun_cfg.get("message_alias_prefix", "SunMsg"))
     crash_alias_prefix = str(sun_cfg.get("crash_alias_prefix", "SunCrash"))
     msg_alias = f"{msg_alias_prefix}{wave}_{ambush_count}"
@@ -3787,7 +4652,7 @@ def build_sun_crash_events(wave, ambush_count, sun_cfg, sun_crash_state):
             sun_cfg.get("first_multiplier_range", [0.15, 0.8]),
             "events.sun_crash.first_multiplier_range",
         )
-        multiplier = round(random.uniform(*first_range), 2)
+        multiplier = round(rng.uniform(*first_range), 2)
         additive = 0
         set_new_multiplier = bool(sun_cfg.get("set_new_multiplier", True))
         set_new_additive = False
@@ -3797,12 +4662,12 @@ def build_sun_crash_events(wave, ambush_count, sun_cfg, sun_crash_state):
             sun_cfg.get("repeat_bad_chance", 0.4),
             "events.sun_crash.repeat_bad_chance",
         )
-        if random.random() < bad_chance:
+        if rng.random() < bad_chance:
             bad_range = parse_float_range(
                 sun_cfg.get("repeat_bad_multiplier_range", [1.2, 2.75]),
                 "events.sun_crash.repeat_bad_multiplier_range",
             )
-            multiplier = round(random.uniform(*bad_range), 2)
+            multiplier = round(rng.uniform(*bad_range), 2)
             additive = 0
             set_new_multiplier = bool(sun_cfg.get("set_new_multiplier", True))
             set_new_additive = False
@@ -3815,8 +4680,8 @@ def build_sun_crash_events(wave, ambush_count, sun_cfg, sun_crash_state):
                 sun_cfg.get("repeat_good_additive_range", [5, 50]),
                 "events.sun_crash.repeat_good_additive_range",
             )
-            multiplier = round(random.uniform(*good_mult_range), 2)
-            additive = random.randint(*good_add_range)
+            multiplier = round(rng.uniform(*good_mult_range), 2)
+            additive = rng.randint(*good_add_range)
             set_new_multiplier = bool(sun_cfg.get("set_new_multiplier", True))
             set_new_additive = bool(sun_cfg.get("set_new_additive", True))
 
@@ -3848,7 +4713,7 @@ def build_sun_crash_events(wave, ambush_count, sun_cfg, sun_crash_state):
     refs = [f"RTID({msg_alias}@.)", f"RTID({crash_alias}@.)"]
     return [message_obj, crash_obj], refs
 
-def build_raidpty_events(wave, ambush_count, raidpty_cfg, wave_points_remaining):
+def build_raidpty_events(rng, wave, ambush_count, raidpty_cfg, wave_points_remaining):
     raidpty_alias_prefix = str(raidpty_cfg.get("raidpty_alias_prefix", "RaidingParty"))
     raidpty_alias = f"{raidpty_alias_prefix}{wave}_{ambush_count}"
 
@@ -3872,7 +4737,7 @@ def build_raidpty_events(wave, ambush_count, raidpty_cfg, wave_points_remaining)
     if max_allowed < min_count:
         count = max_allowed
     else:
-        count = random.randint(min_count, max_allowed)
+        count = rng.randint(min_count, max_allowed)
 
     time_min, time_max = parse_float_range(
         raidpty_cfg.get("time_between_groups_range", [0.25, 4.0]),
@@ -3886,7 +4751,7 @@ def build_raidpty_events(wave, ambush_count, raidpty_cfg, wave_points_remaining)
         "objdata": {
             "SwashbucklerCount": count,
             "GroupSize": group_size,
-            "TimeBetweenGroups": round(random.uniform(time_min, time_max), 3),
+            "TimeBetweenGroups": round(rng.uniform(time_min, time_max), 3),
         },
     }
 
@@ -3895,7 +4760,7 @@ def build_raidpty_events(wave, ambush_count, raidpty_cfg, wave_points_remaining)
     return [raidptyobj], refs, new_remaining
 
 
-def build_Parrotrousle_events(wave, ambush_count, Parrotrousle_cfg, wave_points_remaining):
+def build_Parrotrousle_events(rng, wave, ambush_count, Parrotrousle_cfg, wave_points_remaining):
     parrotrousle_alias_prefix = str(
         Parrotrousle_cfg.get("parrotrousle_alias_prefix", "Parrotrousle")
     )
@@ -3921,7 +4786,7 @@ def build_Parrotrousle_events(wave, ambush_count, Parrotrousle_cfg, wave_points_
     if max_allowed < min_parrots:
         numbparrots = max_allowed
     else:
-        numbparrots = random.randint(min_parrots, max_allowed)
+        numbparrots = rng.randint(min_parrots, max_allowed)
 
     grid_types = Parrotrousle_cfg.get("grid_types", ["RTID(crater@GridItemTypes)"])
     if not isinstance(grid_types, list):
@@ -3949,19 +4814,20 @@ def build_Parrotrousle_events(wave, ambush_count, Parrotrousle_cfg, wave_points_
     refs = [f"RTID({Parrotrousle_alias}@.)"]
     return [Parrotrousleobj], refs, new_remaining
 
-def build_parachute_rain_event(
-    wave,
-    ambush_count,
-    parachute_cfg,
-    wave_points_remaining,
-    all_zombie_costs,
-    all_zombie_aliases,
-    existing_aliases,
-    allow_flag_zombies=True,
-    zombie_variant_groups=None,
-    variant_alias_to_roll=None,
-):
-    alias_prefix = str(parachute_cfg.get("alias_prefix", "ParaRain"))
+def compile_parachute_rain_config(parachute_cfg, context):
+    all_zombie_aliases = context["all_zombie_aliases"]
+    variant_alias_to_roll = context["variant_alias_to_roll"]
+    zombie_classes = context["zombie_classes"]
+    compiled = {
+        "alias_prefix": str(parachute_cfg.get("alias_prefix", "ParaRain")),
+        "spider_pool": None,
+        "spider_pool_without_flags": None,
+        "spider_sampler": None,
+        "spider_sampler_without_flags": None,
+        "spider_roll_name": None,
+        "spider_is_flag": False,
+    }
+
     spider_pool = parachute_cfg.get(
         "spider_zombie_pool",
         parachute_cfg.get("SpiderZombiePool", parachute_cfg.get("zombie_pool")),
@@ -3974,14 +4840,14 @@ def build_parachute_rain_event(
             variant_alias_to_roll=variant_alias_to_roll,
             value_keys=("SpiderZombieName", "spider_zombie_name", "zombie_name", "type_name", "type", "Type"),
         )
-        if not allow_flag_zombies:
-            prepared_pool = [entry for entry in prepared_pool if not is_flag_zombie_alias(entry["alias"])]
-        if len(prepared_pool) == 0:
-            return None, wave_points_remaining
-        spider_roll_name = pick_weighted_entry(
-            prepared_pool,
-            "events.parachute_rains[].spider_zombie_pool",
-        )["alias"]
+        compiled["spider_pool"] = prepared_pool
+        compiled["spider_pool_without_flags"] = [
+            entry for entry in prepared_pool if not is_flag_zombie(entry["alias"], zombie_classes)
+        ]
+        compiled["spider_sampler"] = WeightedSampler([entry["weight"] for entry in prepared_pool])
+        compiled["spider_sampler_without_flags"] = WeightedSampler(
+            [entry["weight"] for entry in compiled["spider_pool_without_flags"]]
+        )
     else:
         spider_roll_name = parse_zombie_alias(
             parachute_cfg.get("spider_zombie_name", parachute_cfg.get("SpiderZombieName", "")),
@@ -3989,31 +4855,22 @@ def build_parachute_rain_event(
             all_zombie_aliases=all_zombie_aliases,
             variant_alias_to_roll=variant_alias_to_roll,
         )
-        if not allow_flag_zombies and is_flag_zombie_alias(spider_roll_name):
-            return None, wave_points_remaining
+        compiled["spider_roll_name"] = spider_roll_name
+        compiled["spider_is_flag"] = is_flag_zombie(spider_roll_name, zombie_classes)
 
-    spider_zombie_name = pick_zombie_variant_alias(spider_roll_name, zombie_variant_groups)
-    event_name = str(parachute_cfg.get("event_name", spider_roll_name)).strip() or spider_roll_name
-    base_alias = f"{alias_prefix}{wave}_{event_name}"
-    event_alias = make_unique_alias(base_alias, existing_aliases)
-    is_stampede = spider_roll_name == "west_bull"
+    compiled["event_name"] = str(parachute_cfg.get("event_name", "")).strip()
 
-    default_cost = all_zombie_costs.get(spider_roll_name, all_zombie_costs.get(spider_zombie_name))
-    point_cost = parachute_cfg.get("point_cost", parachute_cfg.get("PointCost", default_cost))
-    if point_cost is None:
-        raise ValueError(
-            f'events.parachute_rains[{event_name}] missing point cost and no zombie cost found for "{spider_roll_name}"'
-        )
-    point_cost = as_number(point_cost, "events.parachute_rains[].point_cost")
-    if point_cost <= 0:
-        raise ValueError("events.parachute_rains[].point_cost must be > 0")
+    point_cost = parachute_cfg.get("point_cost", parachute_cfg.get("PointCost"))
+    if point_cost is not None:
+        point_cost = as_number(point_cost, "events.parachute_rains[].point_cost")
+        if point_cost <= 0:
+            raise ValueError("events.parachute_rains[].point_cost must be > 0")
+    compiled["point_cost"] = point_cost
 
     count_mode = str(parachute_cfg.get("count_mode", parachute_cfg.get("CountMode", "points_based"))).strip().lower()
-    enforce_points_budget = bool(parachute_cfg.get("enforce_points_budget", parachute_cfg.get("EnforcePointsBudget", True)))
-    count = 0
-
     if "spider_count" in parachute_cfg or "SpiderCount" in parachute_cfg:
-        count = as_int(
+        count_mode = "spider_count"
+        compiled["spider_count"] = as_int(
             parachute_cfg.get("spider_count", parachute_cfg.get("SpiderCount")),
             "events.parachute_rains[].spider_count",
         )
@@ -4022,112 +4879,200 @@ def build_parachute_rain_event(
         max_count = as_int(parachute_cfg.get("max_count", 4), "events.parachute_rains[].max_count")
         if max_count < min_count:
             raise ValueError("events.parachute_rains[].max_count cannot be less than min_count")
-        affordable = int(wave_points_remaining // point_cost)
-        max_allowed = min(max_count, affordable)
-        if max_allowed <= 0:
-            return None, wave_points_remaining
-        if max_allowed < min_count:
-            count = max_allowed
-        else:
-            count = random.randint(min_count, max_allowed)
+        compiled["min_count"] = min_count
+        compiled["max_count"] = max_count
     elif count_mode == "range":
-        count_range = parse_int_range(
+        compiled["count_range"] = parse_int_range(
             parachute_cfg.get("count_range", [1, 3]),
             "events.parachute_rains[].count_range",
         )
-        count = random.randint(*count_range)
     elif count_mode == "fixed":
-        count = as_int(parachute_cfg.get("fixed_count", parachute_cfg.get("FixedCount", 1)), "events.parachute_rains[].fixed_count")
+        compiled["fixed_count"] = as_int(
+            parachute_cfg.get("fixed_count", parachute_cfg.get("FixedCount", 1)),
+            "events.parachute_rains[].fixed_count",
+        )
     else:
         raise ValueError(
             f"Unknown events.parachute_rains[].count_mode: {count_mode}"
         )
+    compiled["count_mode"] = count_mode
+    compiled["enforce_points_budget"] = bool(
+        parachute_cfg.get("enforce_points_budget", parachute_cfg.get("EnforcePointsBudget", True))
+    )
 
-    if enforce_points_budget:
-        affordable = int(wave_points_remaining // point_cost)
-        count = min(count, affordable)
-    if count <= 0:
-        return None, wave_points_remaining
-
+    compiled["column_start_range"] = None
+    compiled["column_start"] = None
     if "column_start_range" in parachute_cfg:
-        start_min, start_max = parse_int_range(
+        compiled["column_start_range"] = parse_int_range(
             parachute_cfg.get("column_start_range"),
             "events.parachute_rains[].column_start_range",
         )
-        column_start = random.randint(start_min, start_max)
-    else:
-        default_start = 9 if is_stampede else 5
-        column_start = as_int(
-            parachute_cfg.get("column_start", parachute_cfg.get("ColumnStart", default_start)),
+    elif "column_start" in parachute_cfg or "ColumnStart" in parachute_cfg:
+        compiled["column_start"] = as_int(
+            parachute_cfg.get("column_start", parachute_cfg.get("ColumnStart")),
             "events.parachute_rains[].column_start",
         )
 
+    compiled["column_end_range"] = None
+    compiled["column_end"] = None
     if "column_end_range" in parachute_cfg:
-        end_min, end_max = parse_int_range(
+        compiled["column_end_range"] = parse_int_range(
             parachute_cfg.get("column_end_range"),
             "events.parachute_rains[].column_end_range",
         )
-        column_end = random.randint(end_min, end_max)
-    else:
-        default_end = 10 if is_stampede else 7
-        column_end = as_int(
-            parachute_cfg.get("column_end", parachute_cfg.get("ColumnEnd", default_end)),
+    elif "column_end" in parachute_cfg or "ColumnEnd" in parachute_cfg:
+        compiled["column_end"] = as_int(
+            parachute_cfg.get("column_end", parachute_cfg.get("ColumnEnd")),
             "events.parachute_rains[].column_end",
         )
 
+    compiled["group_size"] = as_int(
+        parachute_cfg.get("group_size", parachute_cfg.get("GroupSize", 1)),
+        "events.parachute_rains[].group_size",
+    )
+    compiled["time_between_groups"] = str(
+        parachute_cfg.get("time_between_groups", parachute_cfg.get("TimeBetweenGroups", "0.2"))
+    )
+    compiled["zombie_fall_time"] = str(parachute_cfg.get("zombie_fall_time", parachute_cfg.get("ZombieFallTime", "1.5")))
+    compiled["wave_start_message"] = None
+    if "wave_start_message" in parachute_cfg or "WaveStartMessage" in parachute_cfg:
+        compiled["wave_start_message"] = str(
+            parachute_cfg.get("wave_start_message", parachute_cfg.get("WaveStartMessage"))
+        )
+    compiled["consume_wave_points"] = bool(
+        parachute_cfg.get("consume_wave_points", parachute_cfg.get("ConsumeWavePoints", True))
+    )
+    return compiled
+
+
+def build_parachute_rain_event(
+    rng,
+    wave,
+    ambush_count,
+    parachute_rain,
+    wave_points_remaining,
+    all_zombie_costs,
+    existing_aliases,
+    allow_flag_zombies=True,
+    zombie_variant_groups=None,
+):
+    if parachute_rain["spider_pool"] is not None:
+        if allow_flag_zombies:
+            prepared_pool = parachute_rain["spider_pool"]
+            spider_sampler = parachute_rain["spider_sampler"]
+        else:
+            prepared_pool = parachute_rain["spider_pool_without_flags"]
+            spider_sampler = parachute_rain["spider_sampler_without_flags"]
+        if len(prepared_pool) == 0:
+            return None, wave_points_remaining
+        spider_roll_name = prepared_pool[spider_sampler.pick(rng)]["alias"]
+    else:
+        spider_roll_name = parachute_rain["spider_roll_name"]
+        if not allow_flag_zombies and parachute_rain["spider_is_flag"]:
+            return None, wave_points_remaining
+
+    spider_zombie_name = pick_zombie_variant_alias(rng, spider_roll_name, zombie_variant_groups)
+    event_name = parachute_rain["event_name"] or spider_roll_name
+    base_alias = f"{parachute_rain['alias_prefix']}{wave}_{event_name}"
+    event_alias = make_unique_alias(base_alias, existing_aliases)
+    is_stampede = spider_roll_name == "west_bull"
+
+    point_cost = parachute_rain["point_cost"]
+    if point_cost is None:
+        point_cost = all_zombie_costs.get(spider_roll_name, all_zombie_costs.get(spider_zombie_name))
+        if point_cost is None:
+            raise ValueError(
+                f'events.parachute_rains[{event_name}] missing point cost and no zombie cost found for "{spider_roll_name}"'
+            )
+        point_cost = as_number(point_cost, "events.parachute_rains[].point_cost")
+        if point_cost <= 0:
+            raise ValueError("events.parachute_rains[].point_cost must be > 0")
+
+    count_mode = parachute_rain["count_mode"]
+    count = 0
+
+    if count_mode == "spider_count":
+        count = parachute_rain["spider_count"]
+    elif count_mode == "points_based":
+        min_count = parachute_rain["min_count"]
+        affordable = int(wave_points_remaining // point_cost)
+        max_allowed = min(parachute_rain["max_count"], affordable)
+        if max_allowed <= 0:
+            return None, wave_points_remaining
+        if max_allowed < min_count:
+            count = max_allowed
+        else:
+            count = rng.randint(min_count, max_allowed)
+    elif count_mode == "range":
+        count = rng.randint(*parachute_rain["count_range"])
+    else:
+        count = parachute_rain["fixed_count"]
+
+    if parachute_rain["enforce_points_budget"]:
+        affordable = int(wave_points_remaining // point_cost)
+        count = min(count, affordable)
+    if count <= 0:
+        return None, wave_points_remaining
+
+    if parachute_rain["column_start_range"] is not None:
+        column_start = rng.randint(*parachute_rain["column_start_range"])
+    elif parachute_rain["column_start"] is not None:
+        column_start = parachute_rain["column_start"]
+    else:
+        column_start = 9 if is_stampede else 5
+
+    if parachute_rain["column_end_range"] is not None:
+        column_end = rng.randint(*parachute_rain["column_end_range"])
+    elif parachute_rain["column_end"] is not None:
+        column_end = parachute_rain["column_end"]
+    else:
+        column_end = 10 if is_stampede else 7
+
     if column_end < column_start:
         column_start, column_end = column_end, column_start
 
+    wave_start_message = parachute_rain["wave_start_message"]
+    if wave_start_message is None:
+        wave_start_message = str(default_wave_start_message(spider_roll_name, "Parachute Rain!"))
+
     event_object = {
         "aliases": [event_alias],
         "objclass": "ParachuteRainZombieSpawnerProps",
         "objdata": {
             "ColumnStart": column_start,
             "ColumnEnd": column_end,
-            "GroupSize": as_int(
-                parachute_cfg.get("group_size", parachute_cfg.get("GroupSize", 1)),
-                "events.parachute_rains[].group_size",
-            ),
-            "TimeBetweenGroups": str(parachute_cfg.get("time_between_groups", parachute_cfg.get("TimeBetweenGroups", "0.2"))),
-            "ZombieFallTime": str(parachute_cfg.get("zombie_fall_time", parachute_cfg.get("ZombieFallTime", "1.5"))),
+            "GroupSize": parachute_rain["group_size"],
+            "TimeBetweenGroups": parachute_rain["time_between_groups"],
+            "ZombieFallTime": parachute_rain["zombie_fall_time"],
             "SpiderZombieName": spider_zombie_name,
             "SpiderCount": count,
-            "WaveStartMessage": str(
-                parachute_cfg.get(
-                    "wave_start_message",
-                    parachute_cfg.get(
-                        "WaveStartMessage",
-                        default_wave_start_message(spider_roll_name, "Parachute Rain!"),
-                    ),
-                )
-            ),
+            "WaveStartMessage": wave_start_message,
         },
     }
 
-    consume_wave_points = bool(parachute_cfg.get("consume_wave_points", parachute_cfg.get("ConsumeWavePoints", True)))
-    if consume_wave_points:
+    if parachute_rain["consume_wave_points"]:
         new_remaining = max(0.0, wave_points_remaining - (count * point_cost))
     else:
         new_remaining = wave_points_remaining
 
     return event_object, new_remaining
 
-def build_imp_ambush_event(
-    wave,
-    imp_cfg,
-    imp_points_remaining,
-    allow_flag_zombies=True,
-    all_zombie_aliases=None,
-    zombie_variant_groups=None,
-    variant_alias_to_roll=None,
-):
+
+def compile_imp_ambush_config(imp_cfg, context):
+    all_zombie_aliases = context["all_zombie_aliases"]
     event_name = str(imp_cfg.get("event_name", "imp_ambush"))
+    compiled = {
+        "event_name": event_name,
+        "zombie_pool": None,
+        "spider_zombie_name": None,
+    }
+
     zombie_pool = imp_cfg.get("zombie_pool")
     if zombie_pool is not None:
         cleaned_pool = unique_zombie_pool(
             zombie_pool,
             "events.imp_ambushes[].zombie_pool",
-            variant_alias_to_roll=variant_alias_to_roll,
+            variant_alias_to_roll=context["variant_alias_to_roll"],
         )
         if all_zombie_aliases is not None:
             missing = [zombie_name for zombie_name in cleaned_pool if zombie_name not in all_zombie_aliases]
@@ -4136,109 +5081,153 @@ def build_imp_ambush_event(
                     "events.imp_ambushes[].zombie_pool contains aliases missing from ZombieTypes: "
                     + ", ".join(sorted(set(missing)))
                 )
-        spider_zombie_name = pick_zombie_variant_alias(random.choice(cleaned_pool), zombie_variant_groups)
+        compiled["zombie_pool"] = cleaned_pool
     else:
         spider_zombie_name = str(imp_cfg.get("spider_zombie_name", "")).strip()
         if not spider_zombie_name:
             raise ValueError(
                 f"events.imp_ambushes[{event_name}].spider_zombie_name is required"
             )
-    if not allow_flag_zombies and is_flag_zombie_alias(spider_zombie_name):
-        return None, imp_points_remaining
+        compiled["spider_zombie_name"] = spider_zombie_name
 
-    spider_mode = str(imp_cfg.get("spider_count_mode", "points_based")).strip().lower()
-    spider_count = 0
-
-    # Set column_start early for cost calculation
+    compiled["column_start_range"] = None
     if "column_start_range" in imp_cfg:
-        column_start_range = parse_int_range(
+        compiled["column_start_range"] = parse_int_range(
             imp_cfg.get("column_start_range", [0, 8]),
             "imp_ambush.column_start_range",
         )
-        column_start = random.randint(*column_start_range)
     else:
-        column_start = as_int(imp_cfg.get("column_start", 4), "imp_ambush.column_start")
+        compiled["column_start"] = as_int(imp_cfg.get("column_start", 4), "imp_ambush.column_start")
 
-    # Set column_end
+    compiled["column_end_range"] = None
     if "column_end_range" in imp_cfg:
-        column_end_range = parse_int_range(
+        compiled["column_end_range"] = parse_int_range(
             imp_cfg.get("column_end_range", [0, 8]),
             "imp_ambush.column_end_range",
         )
-        column_end = random.randint(*column_end_range)
     else:
-        column_end = as_int(imp_cfg.get("column_end", 8), "imp_ambush.column_end")
+        compiled["column_end"] = as_int(imp_cfg.get("column_end", 8), "imp_ambush.column_end")
+
+    compiled["point_cost"] = None
+    if "point_cost" in imp_cfg:
+        compiled["point_cost"] = as_number(imp_cfg.get("point_cost"), "imp_ambush.point_cost")
+
+    spider_mode = str(imp_cfg.get("spider_count_mode", "points_based")).strip().lower()
+    if spider_mode == "points_based":
+        min_count = as_int(imp_cfg.get("min_count", 1), "imp_ambush.min_count")
+        max_count = as_int(imp_cfg.get("max_count", 6), "imp_ambush.max_count")
+        if max_count < min_count:
+            raise ValueError("imp_ambush.max_count cannot be less than min_count")
+        if compiled["point_cost"] is not None and compiled["point_cost"] <= 0:
+            raise ValueError("imp_ambush.point_cost must be > 0 for points_based mode")
+        compiled["min_count"] = min_count
+        compiled["max_count"] = max_count
+    elif spider_mode == "range":
+        compiled["count_range"] = parse_int_range(
+            imp_cfg.get("count_range", [1, 1]),
+            "imp_ambush.count_range",
+        )
+    elif spider_mode == "fixed":
+        compiled["fixed_count"] = as_int(imp_cfg.get("fixed_count", 1), "imp_ambush.fixed_count")
+    else:
+        raise ValueError(f"Unknown imp_ambush spider_count_mode: {spider_mode}")
+    compiled["spider_mode"] = spider_mode
+
+    compiled["zombies_per_spawner_range"] = None
+    if "zombies_per_spawner_range" in imp_cfg:
+        compiled["zombies_per_spawner_range"] = parse_int_range(
+            imp_cfg.get("zombies_per_spawner_range"),
+            "imp_ambushes[].zombies_per_spawner_range",
+        )
+
+    compiled["consume_wave_points"] = bool(imp_cfg.get("consume_wave_points", True))
+    compiled["alias_prefix"] = str(imp_cfg.get("alias_prefix", "SpidRain"))
+    compiled["group_size"] = as_int(imp_cfg.get("group_size", 1), "imp_ambush.group_size")
+    compiled["time_between_groups"] = str(imp_cfg.get("time_between_groups", "0.5"))
+    compiled["zombie_fall_time"] = str(imp_cfg.get("zombie_fall_time", "2"))
+    compiled["wave_start_message"] = None
+    if "wave_start_message" in imp_cfg:
+        compiled["wave_start_message"] = str(imp_cfg.get("wave_start_message"))
+    return compiled
+
+
+def build_imp_ambush_event(
+    rng,
+    wave,
+    imp_ambush,
+    imp_points_remaining,
+    allow_flag_zombies=True,
+    zombie_variant_groups=None,
+    zombie_classes=None,
+):
+    if imp_ambush["zombie_pool"] is not None:
+        spider_zombie_name = pick_zombie_variant_alias(rng, rng.choice(imp_ambush["zombie_pool"]), zombie_variant_groups)
+    else:
+        spider_zombie_name = imp_ambush["spider_zombie_name"]
+    if not allow_flag_zombies and is_flag_zombie(spider_zombie_name, zombie_classes):
+        return None, imp_points_remaining
+
+    spider_mode = imp_ambush["spider_mode"]
+    spider_count = 0
+
+    # Set column_start early for cost calculation
+    if imp_ambush["column_start_range"] is not None:
+        column_start = rng.randint(*imp_ambush["column_start_range"])
+    else:
+        column_start = imp_ambush["column_start"]
+
+    # Set column_end
+    if imp_ambush["column_end_range"] is not None:
+        column_end = rng.randint(*imp_ambush["column_end_range"])
+    else:
+        column_end = imp_ambush["column_end"]
     if column_end < column_start:
         column_start, column_end = column_end, column_start
 
     # Set point_cost based on column_start if not specified
-    if 'point_cost' not in imp_cfg:
+    point_cost = imp_ambush["point_cost"]
+    if point_cost is None:
         if column_start in [2, 3]:
             point_cost = 2.0
         elif column_start == 4:
             point_cost = 1.5
         else:
             point_cost = 1.0
-    else:
-        point_cost = as_number(imp_cfg.get("point_cost"), "imp_ambush.point_cost")
 
     if spider_mode == "points_based":
-        min_count = as_int(imp_cfg.get("min_count", 1), "imp_ambush.min_count")
-        max_count = as_int(imp_cfg.get("max_count", 6), "imp_ambush.max_count")
-        if max_count < min_count:
-            raise ValueError("imp_ambush.max_count cannot be less than min_count")
-
-        if 'point_cost' not in imp_cfg:
-            if column_start in [2, 3]:
-                default_cost = 2
-            elif column_start == 4:
-                default_cost = 1.5
-            else:
-                default_cost = 1
-        else:
-            default_cost = 1
-        point_cost = as_number(imp_cfg.get("point_cost", default_cost), "imp_ambush.point_cost")
-        if point_cost <= 0:
-            raise ValueError("imp_ambush.point_cost must be > 0 for points_based mode")
-
+        min_count = imp_ambush["min_count"]
         affordable = int(imp_points_remaining // point_cost)
-        max_allowed = min(max_count, affordable)
+        max_allowed = min(imp_ambush["max_count"], affordable)
         if max_allowed <= 0:
             return None, imp_points_remaining
 
         if max_allowed < min_count:
             spider_count = max_allowed
         else:
-            spider_count = random.randint(min_count, max_allowed)
+            spider_count = rng.randint(min_count, max_allowed)
     elif spider_mode == "range":
-        count_range = parse_int_range(
-            imp_cfg.get("count_range", [1, 1]),
-            "imp_ambush.count_range",
-        )
-        spider_count = random.randint(*count_range)
-    elif spider_mode == "fixed":
-        spider_count = as_int(imp_cfg.get("fixed_count", 1), "imp_ambush.fixed_count")
+        spider_count = rng.randint(*imp_ambush["count_range"])
     else:
-        raise ValueError(f"Unknown imp_ambush spider_count_mode: {spider_mode}")
+        spider_count = imp_ambush["fixed_count"]
 
-    if "zombies_per_spawner_range" in imp_cfg:
-        count_range = parse_int_range(imp_cfg.get("zombies_per_spawner_range"), "imp_ambushes[].zombies_per_spawner_range")
-        spider_count = random.randint(*count_range)
+    if imp_ambush["zombies_per_spawner_range"] is not None:
+        spider_count = rng.randint(*imp_ambush["zombies_per_spawner_range"])
 
     if spider_count <= 0:
         return None, imp_points_remaining
 
-    point_cost = as_number(imp_cfg.get("point_cost", point_cost), "imp_ambushes[].point_cost")
-    consume = bool(imp_cfg.get("consume_wave_points", True))
-    if point_cost > 0 and consume:
+    if point_cost > 0 and imp_ambush["consume_wave_points"]:
         affordable = int(imp_points_remaining // point_cost)
         spider_count = min(spider_count, affordable)
         if spider_count <= 0:
             return None, imp_points_remaining
         imp_points_remaining -= spider_count * point_cost
 
-    alias_prefix = str(imp_cfg.get("alias_prefix", "SpidRain"))
-    alias = f"{alias_prefix}{wave}_{event_name}"
+    alias = f"{imp_ambush['alias_prefix']}{wave}_{imp_ambush['event_name']}"
+
+    wave_start_message = imp_ambush["wave_start_message"]
+    if wave_start_message is None:
+        wave_start_message = str(default_wave_start_message(spider_zombie_name, ""))
 
     event_object = {
         "aliases": [alias],
@@ -4246,113 +5235,71 @@ def build_imp_ambush_event(
         "objdata": {
             "ColumnStart": column_start,
             "ColumnEnd": column_end,
-            "GroupSize": as_int(imp_cfg.get("group_size", 1), "imp_ambush.group_size"),
-            "TimeBetweenGroups": str(imp_cfg.get("time_between_groups", "0.5")),
-            "ZombieFallTime": str(imp_cfg.get("zombie_fall_time", "2")),
+            "GroupSize": imp_ambush["group_size"],
+            "TimeBetweenGroups": imp_ambush["time_between_groups"],
+            "ZombieFallTime": imp_ambush["zombie_fall_time"],
             "SpiderZombieName": spider_zombie_name,
             "SpiderCount": spider_count,
-            "WaveStartMessage": str(
-                imp_cfg.get(
-                    "wave_start_message",
-                    default_wave_start_message(spider_zombie_name, ""),
-                )
-            ),
+            "WaveStartMessage": wave_start_message,
         },
     }
 
     return event_object, imp_points_remaining
 
 
-def build_sandstorm_ambush_events(
-    wave,
-    storm_cfg,
-    selected_pool,
-    all_zombie_aliases,
-    existing_aliases,
-    zombie_costs,
-    wave_points_remaining,
-    allow_flag_zombies=True,
-    zombie_variant_groups=None,
-    variant_alias_to_roll=None,
-):
+def compile_sandstorm_config(storm_cfg, context):
+    all_zombie_aliases = context["all_zombie_aliases"]
+    variant_alias_to_roll = context["variant_alias_to_roll"]
+    zombie_classes = context["zombie_classes"]
+
     storm_type = str(storm_cfg.get("storm_type", "sandstorm")).strip() or "sandstorm"
     default_alias_prefix = "".join(part.capitalize() for part in storm_type.split("_")) or "Storm"
-    alias_prefix = str(storm_cfg.get("alias_prefix", default_alias_prefix))
-    additional_pf = storm_cfg.get("additional_plantfood", storm_cfg.get("AdditionalPlantfood", "0"))
-    time_between_groups = as_number(
-        storm_cfg.get("time_between_groups", storm_cfg.get("TimeBetweenGroups", 0.5)),
-        "sandstorm.time_between_groups",
-    )
-    group_size = as_int(storm_cfg.get("group_size", storm_cfg.get("GroupSize", 1)), "sandstorm.group_size")
-    include_ambush_index = bool(storm_cfg.get("include_ambush_index_in_alias", False))
-
-    def validate_zombie_alias(zombie_alias, field_name):
-        if zombie_alias not in all_zombie_aliases:
-            raise ValueError(
-                f'{field_name}: "{zombie_alias}" was not found in ZombieTypes aliases'
-            )
-
-    def make_storm_object(column, zombies, ambush_index=None):
-        base_alias = f"{alias_prefix}{wave}_C{column}"
-        if include_ambush_index and ambush_index is not None:
-            base_alias = f"{alias_prefix}{wave}_A{ambush_index}_C{column}"
-        alias = make_unique_alias(base_alias, existing_aliases)
-        zombies_list = [{"Type": f"RTID({z}@ZombieTypes)"} for z in zombies]
-        return {
-            "aliases": [alias],
-            "objclass": "StormZombieSpawnerProps",
-            "objdata": {
-                "AdditionalPlantfood": str(additional_pf),
-                "Type": storm_type,
-                "ColumnStart": column,
-                "ColumnEnd": column,
-                "TimeBetweenGroups": time_between_groups,
-                "GroupSize": group_size,
-                "Zombies": zombies_list,
-            },
-        }, f"RTID({alias}@.)"
-
-    objects = []
-    refs = []
-    points_spent = 0.0
-
     use_wave_points_budget = bool(storm_cfg.get("use_wave_points_budget", False))
-    consume_wave_points = bool(storm_cfg.get("consume_wave_points", use_wave_points_budget))
-    enforce_budget = bool(storm_cfg.get("enforce_budget", use_wave_points_budget))
     zombie_choice_greediness = as_number(
         storm_cfg.get("zombie_choice_greediness", 0.5),
         "sandstorm.zombie_choice_greediness",
     )
-    zombie_choice_greediness = max(0.0, min(1.0, zombie_choice_greediness))
+    compiled = {
+        "storm_type": storm_type,
+        "alias_prefix": str(storm_cfg.get("alias_prefix", default_alias_prefix)),
+        "additional_pf": str(storm_cfg.get("additional_plantfood", storm_cfg.get("AdditionalPlantfood", "0"))),
+        "time_between_groups": as_number(
+            storm_cfg.get("time_between_groups", storm_cfg.get("TimeBetweenGroups", 0.5)),
+            "sandstorm.time_between_groups",
+        ),
+        "group_size": as_int(storm_cfg.get("group_size", storm_cfg.get("GroupSize", 1)), "sandstorm.group_size"),
+        "include_ambush_index": bool(storm_cfg.get("include_ambush_index_in_alias", False)),
+        "use_wave_points_budget": use_wave_points_budget,
+        "consume_wave_points": bool(storm_cfg.get("consume_wave_points", use_wave_points_budget)),
+        "enforce_budget": bool(storm_cfg.get("enforce_budget", use_wave_points_budget)),
+        "zombie_choice_greediness": max(0.0, min(1.0, zombie_choice_greediness)),
+        "points_budget_ratio_range": None,
+        "points_budget_range": None,
+        "spawners": None,
+    }
 
-    points_budget = None
     if use_wave_points_budget:
-        ratio_range = parse_float_range(
+        compiled["points_budget_ratio_range"] = parse_float_range(
             storm_cfg.get("points_budget_ratio_range", [0.2, 0.6]),
             "sandstorm.points_budget_ratio_range",
         )
-        points_budget = max(0.0, wave_points_remaining * random.uniform(*ratio_range))
-
-        if "points_budget_range" in storm_cfg:
-            absolute_range = parse_float_range(
-                storm_cfg.get("points_budget_range"),
-                "sandstorm.points_budget_range",
-            )
-            points_budget = min(points_budget, random.uniform(*absolute_range))
-
-        points_budget = max(0.0, points_budget)
-    elif "points_budget_range" in storm_cfg:
-        absolute_range = parse_float_range(
+    if "points_budget_range" in storm_cfg:
+        compiled["points_budget_range"] = parse_float_range(
             storm_cfg.get("points_budget_range"),
             "sandstorm.points_budget_range",
         )
-        points_budget = max(0.0, random.uniform(*absolute_range))
+
+    def validate_zombie_alias(zombie_alias, field_name):
+        if zombie_alias not in all_zombie_aliases:
+            raise ValueError(
+                f'{field_name}: "{zombie_alias}" was not found in ZombieTypes aliases'
+            )
 
     explicit_spawners = storm_cfg.get("spawners")
     if explicit_spawners is not None:
         if not isinstance(explicit_spawners, list) or len(explicit_spawners) == 0:
             raise ValueError("sandstorm.spawners must be a non-empty array")
-        remaining_budget = points_budget
+        spawners = []
         for idx, spawner in enumerate(explicit_spawners, 1):
             if not isinstance(spawner, dict):
                 raise ValueError("sandstorm.spawners entries must be objects")
@@ -4360,7 +5307,7 @@ def build_sandstorm_ambush_events(
             zombies = spawner.get("zombies", spawner.get("Zombies", []))
             if not isinstance(zombies, list) or len(zombies) == 0:
                 raise ValueError(f"sandstorm.spawners[{idx}].zombies must be non-empty")
-            cleaned_zombies = []
+            spawner_zombies = []
             for z_idx, zombie_entry in enumerate(zombies):
                 if isinstance(zombie_entry, str):
                     zombie_name = parse_zombie_alias(
@@ -4383,7 +5330,113 @@ def build_sandstorm_ambush_events(
                 validate_zombie_alias(
                     zombie_name, f"sandstorm.spawners[{idx}].zombies[{z_idx}]"
                 )
-                if not allow_flag_zombies and is_flag_zombie_alias(zombie_name):
+                spawner_zombies.append((zombie_name, is_flag_zombie(zombie_name, zombie_classes)))
+            spawners.append((idx, column, tuple(spawner_zombies)))
+        compiled["spawners"] = tuple(spawners)
+        return compiled
+
+    columns = storm_cfg.get("columns")
+    if columns is None:
+        column_range = parse_int_range(
+            storm_cfg.get("column_range", [3, 8]),
+            "sandstorm.column_range",
+        )
+        columns = list(range(column_range[0], column_range[1] + 1))
+    else:
+        if not isinstance(columns, list) or len(columns) == 0:
+            raise ValueError("sandstorm.columns must be a non-empty array")
+        normalized_columns = []
+        for idx, value in enumerate(columns):
+            normalized_columns.append(as_int(value, f"sandstorm.columns[{idx}]"))
+        columns = normalized_columns
+    compiled["columns"] = columns
+
+    compiled["spawner_count_range"] = parse_int_range(
+        storm_cfg.get("spawners_per_trigger_range", [1, 1]),
+        "sandstorm.spawners_per_trigger_range",
+    )
+    compiled["unique_columns"] = bool(storm_cfg.get("unique_columns_per_trigger", True))
+    compiled["zombies_per_spawner_range"] = parse_int_range(
+        storm_cfg.get("zombies_per_spawner_range", [1, 2]),
+        "sandstorm.zombies_per_spawner_range",
+    )
+
+    zombie_pool = storm_cfg.get("zombie_pool", storm_cfg.get("ZombiePool"))
+    if zombie_pool is None:
+        zombie_pool = context["selected_pool"]
+    cleaned_pool = unique_zombie_pool(
+        zombie_pool,
+        "sandstorm.zombie_pool",
+        variant_alias_to_roll=variant_alias_to_roll,
+    )
+    for idx, zombie_name in enumerate(cleaned_pool):
+        validate_zombie_alias(zombie_name, f"sandstorm.zombie_pool[{idx}]")
+    compiled["zombie_pool"] = cleaned_pool
+    compiled["zombie_pool_without_flags"] = [
+        zombie_name for zombie_name in cleaned_pool if not is_flag_zombie(zombie_name, zombie_classes)
+    ]
+    compiled["allow_duplicate_zombies"] = bool(storm_cfg.get("allow_duplicate_zombies", True))
+    return compiled
+
+
+def build_sandstorm_ambush_events(
+    rng,
+    wave,
+    storm,
+    existing_aliases,
+    zombie_costs,
+    wave_points_remaining,
+    allow_flag_zombies=True,
+    zombie_variant_groups=None,
+):
+    alias_prefix = storm["alias_prefix"]
+    include_ambush_index = storm["include_ambush_index"]
+
+    def make_storm_object(column, zombies, ambush_index=None):
+        base_alias = f"{alias_prefix}{wave}_C{column}"
+        if include_ambush_index and ambush_index is not None:
+            base_alias = f"{alias_prefix}{wave}_A{ambush_index}_C{column}"
+        alias = make_unique_alias(base_alias, existing_aliases)
+        zombies_list = [{"Type": f"RTID({z}@ZombieTypes)"} for z in zombies]
+        return {
+            "aliases": [alias],
+            "objclass": "StormZombieSpawnerProps",
+            "objdata": {
+                "AdditionalPlantfood": storm["additional_pf"],
+                "Type": storm["storm_type"],
+                "ColumnStart": column,
+                "ColumnEnd": column,
+                "TimeBetweenGroups": storm["time_between_groups"],
+                "GroupSize": storm["group_size"],
+                "Zombies": zombies_list,
+            },
+        }, f"RTID({alias}@.)"
+
+    objects = []
+    refs = []
+    points_spent = 0.0
+
+    consume_wave_points = storm["consume_wave_points"]
+    enforce_budget = storm["enforce_budget"]
+    zombie_choice_greediness = storm["zombie_choice_greediness"]
+
+    points_budget = None
+    if storm["use_wave_points_budget"]:
+        points_budget = max(0.0, wave_points_remaining * rng.uniform(*storm["points_budget_ratio_range"]))
+
+        if storm["points_budget_range"] is not None:
+            points_budget = min(points_budget, rng.uniform(*storm["points_budget_range"]))
+
+        points_budget = max(0.0, points_budget)
+    elif storm["points_budget_range"] is not None:
+        points_budget = max(0.0, rng.uniform(*storm["points_budget_range"]))
+
+    if storm["spawners"] is not None:
+        remaining_budget = points_budget
+        for idx, column, spawner_zombies in storm["spawners"]:
+            cleaned_zombies = []
+            for zombie_name, is_flag in spawner_zombies:
+                if not allow_flag_zombies and is_flag:
                     continue
                 if enforce_budget and remaining_budget is not None:
                     zombie_cost = zombie_costs.get(zombie_name, 0.0)
@@ -4408,63 +5461,29 @@ def build_sandstorm_ambush_events(
             wave_points_remaining = max(0.0, wave_points_remaining - points_spent)
         return objects, refs, wave_points_remaining
 
-    columns = storm_cfg.get("columns")
-    if columns is None:
-        column_range = parse_int_range(
-            storm_cfg.get("column_range", [3, 8]),
-            "sandstorm.column_range",
-        )
-        columns = list(range(column_range[0], column_range[1] + 1))
-    else:
-        if not isinstance(columns, list) or len(columns) == 0:
-            raise ValueError("sandstorm.columns must be a non-empty array")
-        normalized_columns = []
-        for idx, value in enumerate(columns):
-            normalized_columns.append(as_int(value, f"sandstorm.columns[{idx}]"))
-        columns = normalized_columns
-
-    spawner_count_range = parse_int_range(
-        storm_cfg.get("spawners_per_trigger_range", [1, 1]),
-        "sandstorm.spawners_per_trigger_range",
-    )
-    spawner_count = random.randint(*spawner_count_range)
-
-    unique_columns = bool(storm_cfg.get("unique_columns_per_trigger", True))
-    if unique_columns:
+    columns = storm["columns"]
+    spawner_count = rng.randint(*storm["spawner_count_range"])
+
+    if storm["unique_columns"]:
         if spawner_count > len(columns):
             raise ValueError(
                 "sandstorm.spawners_per_trigger_range max is greater than available unique columns"
             )
-        picked_columns = random.sample(columns, spawner_count)
+        picked_columns = rng.sample(columns, spawner_count)
     else:
-        picked_columns = [random.choice(columns) for _ in range(spawner_count)]
-
-    zombies_per_spawner_range = parse_int_range(
-        storm_cfg.get("zombies_per_spawner_range", [1, 2]),
-        "sandstorm.zombies_per_spawner_range",
-    )
+        picked_columns = [rng.choice(columns) for _ in range(spawner_count)]
 
-    zombie_pool = storm_cfg.get("zombie_pool", storm_cfg.get("ZombiePool"))
-    if zombie_pool is None:
-        zombie_pool = selected_pool
-    cleaned_pool = unique_zombie_pool(
-        zombie_pool,
-        "sandstorm.zombie_pool",
-        variant_alias_to_roll=variant_alias_to_roll,
-    )
+    zombies_per_spawner_range = storm["zombies_per_spawner_range"]
 
-    validated_pool = []
-    for idx, zombie_name in enumerate(cleaned_pool):
-        validate_zombie_alias(zombie_name, f"sandstorm.zombie_pool[{idx}]")
-        if not allow_flag_zombies and is_flag_zombie_alias(zombie_name):
-            continue
-        validated_pool.append(zombie_name)
-    cleaned_pool = validated_pool
+    if allow_flag_zombies:
+        cleaned_pool = storm["zombie_pool"]
+    else:
+        cleaned_pool = storm["zombie_pool_without_flags"]
 
     if len(cleaned_pool) == 0:
         return objects, refs, wave_points_remaining
 
-    allow_duplicate_zombies = bool(storm_cfg.get("allow_duplicate_zombies", True))
+    allow_duplicate_zombies = storm["allow_duplicate_zombies"]
     remaining_budget = points_budget
 
     def pick_zombie_with_budget(pool, used_in_spawner):
@@ -4489,12 +5508,12 @@ def build_sandstorm_ambush_events(
 
         if zombie_choice_greediness >= 0.5:
             choice_count = max(1, int(len(candidates) * zombie_choice_greediness))
-            return random.choice(candidates[len(candidates) - choice_count :])
+            return rng.choice(candidates[len(candidates) - choice_count :])
         choice_count = max(1, int(len(candidates) * (1 - zombie_choice_greediness)))
-        return random.choice(candidates[:choice_count])
+        return rng.choice(candidates[:choice_count])
 
     for spawner_idx, column in enumerate(picked_columns, 1):
-        zombie_count = random.randint(*zombies_per_spawner_range)
+        zombie_count = rng.randint(*zombies_per_spawner_range)
         if not allow_duplicate_zombies and zombie_count > len(cleaned_pool):
             raise ValueError(
                 "sandstorm.zombies_per_spawner_range max is greater than zombie_pool size while duplicates are disabled"
@@ -4518,7 +5537,7 @@ def build_sandstorm_ambush_events(
             continue
 
         picked_zombies = [
-            pick_zombie_variant_alias(zombie_name, zombie_variant_groups)
+            pick_zombie_variant_alias(rng, zombie_name, zombie_variant_groups)
             for zombie_name in picked_rolls
         ]
         obj, ref = make_storm_object(column, picked_zombies, ambush_index=spawner_idx)
@@ -4550,7 +5569,116 @@ def normalize_grid_position(raw_position, field_name):
     return x, y
 
 
-def build_initial_grid_item_object(initial_cfg, generation_context=None):
+def parse_lawn_range(raw_range, field_name):
+    low, high = parse_int_range(raw_range, field_name)
+    if low < 0:
+        raise ValueError(f"{field_name} cannot include negative lawn coordinates")
+    return low, high
+
+
+def normalize_lawn_coordinates(value, field_name):
+    cleaned_values = normalize_int_list(value, field_name)
+    for idx, item in enumerate(cleaned_values):
+        if item < 0:
+            raise ValueError(f"{field_name}[{idx}] cannot be negative")
+    return cleaned_values
+
+
+def normalize_lawn_position(raw_position, field_name):
+    x, y = normalize_grid_position(raw_position, field_name)
+    if x < 0:
+        raise ValueError(f"{field_name}.x cannot be negative")
+    if y < 0:
+        raise ValueError(f"{field_name}.y cannot be negative")
+    return x, y
+
+
+class SliderLayoutSearch:
+    # Exact search for slider layouts over cells in column order. A row is
+    # blocked while its last slider has no enabler after it; a new slider in a
+    # blocked row would leave an unenabled pair. Enablers only count in later
+    # columns, so each column's placed and enabled rows fold into the mask once
+    # the column is done. Existing sliders are forced cells.
+    def __init__(self, slider_cells, existing_slider_states):
+        cells = [(cell["x"], cell["y"], cell, None) for cell in slider_cells]
+        cells.extend((state["x"], state["y"], None, state) for state in existing_slider_states)
+        cells.sort(key=lambda cell: (cell[0], cell[1]))
+        self.cells = cells
+        self.free_left = [0] * (len(cells) + 1)
+        for index in range(len(cells) - 1, -1, -1):
+            self.free_left[index] = self.free_left[index + 1] + (cells[index][2] is not None)
+        self.counts_memo = {}
+
+    def advance(self, index, mask, placed_rows, enabled_rows, direction=None):
+        y = self.cells[index][1]
+        if direction is not None:
+            placed_rows |= 1 << y
+            enabled_rows |= 1 << (y - 1 if direction == "up" else y + 1)
+        index += 1
+        if index == len(self.cells) or self.cells[index][0] != self.cells[index - 1][0]:
+            return index, (mask & ~enabled_rows) | placed_rows, 0, 0
+        return index, mask, placed_rows, enabled_rows
+
+    def counts(self, index=0, mask=0, placed_rows=0, enabled_rows=0):
+        # Bit n is set when a valid completion from this cell on takes exactly n
+        # new sliders; 0 means the existing sliders cannot be completed at all.
+        if index == len(self.cells):
+            return 1
+        key = (index, mask, placed_rows, enabled_rows)
+        reachable = self.counts_memo.get(key)
+        if reachable is not None:
+            return reachable
+
+        _, y, slider_cell, slider_state = self.cells[index]
+        blocked = mask >> y & 1
+        if slider_state is not None:
+            reachable = 0 if blocked else self.counts(*self.advance(*key, slider_state["direction"]))
+        else:
+            reachable = self.counts(*self.advance(*key))
+            if not blocked:
+                for option in slider_cell["options"]:
+                    reachable |= self.counts(*self.advance(*key, option["direction"])) << 1
+        self.counts_memo[key] = reachable
+        return reachable
+
+    def search(self, rng, count, max_nodes):
+        # Walks the cells in column order and only takes a choice whose rest can
+        # still hold exactly the remaining sliders, so it never has to back up.
+        # Returns None once max_nodes cells are expanded without finishing.
+        state = (0, 0, 0, 0)
+        remaining = count
+        chosen_states = []
+        while state[0] < len(self.cells):
+            if state[0] >= max_nodes:
+                return None
+            x, y, slider_cell, slider_state = self.cells[state[0]]
+            if slider_state is not None:
+                state = self.advance(*state, slider_state["direction"])
+                continue
+
+            # Place here with the odds that spread the remaining sliders over the
+            # free cells left, options in weighted random order.
+            options = []
+            if remaining > 0 and not state[1] >> y & 1:
+                first = slider_cell["options"][slider_cell["sampler"].pick(rng)]
+                options = [first] + [option for option in slider_cell["options"] if option is not first]
+            choices = options + [None]
+            if rng.random() >= remaining / self.free_left[state[0]]:
+                choices = [None] + options
+
+            for option in choices:
+                direction = None if option is None else option["direction"]
+                next_state = self.advance(*state, direction)
+                if self.counts(*next_state) >> (remaining - (option is not None)) & 1:
+                    break
+            state = next_state
+            if option is not None:
+                remaining -= 1
+                chosen_states.append({"x": x, "y": y, "type_name": option["type_name"], "direction": direction})
+        return chosen_states
+
+
+def build_initial_grid_item_object(rng, initial_cfg, generation_context=None):
     if not isinstance(initial_cfg, dict):
         raise ValueError("initial_grid_items must be an object")
     if not initial_cfg.get("enabled", False):
@@ -4562,22 +5690,18 @@ def build_initial_grid_item_object(initial_cfg, generation_context=None):
     allow_overlap = bool(initial_cfg.get("allow_overlap", False))
     module_rtid = str(initial_cfg.get("module_rtid", f"RTID({alias}@CurrentLevel)"))
 
-    global_x_range = parse_int_range(
+    global_x_range = parse_lawn_range(
         initial_cfg.get("x_range", [0, 8]),
         "initial_grid_items.x_range",
     )
-    global_y_range = parse_int_range(
+    global_y_range = parse_lawn_range(
         initial_cfg.get("y_range", [0, 4]),
         "initial_grid_items.y_range",
     )
     expected_pattern_rows = list(range(global_y_range[0], global_y_range[1] + 1))
-    plank_rows = set(generation_context.get("plank_rows", []))
+    plank_row_mask = bits_of(generation_context.get("plank_rows", []))
 
-    column_region_ranges = {
-        "back": (0, 4),
-        "middle": (3, 5),
-        "front": (5, 8),
-    }
+    column_region_ranges = dict(LAWN_COLUMN_REGIONS)
     raw_column_regions = initial_cfg.get("column_regions")
     if raw_column_regions is not None:
         if not isinstance(raw_column_regions, dict):
@@ -4587,7 +5711,7 @@ def build_initial_grid_item_object(initial_cfg, generation_context=None):
             region_key = str(region_name).strip().lower()
             if not region_key:
                 raise ValueError("initial_grid_items.column_regions keys must be non-empty strings")
-            column_region_ranges[region_key] = parse_int_range(
+            column_region_ranges[region_key] = parse_lawn_range(
                 raw_range,
                 f"initial_grid_items.column_regions[{region_name!r}]",
             )
@@ -4609,7 +5733,10 @@ def build_initial_grid_item_object(initial_cfg, generation_context=None):
         for idx, value in enumerate(raw_disallowed_totals)
     }
 
-    occupied = set()
+    # Items from this builder are checked against a private copy of the shared
+    # lawn, and all placements are marked on the shared lawn at the end.
+    lawn = generation_context.get("lawn")
+    occupied = lawn.copy() if lawn is not None else LawnOccupancy()
     placements = []
     pool_entries = initial_cfg.get("pool")
 
@@ -4634,59 +5761,48 @@ def build_initial_grid_item_object(initial_cfg, generation_context=None):
         return valid_totals[0]
 
     def resolve_candidate_rows(entry, entry_label):
-        entry_y_range = parse_int_range(
+        entry_y_range = parse_lawn_range(
             entry.get("y_range", list(global_y_range)),
             f"{entry_label}.y_range",
         )
-        allowed_rows = set(range(entry_y_range[0], entry_y_range[1] + 1))
+        allowed_rows = bit_span(*entry_y_range)
 
         raw_allowed_rows = entry.get("allowed_rows")
         if raw_allowed_rows is not None:
-            allowed_rows &= {
-                as_int(value, f"{entry_label}.allowed_rows[{idx}]")
-                for idx, value in enumerate(normalize_int_list(raw_allowed_rows, f"{entry_label}.allowed_rows"))
-            }
+            allowed_rows &= bits_of(normalize_lawn_coordinates(raw_allowed_rows, f"{entry_label}.allowed_rows"))
 
         raw_forbidden_rows = entry.get("forbidden_rows", entry.get("disallowed_rows"))
         if raw_forbidden_rows is not None:
-            forbidden_rows = {
-                as_int(value, f"{entry_label}.forbidden_rows[{idx}]")
-                for idx, value in enumerate(normalize_int_list(raw_forbidden_rows, f"{entry_label}.forbidden_rows"))
-            }
-            allowed_rows -= forbidden_rows
+            allowed_rows &= ~bits_of(normalize_lawn_coordinates(raw_forbidden_rows, f"{entry_label}.forbidden_rows"))
 
         if bool(entry.get("requires_planks", False)):
-            allowed_rows &= plank_rows
+            allowed_rows &= plank_row_mask
 
-        return sorted(allowed_rows)
+        return list(iter_bits(allowed_rows))
 
     def resolve_candidate_columns(entry, entry_label):
-        entry_x_range = parse_int_range(
+        entry_x_range = parse_lawn_range(
             entry.get("x_range", list(global_x_range)),
             f"{entry_label}.x_range",
         )
-        allowed_columns = set(range(entry_x_range[0], entry_x_range[1] + 1))
+        allowed_columns = bit_span(*entry_x_range)
 
         raw_columns = entry.get("columns")
         if raw_columns is not None:
-            explicit_columns = {
-                as_int(value, f"{entry_label}.columns[{idx}]")
-                for idx, value in enumerate(normalize_int_list(raw_columns, f"{entry_label}.columns"))
-            }
-            allowed_columns &= explicit_columns
+            allowed_columns &= bits_of(normalize_lawn_coordinates(raw_columns, f"{entry_label}.columns"))
 
         raw_regions = entry.get("column_regions")
         if raw_regions is not None:
             region_names = normalize_string_list(raw_regions, f"{entry_label}.column_regions")
-            region_columns = set()
+            region_columns = 0
             for region_name in region_names:
                 region_range = column_region_ranges.get(region_name.lower())
                 if region_range is None:
                     raise ValueError(f"{entry_label}.column_regions includes unknown region {region_name!r}")
-                region_columns.update(range(region_range[0], region_range[1] + 1))
+                region_columns |= bit_span(*region_range)
             allowed_columns &= region_columns
 
-        return sorted(allowed_columns)
+        return list(iter_bits(allowed_columns))
 
     def prepare_type_options(entry, entry_label):
         raw_type_options = entry.get("type_options")
@@ -4716,16 +5832,26 @@ def build_initial_grid_item_object(initial_cfg, generation_context=None):
             raise ValueError(f"{entry_label}.type_name is required")
         return [{"type_name": type_name, "weight": 1.0}]
 
-    def make_candidate_cell(x, y, type_name=None):
-        cell = {"x": x, "y": y}
-        if type_name is not None:
-            normalized_type_name = str(type_name).strip()
-            if not normalized_type_name:
-                raise ValueError("candidate cell type_name must be a non-empty string")
-            cell["type_name"] = normalized_type_name
-        return cell
+    def compile_pattern_masks(patterns, entry_label):
+        # Each pattern becomes the bitmask of the rows it fills, bit y for row y.
+        masks = []
+        for pattern_idx, pattern in enumerate(patterns):
+            if not isinstance(pattern, str) or not pattern:
+                raise ValueError(f"{entry_label}.patterns[{pattern_idx}] must be a non-empty string")
+            if len(pattern) != len(expected_pattern_rows):
+                raise ValueError(
+                    f"{entry_label}.patterns[{pattern_idx}] must be {len(expected_pattern_rows)} characters long"
+                )
+            if not set(pattern) <= {"0", "1"}:
+                raise ValueError(
+                    f"{entry_label}.patterns[{pattern_idx}] must contain only '0' and '1'"
+                )
+            masks.append(int(pattern[::-1], 2) << expected_pattern_rows[0])
+        return masks
 
     def build_candidates(entry, entry_label):
+        # Candidates are {"column": x, "rows": row bitmask}; their cells are only
+        # expanded when one is placed.
         placement_mode = str(entry.get("placement_mode", "random_cells")).strip().lower()
         candidate_rows = resolve_candidate_rows(entry, entry_label)
         candidate_columns = resolve_candidate_columns(entry, entry_label)
@@ -4757,37 +5883,16 @@ def build_initial_grid_item_object(initial_cfg, generation_context=None):
             if entry.get("positions") is not None:
                 raise ValueError(f"{entry_label}.positions is not supported with placement_mode=pattern_columns")
 
-            candidates = []
-            for column in candidate_columns:
-                for pattern_idx, pattern in enumerate(patterns):
-                    if not isinstance(pattern, str) or not pattern:
-                        raise ValueError(f"{entry_label}.patterns[{pattern_idx}] must be a non-empty string")
-                    if len(pattern) != len(expected_pattern_rows):
-                        raise ValueError(
-                            f"{entry_label}.patterns[{pattern_idx}] must be {len(expected_pattern_rows)} characters long"
-                        )
-
-                    cells = []
-                    for row_offset, flag in enumerate(pattern):
-                        if flag not in {"0", "1"}:
-                            raise ValueError(
-                                f"{entry_label}.patterns[{pattern_idx}] must contain only '0' and '1'"
-                            )
-                        if flag == "1":
-                            row_value = expected_pattern_rows[row_offset]
-                            if row_value in candidate_rows:
-                                cells.append(
-                                    make_candidate_cell(
-                                        column,
-                                        row_value,
-                                        row_type_names.get(row_value),
-                                    )
-                                )
-                    if cells:
-                        candidates.append({"cells": cells, "column": column})
+            candidate_row_mask = bits_of(candidate_rows)
+            row_masks = [
+                rows
+                for rows in (mask & candidate_row_mask for mask in compile_pattern_masks(patterns, entry_label))
+                if rows
+            ]
+            candidates = [{"column": column, "rows": rows} for column in candidate_columns for rows in row_masks]
             if len(candidates) == 0:
                 raise ValueError(f"{entry_label} produced no pattern placement candidates")
-            return placement_mode, candidates
+            return placement_mode, candidates, row_type_names
 
         raw_positions = entry.get("positions")
         candidates = []
@@ -4795,28 +5900,28 @@ def build_initial_grid_item_object(initial_cfg, generation_context=None):
             if not isinstance(raw_positions, list) or len(raw_positions) == 0:
                 raise ValueError(f"{entry_label}.positions must be a non-empty array")
             for p_idx, raw in enumerate(raw_positions):
-                x, y = normalize_grid_position(raw, f"{entry_label}.positions[{p_idx}]")
+                x, y = normalize_lawn_position(raw, f"{entry_label}.positions[{p_idx}]")
                 if x in candidate_columns and y in candidate_rows:
-                    candidates.append({"cells": [make_candidate_cell(x, y)], "column": x})
+                    candidates.append({"column": x, "rows": 1 << y})
         else:
             for x in candidate_columns:
                 for y in candidate_rows:
-                    candidates.append({"cells": [make_candidate_cell(x, y)], "column": x})
+                    candidates.append({"column": x, "rows": 1 << y})
         if len(candidates) == 0:
             raise ValueError(f"{entry_label} produced no candidate cells")
-        return placement_mode, candidates
-
-    def pick_weighted_entry(entries):
-        total_weight = sum(e["weight"] for e in entries)
-        if total_weight <= 0:
-            return random.choice(entries)
-        roll = random.uniform(0.0, total_weight)
-        running = 0.0
-        for entry in entries:
-            running += entry["weight"]
-            if roll <= running:
-                return entry
-        return entries[-1]
+        return placement_mode, candidates, row_type_names
+
+    def place_candidate(candidate, type_name, row_type_names, entry_overlap):
+        for row_value in iter_bits(candidate["rows"]):
+            placements.append(
+                {
+                    "GridX": candidate["column"],
+                    "GridY": row_value,
+                    "TypeName": row_type_names.get(row_value, type_name),
+                }
+            )
+        if not entry_overlap:
+            occupied.add_rows(candidate["column"], candidate["rows"])
 
     def prepare_slider_type_options(entry, entry_label):
         if entry.get("type_name") or entry.get("type_options") is not None:
@@ -4876,30 +5981,30 @@ def build_initial_grid_item_object(initial_cfg, generation_context=None):
             )
         return slider_states
 
-    def validate_slider_states(slider_states):
-        sliders_by_row = {}
-        for slider_state in slider_states:
-            if not is_slider_row_valid(slider_state["direction"], slider_state["y"]):
-                return False
-            sliders_by_row.setdefault(slider_state["y"], []).append(slider_state)
-
-        for row_value, row_sliders in sliders_by_row.items():
-            ordered_row_sliders = sorted(row_sliders, key=lambda state: state["x"], reverse=True)
-            for right_slider, left_slider in zip(ordered_row_sliders, ordered_row_sliders[1:]):
-                enabled = False
-                for candidate_slider in slider_states:
-                    if not (left_slider["x"] < candidate_slider["x"] < right_slider["x"]):
-                        continue
-                    if candidate_slider["direction"] == "up" and candidate_slider["y"] == row_value + 1:
-                        enabled = True
-                        break
-                    if candidate_slider["direction"] == "down" and candidate_slider["y"] == row_value - 1:
-                        enabled = True
-                        break
-                if not enabled:
-                    return False
+    def get_slider_enabled_row(slider_state):
+        # An up slider lets the row above it hold neighbouring sliders, a down slider the row below.
+        return slider_state["y"] - 1 if slider_state["direction"] == "up" else slider_state["y"] + 1
 
-        return True
+    def has_slider_enabler(enabler_columns, left_x, right_x):
+        return any(left_x < enabler_x < right_x for enabler_x in enabler_columns)
+
+    def find_unenabled_slider_pairs(slider_states):
+        # Neighbouring sliders in one row need an up slider in the row below or a
+        # down slider in the row above, somewhere strictly between them.
+        columns_by_row = {}
+        enabler_columns_by_row = {}
+        for slider_state in slider_states:
+            columns_by_row.setdefault(slider_state["y"], []).append(slider_state["x"])
+            enabler_columns_by_row.setdefault(get_slider_enabled_row(slider_state), []).append(slider_state["x"])
+
+        unenabled_pairs = []
+        for row_value, row_columns in sorted(columns_by_row.items()):
+            row_columns.sort()
+            enabler_columns = enabler_columns_by_row.get(row_value, [])
+            for left_x, right_x in zip(row_columns, row_columns[1:]):
+                if not has_slider_enabler(enabler_columns, left_x, right_x):
+                    unenabled_pairs.append((row_value, left_x, right_x))
+        return unenabled_pairs
 
     def place_slider_cells(entry, entry_label, count, candidates):
         if bool(entry.get("allow_overlap", allow_overlap)):
@@ -4912,10 +6017,9 @@ def build_initial_grid_item_object(initial_cfg, generation_context=None):
 
         base_candidates = []
         for candidate in candidates:
-            if len(candidate["cells"]) != 1:
+            if candidate["rows"].bit_count() != 1:
                 raise ValueError(f"{entry_label} placement_mode=slider_cells only supports single-cell candidates")
-            cell = candidate["cells"][0]
-            if (cell["x"], cell["y"]) in occupied:
+            if not occupied.fits(candidate["column"], candidate["rows"]):
                 continue
             base_candidates.append(candidate)
 
@@ -4925,57 +6029,103 @@ def build_initial_grid_item_object(initial_cfg, generation_context=None):
             )
 
         existing_slider_states = extract_slider_states(placements, slider_type_options)
+        for slider_state in existing_slider_states:
+            if not is_slider_row_valid(slider_state["direction"], slider_state["y"]):
+                raise ValueError(
+                    f"{entry_label} cannot complete the existing layout: {slider_state['type_name']} at "
+                    f"({slider_state['x']}, {slider_state['y']}) points off initial_grid_items.y_range"
+                )
 
-        for _ in range(max_attempts):
-            trial_slider_states = []
-            selected_candidates = random.sample(base_candidates, count)
-            for candidate in selected_candidates:
-                cell = candidate["cells"][0]
-                valid_type_options = [
-                    option
-                    for option in slider_type_options
-                    if is_slider_row_valid(option["direction"], cell["y"])
-                ]
-                if len(valid_type_options) == 0:
-                    trial_slider_states = []
-                    break
-                chosen_type = pick_weighted_entry(valid_type_options)
-                trial_slider_states.append(
+        # Prune up front: rows where no direction is valid, and zero-weight
+        # directions when the other one is allowed.
+        slider_cells = []
+        for candidate in base_candidates:
+            row_value = candidate["rows"].bit_length() - 1
+            valid_type_options = [
+                option
+                for option in slider_type_options
+                if is_slider_row_valid(option["direction"], row_value)
+            ]
+            if any(option["weight"] > 0 for option in valid_type_options):
+                valid_type_options = [option for option in valid_type_options if option["weight"] > 0]
+            if valid_type_options:
+                slider_cells.append(
                     {
-                        "x": cell["x"],
-                        "y": cell["y"],
-                        "type_name": chosen_type["type_name"],
-                        "direction": chosen_type["direction"],
+                        "x": candidate["column"],
+                        "y": row_value,
+                        "options": valid_type_options,
+                        "sampler": WeightedSampler([option["weight"] for option in valid_type_options]),
                     }
                 )
+        if count > len(slider_cells):
+            raise ValueError(
+                f"{entry_label} can place at most {len(slider_cells)} slider(s): the other free cells are in rows "
+                f"where neither direction stays inside initial_grid_items.y_range {list(global_y_range)}"
+            )
 
-            if len(trial_slider_states) != count:
-                continue
-
-            if not validate_slider_states(existing_slider_states + trial_slider_states):
-                continue
+        for row_value, left_x, right_x in find_unenabled_slider_pairs(existing_slider_states):
+            if not any(
+                left_x < slider_cell["x"] < right_x
+                and any(
+                    get_slider_enabled_row({"y": slider_cell["y"], "direction": option["direction"]}) == row_value
+                    for option in slider_cell["options"]
+                )
+                for slider_cell in slider_cells
+            ):
+                raise ValueError(
+                    f"{entry_label} cannot complete the existing layout: sliders at x={left_x} and x={right_x} "
+                    f"in row {row_value} need an up slider in row {row_value + 1} or a down slider in row "
+                    f"{row_value - 1} between them, and no free cell there can take one"
+                )
 
-            for slider_state in trial_slider_states:
-                placements.append(
-                    {
-                        "GridX": slider_state["x"],
-                        "GridY": slider_state["y"],
-                        "TypeName": slider_state["type_name"],
-                    }
+        slider_search = SliderLayoutSearch(slider_cells, existing_slider_states)
+        slider_counts = slider_search.counts()
+        if slider_counts == 0:
+            raise ValueError(
+                f"{entry_label} cannot complete the existing layout: the free cells cannot enable every pair "
+                "of neighbouring sliders in a row"
+            )
+        slider_capacity = slider_counts.bit_length() - 1
+        if count > slider_capacity:
+            raise ValueError(
+                f"{entry_label} can place at most {slider_capacity} slider(s): neighbouring sliders in a row "
+                "need an up slider in the row below or a down slider in the row above between them"
+            )
+        if not slider_counts >> count & 1:
+            fewest = (slider_counts & -slider_counts).bit_length() - 1
+            if count < fewest:
+                raise ValueError(
+                    f"{entry_label} cannot complete the existing layout with {count} slider(s): enabling every "
+                    f"pair of neighbouring sliders in a row takes at least {fewest}"
                 )
-                occupied.add((slider_state["x"], slider_state["y"]))
-            return
+            raise ValueError(
+                f"{entry_label} cannot place exactly {count} slider(s): valid layouts here take between "
+                f"{fewest} and {slider_capacity}, but not {count}"
+            )
 
-        raise ValueError(
-            f"{entry_label} could not generate a valid slider layout after {max_attempts} attempt(s)"
-        )
+        chosen_states = slider_search.search(rng, count, max_attempts)
+        if chosen_states is None:
+            raise ValueError(
+                f"{entry_label} could not build a valid slider layout within {max_attempts} search step(s) "
+                "(max_attempts)"
+            )
+
+        for slider_state in chosen_states:
+            placements.append(
+                {
+                    "GridX": slider_state["x"],
+                    "GridY": slider_state["y"],
+                    "TypeName": slider_state["type_name"],
+                }
+            )
+            occupied.add(slider_state["x"], slider_state["y"])
 
     if isinstance(pool_entries, list) and len(pool_entries) > 0:
         total_count_range = parse_int_range(
             initial_cfg.get("total_count_range", [1, 1]),
             "initial_grid_items.total_count_range",
         )
-        target_total = normalize_total_count(random.randint(*total_count_range), total_count_range)
+        target_total = normalize_total_count(rng.randint(*total_count_range), total_count_range)
 
         prepared_entries = []
         min_total = 0
@@ -5004,13 +6154,15 @@ def build_initial_grid_item_object(initial_cfg, generation_context=None):
                 raise ValueError(f"{entry_label}.weight cannot be negative")
 
             entry_overlap = bool(entry.get("allow_overlap", allow_overlap))
-            placement_mode, candidates = build_candidates(entry, entry_label)
+            placement_mode, candidates, row_type_names = build_candidates(entry, entry_label)
             type_options = prepare_type_options(entry, entry_label)
             unique_pattern_columns = bool(entry.get("unique_pattern_columns", True))
 
             prepared_entries.append(
                 {
                     "type_options": type_options,
+                    "type_sampler": WeightedSampler([option["weight"] for option in type_options]),
+                    "row_type_names": row_type_names,
                     "min_count": min_count,
                     "max_count": max_count,
                     "weight": weight,
@@ -5039,24 +6191,15 @@ def build_initial_grid_item_object(initial_cfg, generation_context=None):
                     return False
                 if entry["allow_overlap"]:
                     return True
-                return all((cell["x"], cell["y"]) not in occupied for cell in candidate["cells"])
+                return occupied.fits(candidate["column"], candidate["rows"])
 
             available = [candidate for candidate in entry["candidates"] if is_available(candidate)]
             if len(available) == 0:
                 return False
 
-            candidate = random.choice(available)
-            type_name = pick_weighted_entry(entry["type_options"])["type_name"]
-            for cell in candidate["cells"]:
-                placements.append(
-                    {
-                        "GridX": cell["x"],
-                        "GridY": cell["y"],
-                        "TypeName": cell.get("type_name", type_name),
-                    }
-                )
-                if not entry["allow_overlap"]:
-                    occupied.add((cell["x"], cell["y"]))
+            candidate = rng.choice(available)
+            type_name = entry["type_options"][entry["type_sampler"].pick(rng)]["type_name"]
+            place_candidate(candidate, type_name, entry["row_type_names"], entry["allow_overlap"])
             if entry["placement_mode"] == "pattern_columns" and entry["unique_pattern_columns"]:
                 entry["used_columns"].add(candidate["column"])
             entry["placed_count"] += 1
@@ -5072,32 +6215,34 @@ def build_initial_grid_item_object(initial_cfg, generation_context=None):
 
         remaining = target_total - len(placements)
 
-        while remaining > 0:
-            eligible = [
-                entry
-                for entry in prepared_entries
-                if entry["placed_count"] < entry["max_count"]
-            ]
-            if len(eligible) == 0:
-                raise ValueError(
-                    "initial_grid_items pool cannot satisfy total_count_range with the provided max_count values"
-                )
+        # Entries leave the pool for good once they reach max_count or run out of
+        # candidates; placing items only ever takes candidates away.
+        pool_order = sorted(prepared_entries, key=lambda e: e["weight"], reverse=True)
+        pool_sampler = ShrinkingWeightedSampler([entry["weight"] for entry in pool_order])
+        for pool_idx, entry in enumerate(pool_order):
+            if entry["placed_count"] >= entry["max_count"]:
+                pool_sampler.remove(pool_idx)
+        pool_blocked = False
 
-            ordered = sorted(eligible, key=lambda e: e["weight"], reverse=True)
-            placed = False
-            for _ in range(len(ordered)):
-                entry = pick_weighted_entry(ordered)
+        while remaining > 0:
+            while True:
+                if len(pool_sampler) == 0:
+                    if pool_blocked:
+                        raise ValueError(
+                            "initial_grid_items pool could not place more items without overlap; reduce total_count_range or widen position ranges"
+                        )
+                    raise ValueError(
+                        "initial_grid_items pool cannot satisfy total_count_range with the provided max_count values"
+                    )
+                pool_idx = pool_sampler.pick(rng)
+                entry = pool_order[pool_idx]
                 if place_one(entry):
-                    placed = True
-                    break
-                ordered = [e for e in ordered if e is not entry]
-                if len(ordered) == 0:
                     break
+                pool_sampler.remove(pool_idx)
+                pool_blocked = True
 
-            if not placed:
-                raise ValueError(
-                    "initial_grid_items pool could not place more items without overlap; reduce total_count_range or widen position ranges"
-                )
+            if entry["placed_count"] >= entry["max_count"]:
+                pool_sampler.remove(pool_idx)
             remaining -= 1
 
     else:
@@ -5126,11 +6271,11 @@ def build_initial_grid_item_object(initial_cfg, generation_context=None):
             except (TypeError, ValueError):
                 _weight = 1.0
             _prob = max(0.0, min(1.0, _weight))
-            if random.random() < _prob:
+            if rng.random() < _prob:
                 active_indices.add(_pre_idx)
         # Always keep at least one type active to avoid generating nothing.
         if not active_indices:
-            active_indices.add(random.randrange(len(type_entries)))
+            active_indices.add(rng.randrange(len(type_entries)))
 
         for idx, entry in enumerate(type_entries):
             if idx not in active_indices:
@@ -5142,7 +6287,7 @@ def build_initial_grid_item_object(initial_cfg, generation_context=None):
                 entry.get("count_range", [1, 1]),
                 f"initial_grid_items.types[{idx}].count_range",
             )
-            count = random.randint(*count_range)
+            count = rng.randint(*count_range)
             raw_disallowed = entry.get("disallowed_counts", [])
             if raw_disallowed:
                 disallowed_counts = set(
@@ -5160,7 +6305,7 @@ def build_initial_grid_item_object(initial_cfg, generation_context=None):
 
             entry_overlap = bool(entry.get("allow_overlap", allow_overlap))
             entry_label = f"initial_grid_items.types[{idx}]"
-            placement_mode, candidates = build_candidates(entry, entry_label)
+            placement_mode, candidates, row_type_names = build_candidates(entry, entry_label)
             if placement_mode == "slider_cells":
                 place_slider_cells(entry, entry_label, count, candidates)
                 continue
@@ -5177,29 +6322,24 @@ def build_initial_grid_item_object(initial_cfg, generation_context=None):
                     return False
                 if entry_overlap:
                     return True
-                return all((cell["x"], cell["y"]) not in occupied for cell in candidate["cells"])
+                return occupied.fits(candidate["column"], candidate["rows"])
 
+            type_sampler = WeightedSampler([option["weight"] for option in type_options])
             for _ in range(count):
                 available = [candidate for candidate in candidates if is_available(candidate)]
                 if len(available) == 0:
                     raise ValueError(
                         f"{entry_label} cannot place {count} item(s) without overlap or column reuse limits"
                     )
-                candidate = random.choice(available)
-                type_name = pick_weighted_entry(type_options)["type_name"]
-                for cell in candidate["cells"]:
-                    placements.append(
-                        {
-                            "GridX": cell["x"],
-                            "GridY": cell["y"],
-                            "TypeName": cell.get("type_name", type_name),
-                        }
-                    )
-                    if not entry_overlap:
-                        occupied.add((cell["x"], cell["y"]))
+                candidate = rng.choice(available)
+                type_name = type_options[type_sampler.pick(rng)]["type_name"]
+                place_candidate(candidate, type_name, row_type_names, entry_overlap)
                 if placement_mode == "pattern_columns" and unique_pattern_columns:
                     used_columns.add(candidate["column"])
 
+    if lawn is not None:
+        lawn.update((placement["GridX"], placement["GridY"]) for placement in placements)
+
     return {
         "module_rtid": module_rtid,
         "object": {
@@ -5211,6 +6351,7 @@ def build_initial_grid_item_object(initial_cfg, generation_context=None):
 
 
 def build_initial_zombie_object(
+    rng,
     initial_cfg,
     generation_context=None,
     all_zombie_aliases=None,
@@ -5230,35 +6371,32 @@ def build_initial_zombie_object(
         zombie_costs = {}
 
     alias = str(initial_cfg.get("alias", "IZP"))
-    blocked_cells = {
-        (as_int(cell[0], "initial_zombies.blocked_cells.x"), as_int(cell[1], "initial_zombies.blocked_cells.y"))
-        for cell in generation_context.get("blocked_cells", set())
-    }
+    lawn = generation_context.get("lawn")
+    if lawn is None:
+        lawn = LawnOccupancy()
 
     if "min_x" in initial_cfg or "max_x" in initial_cfg:
         global_x_range = (
             as_int(initial_cfg.get("min_x", 0), "initial_zombies.min_x"),
             as_int(initial_cfg.get("max_x", 8), "initial_zombies.max_x"),
         )
+        if global_x_range[0] < 0:
+            raise ValueError("initial_zombies.min_x cannot be negative")
         if global_x_range[0] > global_x_range[1]:
             raise ValueError("initial_zombies.min_x cannot be greater than initial_zombies.max_x")
     else:
-        global_x_range = parse_int_range(
+        global_x_range = parse_lawn_range(
             initial_cfg.get("x_range", [0, 8]),
             "initial_zombies.x_range",
         )
 
-    global_y_range = parse_int_range(
+    global_y_range = parse_lawn_range(
         initial_cfg.get("y_range", [0, 4]),
         "initial_zombies.y_range",
     )
-    plank_rows = set(generation_context.get("plank_rows", []))
+    plank_row_mask = bits_of(generation_context.get("plank_rows", []))
 
-    column_region_ranges = {
-        "back": (0, 4),
-        "middle": (3, 5),
-        "front": (5, 8),
-    }
+    column_region_ranges = dict(LAWN_COLUMN_REGIONS)
     raw_column_regions = initial_cfg.get("column_regions")
     if raw_column_regions is not None:
         if not isinstance(raw_column_regions, dict):
@@ -5268,7 +6406,7 @@ def build_initial_zombie_object(
             region_key = str(region_name).strip().lower()
             if not region_key:
                 raise ValueError("initial_zombies.column_regions keys must be non-empty strings")
-            column_region_ranges[region_key] = parse_int_range(
+            column_region_ranges[region_key] = parse_lawn_range(
                 raw_range,
                 f"initial_zombies.column_regions[{region_name!r}]",
             )
@@ -5304,7 +6442,7 @@ def build_initial_zombie_object(
         if not valid_totals:
             raise ValueError("initial_zombies total_count rules leave no valid totals")
 
-        target_total = random.randint(*count_range)
+        target_total = rng.randint(*count_range)
         if target_total in valid_totals:
             return target_total
 
@@ -5317,78 +6455,59 @@ def build_initial_zombie_object(
             return higher[0]
         return valid_totals[0]
 
-    def resolve_candidate_rows():
-        allowed_rows = set(range(global_y_range[0], global_y_range[1] + 1))
+    def resolve_candidate_row_mask():
+        allowed_rows = bit_span(*global_y_range)
 
         raw_allowed_rows = initial_cfg.get("allowed_rows")
         if raw_allowed_rows is not None:
-            allowed_rows &= {
-                as_int(value, f"initial_zombies.allowed_rows[{idx}]")
-                for idx, value in enumerate(
-                    normalize_int_list(raw_allowed_rows, "initial_zombies.allowed_rows")
-                )
-            }
+            allowed_rows &= bits_of(normalize_lawn_coordinates(raw_allowed_rows, "initial_zombies.allowed_rows"))
 
         raw_forbidden_rows = initial_cfg.get("forbidden_rows", initial_cfg.get("disallowed_rows"))
         if raw_forbidden_rows is not None:
-            forbidden_rows = {
-                as_int(value, f"initial_zombies.forbidden_rows[{idx}]")
-                for idx, value in enumerate(
-                    normalize_int_list(raw_forbidden_rows, "initial_zombies.forbidden_rows")
-                )
-            }
-            allowed_rows -= forbidden_rows
+            allowed_rows &= ~bits_of(normalize_lawn_coordinates(raw_forbidden_rows, "initial_zombies.forbidden_rows"))
 
         if bool(initial_cfg.get("requires_planks", False)):
-            allowed_rows &= plank_rows
+            allowed_rows &= plank_row_mask
 
-        return sorted(allowed_rows)
+        return allowed_rows
 
-    def resolve_candidate_columns():
-        allowed_columns = set(range(global_x_range[0], global_x_range[1] + 1))
+    def resolve_candidate_column_mask():
+        allowed_columns = bit_span(*global_x_range)
 
         raw_columns = initial_cfg.get("columns")
         if raw_columns is not None:
-            explicit_columns = {
-                as_int(value, f"initial_zombies.columns[{idx}]")
-                for idx, value in enumerate(normalize_int_list(raw_columns, "initial_zombies.columns"))
-            }
-            allowed_columns &= explicit_columns
+            allowed_columns &= bits_of(normalize_lawn_coordinates(raw_columns, "initial_zombies.columns"))
 
         raw_regions = initial_cfg.get("column_regions")
         if raw_regions is not None:
             region_names = normalize_string_list(raw_regions, "initial_zombies.column_regions")
-            region_columns = set()
+            region_columns = 0
             for region_name in region_names:
                 region_range = column_region_ranges.get(region_name.lower())
                 if region_range is None:
                     raise ValueError(f"initial_zombies.column_regions includes unknown region {region_name!r}")
-                region_columns.update(range(region_range[0], region_range[1] + 1))
+                region_columns |= bit_span(*region_range)
             allowed_columns &= region_columns
 
-        return sorted(allowed_columns)
+        return allowed_columns
 
     def build_candidate_cells():
-        candidate_rows = resolve_candidate_rows()
-        candidate_columns = resolve_candidate_columns()
-        if len(candidate_rows) == 0 or len(candidate_columns) == 0:
+        row_mask = resolve_candidate_row_mask()
+        column_mask = resolve_candidate_column_mask()
+        if not row_mask or not column_mask:
             raise ValueError("initial_zombies produced no candidate rows/columns")
 
         raw_positions = initial_cfg.get("positions")
-        cells = []
         if raw_positions is not None:
             if not isinstance(raw_positions, list) or len(raw_positions) == 0:
                 raise ValueError("initial_zombies.positions must be a non-empty array")
+            filtered_cells = []
             for idx, raw_position in enumerate(raw_positions):
-                x, y = normalize_grid_position(raw_position, f"initial_zombies.positions[{idx}]")
-                if x in candidate_columns and y in candidate_rows:
-                    cells.append((x, y))
+                x, y = normalize_lawn_position(raw_position, f"initial_zombies.positions[{idx}]")
+                if column_mask >> x & 1 and row_mask >> y & 1 and (x, y) not in lawn:
+                    filtered_cells.append((x, y))
         else:
-            for x in candidate_columns:
-                for y in candidate_rows:
-                    cells.append((x, y))
-
-        filtered_cells = [cell for cell in cells if cell not in blocked_cells]
+            filtered_cells = lawn.free_cells(iter_bits(column_mask), row_mask)
         if len(filtered_cells) == 0:
             raise ValueError("initial_zombies produced no available cells after blocking grid items")
         return filtered_cells
@@ -5487,32 +6606,31 @@ def build_initial_zombie_object(
         closeness = max(0.0, 1.0 - abs(x_ratio - cost_ratio))
         return min_position_weight + ((closeness ** cost_x_power) * (1.0 - min_position_weight))
 
-    occupied = set(blocked_cells)
+    # Pool entry x cell weights are computed once; placed cells and (without
+    # duplicates) placed pool entries are masked out instead of rebuilt.
+    placement_weights = MaskedWeightMatrix(
+        len(candidate_cells),
+        (
+            zombie_entry["weight"] * get_position_weight(cell_x, zombie_entry["alias"])
+            for zombie_entry in prepared_pool
+            for cell_x, _ in candidate_cells
+        ),
+    )
+    cell_columns = {}
+    for cell_idx, cell in enumerate(candidate_cells):
+        cell_columns.setdefault(cell, []).append(cell_idx)
+    free_cell_count = len(cell_columns)
     placements = []
-    available_pool = prepared_pool[:]
 
     for placement_idx in range(target_total):
-        available_cells = [cell for cell in candidate_cells if cell not in occupied]
-        if len(available_cells) == 0:
+        if free_cell_count == 0:
             raise ValueError(
                 "initial_zombies could not place all requested zombies without overlapping blocked cells"
             )
 
-        weighted_choices = []
-        for pool_idx, zombie_entry in enumerate(available_pool):
-            for cell_idx, (cell_x, cell_y) in enumerate(available_cells):
-                combined_weight = zombie_entry["weight"] * get_position_weight(cell_x, zombie_entry["alias"])
-                weighted_choices.append(
-                    {
-                        "weight": combined_weight,
-                        "pool_idx": pool_idx,
-                        "cell_idx": cell_idx,
-                    }
-                )
-
-        chosen = pick_weighted_entry(weighted_choices, f"initial_zombies placement {placement_idx + 1}")
-        zombie_entry = available_pool[chosen["pool_idx"]]
-        cell_x, cell_y = available_cells[chosen["cell_idx"]]
+        pool_idx, cell_idx = placement_weights.pick(rng, f"initial_zombies placement {placement_idx + 1}")
+        zombie_entry = prepared_pool[pool_idx]
+        cell_x, cell_y = candidate_cells[cell_idx]
         placement = {
             "GridX": cell_x,
             "GridY": cell_y,
@@ -5521,10 +6639,13 @@ def build_initial_zombie_object(
         if zombie_entry["condition"]:
             placement["Condition"] = zombie_entry["condition"]
         placements.append(placement)
-        occupied.add((cell_x, cell_y))
+        lawn.add(cell_x, cell_y)
+        for column in cell_columns[(cell_x, cell_y)]:
+            placement_weights.mask_column(column)
+        free_cell_count -= 1
 
         if not allow_duplicate_zombies:
-            del available_pool[chosen["pool_idx"]]
+            placement_weights.mask_row(pool_idx)
 
     return {
         "object": {
@@ -5557,10 +6678,253 @@ def unique_zombie_pool(raw_pool, field_name="zombie_pool", variant_alias_to_roll
     return unique_pool
 
 
-def build_level(template):
-    seed_value = template.get("random_seed")
-    if seed_value is not None:
-        random.seed(seed_value)
+def build_market_ambush(rng, wave, ambush_count, event_cfg, points_remaining, context):
+    event_obj, event_ref = build_market_event(rng, wave, ambush_count, event_cfg)
+    return [event_obj], [event_ref], points_remaining
+
+
+def build_raidpty_ambush(rng, wave, ambush_count, event_cfg, points_remaining, context):
+    return build_raidpty_events(rng, wave, ambush_count, event_cfg, points_remaining)
+
+
+def build_Parrotrousle_ambush(rng, wave, ambush_count, event_cfg, points_remaining, context):
+    return build_Parrotrousle_events(rng, wave, ambush_count, event_cfg, points_remaining)
+
+
+def build_parachute_rain_ambush(rng, wave, ambush_count, event_cfg, points_remaining, context):
+    event_obj, points_remaining = build_parachute_rain_event(
+        rng,
+        wave,
+        ambush_count,
+        event_cfg,
+        points_remaining,
+        context["all_zombie_costs"],
+        context["existing_aliases"],
+        allow_flag_zombies=context["allow_flag_zombies"],
+        zombie_variant_groups=context["zombie_variant_groups"],
+    )
+    if event_obj is None:
+        return [], [], points_remaining
+    return [event_obj], [f"RTID({event_obj['aliases'][0]}@.)"], points_remaining
+
+
+def build_sun_crash_ambush(rng, wave, ambush_count, event_cfg, points_remaining, context):
+    event_objs, refs = build_sun_crash_events(rng, wave, ambush_count, event_cfg, context["sun_crash_state"])
+    return event_objs, refs, points_remaining
+
+
+def build_imp_ambush(rng, wave, ambush_count, event_cfg, points_remaining, context):
+    event_obj, points_remaining = build_imp_ambush_event(
+        rng,
+        wave,
+        event_cfg,
+        points_remaining,
+        allow_flag_zombies=context["allow_flag_zombies"],
+        zombie_variant_groups=context["zombie_variant_groups"],
+        zombie_classes=context["zombie_classes"],
+    )
+    if event_obj is None:
+        return [], [], points_remaining
+    return [event_obj], [f"RTID({event_obj['aliases'][0]}@.)"], points_remaining
+
+
+def build_storm_ambush(rng, wave, ambush_count, event_cfg, points_remaining, context):
+    return build_sandstorm_ambush_events(
+        rng,
+        wave,
+        event_cfg,
+        context["existing_aliases"],
+        context["all_zombie_costs"],
+        points_remaining,
+        allow_flag_zombies=context["allow_flag_zombies"],
+        zombie_variant_groups=context["zombie_variant_groups"],
+    )
+
+
+def build_portal_spawn_ambush(rng, wave, ambush_count, event_cfg, points_remaining, context):
+    event_obj, event_ref, points_cost = build_portal_spawn_event(rng, event_cfg, points_remaining)
+    if event_obj is None or event_ref is None:
+        return [], [], points_remaining
+    return [event_obj], [event_ref], points_remaining - points_cost
+
+
+def build_grid_spawn_ambush(rng, wave, ambush_count, event_cfg, points_remaining, context):
+    event_obj, event_ref, points_remaining = build_grid_spawn_event(
+        rng,
+        wave,
+        ambush_count,
+        event_cfg,
+        context["existing_aliases"],
+        points_remaining,
+        generation_context=context["generation_context"],
+    )
+    if event_obj is None or event_ref is None:
+        return [], [], points_remaining
+    return [event_obj], [event_ref], points_remaining
+
+
+def build_frost_wind_ambush(rng, wave, ambush_count, event_cfg, points_remaining, context):
+    event_obj, event_ref, points_remaining = build_frost_wind_event(
+        rng,
+        wave,
+        ambush_count,
+        event_cfg,
+        context["existing_aliases"],
+        points_remaining,
+    )
+    if event_obj is None or event_ref is None:
+        return [], [], points_remaining
+    return [event_obj], [event_ref], points_remaining
+
+
+def build_low_tide_ambush(rng, wave, ambush_count, event_cfg, points_remaining, context):
+    event_objs, refs, points_remaining, context["last_tide_end"] = build_low_tide_events(
+        rng,
+        wave,
+        ambush_count,
+        event_cfg,
+        points_remaining,
+        context["all_zombie_aliases"],
+        context["all_zombie_costs"],
+        context["existing_aliases"],
+        allow_flag_zombies=context["allow_flag_zombies"],
+        zombie_variant_groups=context["zombie_variant_groups"],
+        zombie_classes=context["zombie_classes"],
+        variant_alias_to_roll=context["variant_alias_to_roll"],
+        last_tide_end=context["last_tide_end"],
+    )
+    # Add tide change with low tide
+    tide_cfgs = context["events_cfg"].get("tide_changes", [])
+    if tide_cfgs:
+        if context["tide_change_sampler"] is None:
+            context["tide_change_sampler"] = WeightedSampler([entry["weight"] for entry in tide_cfgs])
+        tide_cfg = pick_sampled_dict(rng, tide_cfgs, context["tide_change_sampler"], "tide_changes")
+        if tide_cfg:
+            # Make it more intense for low tide
+            tide_cfg = copy_config_value(tide_cfg)
+            if rng.random() < 0.7:  # 70% chance for intense pullback
+                tide_cfg["dry_lane_count_range"] = [5, 7]
+                tide_cfg["event_name"] = "intense_pullback"
+            event_obj, event_ref = build_tide_change_event(rng, wave, ambush_count, tide_cfg, context["existing_aliases"])
+            if event_obj and event_ref:
+                event_objs = event_objs + [event_obj]
+                refs = refs + [event_ref]
+                context["extra_ambushes"] += 1
+    return event_objs, refs, points_remaining
+
+
+def build_necromancy_ambush(rng, wave, ambush_count, event_cfg, points_remaining, context):
+    return build_grid_item_spawner_event(
+        rng,
+        wave,
+        ambush_count,
+        event_cfg,
+        context["all_zombie_aliases"],
+        context["existing_aliases"],
+        points_remaining,
+        context["all_zombie_costs"],
+        allow_flag_zombies=context["allow_flag_zombies"],
+        zombie_variant_groups=context["zombie_variant_groups"],
+        zombie_classes=context["zombie_classes"],
+        variant_alias_to_roll=context["variant_alias_to_roll"],
+    )
+
+
+def build_dino_ambush(rng, wave, ambush_count, event_cfg, points_remaining, context):
+    event_objs, refs, points_remaining = build_dino_events(
+        rng,
+        wave,
+        ambush_count,
+        event_cfg,
+        context["existing_aliases"],
+        points_remaining,
+        context["current_wave_zombies"],
+    )
+    # Row-pressure: for each dino spawned, bias zombies in the next 3 waves
+    # into the same row.  Ptero only allows DINO_PTERO_SUPPORT_ZOMBIES; others
+    # allow any zombie type.  A fraction cap prevents all zombies going to one row.
+    wave_zombies_by_wave = context["wave_zombies_by_wave"]
+    last_wave = min(wave + 4, context["wave_count"] + 1)
+    for dino_obj in event_objs:
+        objdata = dino_obj.get("objdata", {})
+        dino_row = objdata.get("DinoRow")
+        dino_type = objdata.get("DinoType", "")
+        if dino_row is None:
+            continue
+        is_ptero = "ptero" in dino_type.lower()
+        for future_wave in range(wave + 1, last_wave):
+            apply_dino_row_pressure(
+                rng,
+                wave_zombies_by_wave[future_wave - 1],
+                dino_row,
+                is_ptero,
+                context["ptero_support_types"],
+            )
+    return event_objs, refs, points_remaining
+
+
+def build_tide_change_ambush(rng, wave, ambush_count, event_cfg, points_remaining, context):
+    event_obj, event_ref = build_tide_change_event(rng, wave, ambush_count, event_cfg, context["existing_aliases"])
+    if event_obj is None or event_ref is None:
+        return [], [], points_remaining
+    return [event_obj], [event_ref], points_remaining
+
+
+AMBUSH_BUILDERS = {
+    "market": {"build": build_market_ambush, "spends_points": False},
+    "raidpty": {"build": build_raidpty_ambush, "spends_points": True},
+    "Parrotrousle": {"build": build_Parrotrousle_ambush, "spends_points": True},
+    "parachute_rain": {"build": build_parachute_rain_ambush, "spends_points": True, "compile": compile_parachute_rain_config},
+    "sun_crash": {"build": build_sun_crash_ambush, "spends_points": False},
+    "imp_ambush": {"build": build_imp_ambush, "spends_points": True, "compile": compile_imp_ambush_config},
+    "storm_ambush": {"build": build_storm_ambush, "spends_points": True, "compile": compile_sandstorm_config},
+    "portal_spawn": {"build": build_portal_spawn_ambush, "spends_points": True, "compile": compile_portal_spawn_config},
+    "grid_spawn": {"build": build_grid_spawn_ambush, "spends_points": True, "compile": compile_grid_spawn_config},
+    "frost_wind": {"build": build_frost_wind_ambush, "spends_points": True, "compile": compile_frost_wind_config},
+    "low_tide": {"build": build_low_tide_ambush, "spends_points": True},
+    "necromancy_spawn": {"build": build_necromancy_ambush, "spends_points": True},
+    "dino_ambush": {"build": build_dino_ambush, "spends_points": True},
+    "tide_change": {"build": build_tide_change_ambush, "spends_points": False},
+}
+
+
+class LevelProfile:
+    # Phases are recorded as consecutive laps, so their seconds add up to the
+    # whole build_level call.
+    def __init__(self):
+        self.phases = {}
+        self.counters = {}
+
+    def lap(self, phase, started):
+        now = time.perf_counter()
+        entry = self.phases.setdefault(phase, {"seconds": 0.0, "calls": 0})
+        entry["seconds"] += now - started
+        entry["calls"] += 1
+        return now
+
+    def count(self, counter, amount=1):
+        self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def merge(self, profile_data):
+        for phase, other in profile_data["phases"].items():
+            entry = self.phases.setdefault(phase, {"seconds": 0.0, "calls": 0})
+            entry["seconds"] += other["seconds"]
+            entry["calls"] += other["calls"]
+        for counter, amount in profile_data["counters"].items():
+            self.count(counter, amount)
+
+    def as_dict(self):
+        return {
+            "phases": {phase: dict(entry) for phase, entry in self.phases.items()},
+            "counters": dict(self.counters),
+        }
+
+
+def build_level(template, profile=None):
+    if profile is None:
+        profile = LevelProfile()
+    phase_started = time.perf_counter()
+    level_random = LevelRandom(template.get("random_seed"))
 
     level_name = str(template.get("level_name", "DIE"))
     output_file = Path(str(template.get("output_file", "death.json")))
@@ -5570,11 +6934,7 @@ def build_level(template):
     elif json_indent is not None:
         json_indent = as_int(json_indent, "json_indent")
 
-    sources = template.get("zombie_sources", {})
-    if not isinstance(sources, dict):
-        raise ValueError("zombie_sources must be an object")
-    types_file = Path(str(sources.get("types_file", DEFAULT_TYPES_PATH)))
-    props_file = Path(str(sources.get("props_file", DEFAULT_PROPS_PATH)))
+    types_file, props_file, catalog_snapshot = resolve_zombie_sources(template)
 
     wave_cfg = template.get("wave_settings", {})
     if not isinstance(wave_cfg, dict):
@@ -5584,7 +6944,7 @@ def build_level(template):
         raise ValueError("level_definition must be an object")
     stage_module = str(level_definition_template.get("StageModule", "")).strip()
 
-    flag_interval, flag_count, wave_count = resolve_wave_structure(wave_cfg)
+    flag_interval, flag_count, wave_count = resolve_wave_structure(level_random.stream("wave_structure"), wave_cfg)
     starting_points = as_number(
         wave_cfg.get("starting_points", 1),
         "wave_settings.starting_points",
@@ -5604,6 +6964,9 @@ def build_level(template):
     else:
         greediness = as_number(wave_cfg.get("greediness", 0.5), "wave_settings.greediness")
         greediness = max(0.0, min(1.0, greediness))
+    fill_mode = str(wave_cfg.get("fill_mode", "greedy")).strip().lower()
+    if fill_mode not in WAVE_FILL_MODES:
+        raise ValueError("wave_settings.fill_mode must be one of: " + ", ".join(WAVE_FILL_MODES))
     planks = bool(wave_cfg.get("planks", False))
     plankrows =[
                     0,
@@ -5612,9 +6975,10 @@ def build_level(template):
                     3,
                     4
                 ]
+    plank_rng = level_random.stream("planks")
     for i in range(3):
         try:
-            plankrows.remove(random.randint(0,4))
+            plankrows.remove(plank_rng.randint(0,4))
         except:
             continue
     
@@ -5637,21 +7001,15 @@ def build_level(template):
     initial_tide_cfg = template.get("initial_tide", {})
     if "starting_wave_location_range" in initial_tide_cfg:
         low, high = parse_int_range(initial_tide_cfg["starting_wave_location_range"], "initial_tide.starting_wave_location_range")
-        current_tide = random.randint(low, high)
+        current_tide = level_random.stream("initial_tide").randint(low, high)
         initial_tide_cfg["starting_wave_location"] = current_tide  # update for build_initial_tide_object
     else:
         current_tide = as_int(initial_tide_cfg.get("starting_wave_location", 4), "initial_tide.starting_wave_location")
 
-    types_data = load_json_file(types_file, "Zombie types")
-    props_data = load_json_file(props_file, "Zombie properties")
-    types_objects = types_data.get("objects", [])
-    props_objects = props_data.get("objects", [])
-    if not isinstance(types_objects, list):
-        raise ValueError(f"{types_file} must contain an 'objects' array")
-    if not isinstance(props_objects, list):
-        raise ValueError(f"{props_file} must contain an 'objects' array")
-    all_zombie_aliases = get_zombie_type_aliases(types_objects)
-    zombie_type_metadata = build_zombie_type_metadata(types_objects)
+    phase_started = profile.lap("setup", phase_started)
+    zombie_catalog = get_zombie_catalog(types_file, props_file, catalog_snapshot)
+    phase_started = profile.lap("catalog_load", phase_started)
+    all_zombie_aliases = zombie_catalog.aliases
 
     zombie_variant_groups, variant_alias_to_roll = build_zombie_variant_groups(
         template.get("zombie_variant_groups"),
@@ -5667,6 +7025,7 @@ def build_level(template):
     )
     selected_pool = [z for z in selected_pool if z not in exclude_from_waves]
     selected_pool = apply_zombie_pool_dependencies(
+        level_random.stream("zombie_pool"),
         selected_pool,
         template.get("zombie_pool_dependencies"),
         variant_alias_to_roll=variant_alias_to_roll,
@@ -5687,9 +7046,12 @@ def build_level(template):
         raise ValueError("non_basics_retained_per_flag cannot be negative")
     if zombie_pool_basics_raw and zombie_pool_non_basics_raw:
         basics_set = set(canonicalize_zombie_alias(z, variant_alias_to_roll) for z in zombie_pool_basics_raw)
-        non_basics_set = set(canonicalize_zombie_alias(z, variant_alias_to_roll) for z in zombie_pool_non_basics_raw)
+        non_basics_order = list(dict.fromkeys(
+            canonicalize_zombie_alias(z, variant_alias_to_roll) for z in zombie_pool_non_basics_raw
+        ))
+        non_basics_set = set(non_basics_order)
         # Ensure non_basics are in selected_pool
-        for zombie in non_basics_set:
+        for zombie in non_basics_order:
             if zombie not in selected_pool:
                 selected_pool.append(zombie)
     else:
@@ -5712,8 +7074,7 @@ def build_level(template):
     )
     all_zombie_costs = resolve_zombie_weights(
         sorted(weight_aliases),
-        types_objects,
-        props_objects,
+        zombie_catalog,
     )
     jam_style_overrides = dict(DEFAULT_JAM_STYLE_OVERRIDES)
     raw_jam_overrides = template.get("jam_style_overrides", {})
@@ -5727,28 +7088,33 @@ def build_level(template):
             jam_style_overrides[normalized_name] = jam_style.strip()
     zombie_jam_styles = resolve_zombie_jam_styles(
         selected_pool,
-        types_objects,
-        props_objects,
+        zombie_catalog,
         overrides=jam_style_overrides,
     )
+    zombie_classes = build_zombie_class_table(all_zombie_costs)
     zombie_costs = {name: all_zombie_costs[name] for name in selected_pool}
     zombie_rtid = {name: f"RTID({name}@ZombieTypes)" for name in selected_pool}
+    wave_type_table = WaveTypeTable(zombie_rtid)
 
     pool_sorted = sorted(selected_pool, key=zombie_costs.__getitem__)
     spendable_pool = [name for name in pool_sorted if zombie_costs[name] > 0]
     if not spendable_pool:
         raise ValueError("All zombie weights are <= 0. Cannot generate waves.")
+    zombie_cost_rank = build_zombie_cost_rank(selected_pool, zombie_costs)
     wave_companion_rules = prepare_wave_companion_rules(
         template.get("zombie_wave_rules"),
         zombie_costs,
         variant_alias_to_roll=variant_alias_to_roll,
+        zombie_classes=zombie_classes,
     )
 
-    required_zombies = selected_pool[:] if force_spawn_each else []
-    random.shuffle(required_zombies)
+    required_order = selected_pool[:] if force_spawn_each else []
+    level_random.stream("required_zombies").shuffle(required_order)
+    required_zombies = RequiredZombieQueue(required_order, zombie_costs)
 
-    pf_waves = build_plantfood_waves(wave_cfg, wave_count, flag_interval)
+    pf_waves = build_plantfood_waves(level_random.stream("plantfood"), wave_cfg, wave_count, flag_interval)
     jam_state = build_jam_state(
+        level_random.stream("jams"),
         template.get("jams"),
         wave_count,
         stage_module,
@@ -5774,15 +7140,19 @@ def build_level(template):
     jam_event_objects = []
     zombies_used = set()
     wave_points = []
-    existing_aliases = {seed_bank_alias, escalation_alias, wave_manager_module_alias, wave_manager_alias, rails_alias}
+    existing_aliases = AliasAllocator(
+        (seed_bank_alias, escalation_alias, wave_manager_module_alias, wave_manager_alias, rails_alias)
+    )
     generated_portal_objects, generated_portal_pool, portal_costs = build_generated_portal_objects(
+        level_random.stream("generated_portals"),
         events_cfg.get("generated_portals"),
         selected_pool,
         all_zombie_aliases,
         all_zombie_costs,
-        zombie_type_metadata,
+        zombie_catalog,
         existing_aliases,
         variant_alias_to_roll=variant_alias_to_roll,
+        zombie_classes=zombie_classes,
     )
     generation_context = {
         "generated_grid_pools": {
@@ -5790,8 +7160,10 @@ def build_level(template):
         },
         "portal_costs": portal_costs,
     }
+    phase_started = profile.lap("pool_setup", phase_started)
 
     for wave in range(1, wave_count + 1):
+        wave_rng = level_random.stream("wave", wave)
         is_flag_wave = wave % flag_interval == 0
         active_jam = jam_state["active_by_wave"].get(wave)
         points = starting_points + (wave - 1) * point_increment
@@ -5800,11 +7172,11 @@ def build_level(template):
         wave_points.append(points)
 
         if greediness_range is not None:
-            greediness = random.uniform(greediness_range[0], greediness_range[1])
+            greediness = wave_rng.uniform(greediness_range[0], greediness_range[1])
             greediness = max(0.0, min(1.0, greediness))
 
         remaining = points
-        zombies_list = []
+        wave_zombies = WaveZombies(wave_type_table)
         wave_present = set()
         wave_counts = {}
 
@@ -5812,6 +7184,7 @@ def build_level(template):
         if is_flag_wave and non_basics_set:
             if non_basics_pool_mode == "refresh_per_flag":
                 active_non_basics = refresh_non_basic_pool(
+                    wave_rng,
                     active_non_basics,
                     non_basics_set,
                     non_basics_per_flag,
@@ -5819,10 +7192,10 @@ def build_level(template):
                 )
                 available_pool = basics_set | active_non_basics
             else:
-                candidates = list(non_basics_set - introduced_non_basics)
+                candidates = sorted(non_basics_set - introduced_non_basics)
                 if candidates:
                     num_to_add = min(non_basics_per_flag, len(candidates))
-                    to_add = random.sample(candidates, num_to_add)
+                    to_add = wave_rng.sample(candidates, num_to_add)
                     available_pool.update(to_add)
                     introduced_non_basics.update(to_add)
                 active_non_basics = available_pool - basics_set
@@ -5831,13 +7204,13 @@ def build_level(template):
 
         for scheduled in pending_wave_companions.pop(wave, []):
             remaining, _ = add_requires_any_companions(
+                wave_rng,
                 scheduled["requires_any"],
                 scheduled["count_range"],
                 remaining,
-                zombies_list,
+                wave_zombies,
                 wave_present,
                 wave_counts,
-                zombie_rtid,
                 spawn_row_range,
                 planks,
                 zombie_costs,
@@ -5845,9 +7218,11 @@ def build_level(template):
                 allow_duplicates=scheduled["allow_duplicates"],
                 zombies_used=zombies_used,
                 zombie_variant_groups=zombie_variant_groups,
+                zombie_classes=zombie_classes,
             )
 
         def can_pick_for_wave(zombie_name):
+            profile.count("wave_fill.required_checks")
             return can_spawn_zombie_in_wave(
                 zombie_name,
                 remaining,
@@ -5855,37 +7230,36 @@ def build_level(template):
                 wave_counts,
                 zombie_costs,
                 wave_companion_rules,
-                zombie_jam_styles=zombie_jam_styles,
                 allow_flag_zombies=is_flag_wave,
                 active_jam=active_jam,
+                zombie_classes=zombie_classes,
             )
 
         required = pop_required_zombie(
             required_zombies,
-            zombie_costs,
             remaining,
             validator=can_pick_for_wave,
         )
         if required is not None:
             remaining -= zombie_costs[required]
             append_wave_zombie(
-                zombies_list,
+                wave_rng,
+                wave_zombies,
                 wave_present,
                 wave_counts,
                 required,
-                zombie_rtid,
                 spawn_row_range,
                 planks,
                 zombies_used=zombies_used,
                 zombie_variant_groups=zombie_variant_groups,
             )
             remaining = add_required_wave_companions(
+                wave_rng,
                 required,
                 remaining,
-                zombies_list,
+                wave_zombies,
                 wave_present,
                 wave_counts,
-                zombie_rtid,
                 spawn_row_range,
                 planks,
                 zombie_costs,
@@ -5893,8 +7267,10 @@ def build_level(template):
                 allow_flag_zombies=is_flag_wave,
                 zombies_used=zombies_used,
                 zombie_variant_groups=zombie_variant_groups,
+                zombie_classes=zombie_classes,
             )
             schedule_followup_wave_companions(
+                wave_rng,
                 pending_wave_companions,
                 required,
                 wave_companion_rules,
@@ -5902,25 +7278,31 @@ def build_level(template):
                 wave_count,
             )
 
+        fill_pool = prepare_wave_fill_pool(
+            current_spendable_pool,
+            zombie_costs,
+            zombie_cost_rank,
+            wave_companion_rules,
+            allow_flag_zombies=is_flag_wave,
+            active_jam=active_jam,
+            zombie_classes=zombie_classes,
+        )
+        if fill_mode == "knapsack":
+            fill_reachable = build_wave_fill_reachable(fill_pool, remaining)
         while remaining > 0:
-            valid_candidates = [
-                zombie_name
-                for zombie_name in current_spendable_pool
-                if can_spawn_zombie_in_wave(
-                    zombie_name,
-                    remaining,
-                    wave_present,
-                    wave_counts,
-                    zombie_costs,
-                    wave_companion_rules,
-                    zombie_jam_styles=zombie_jam_styles,
-                    allow_flag_zombies=is_flag_wave,
-                    active_jam=active_jam,
-                )
-            ]
+            valid_candidates = collect_wave_fill_candidates(
+                fill_pool,
+                remaining,
+                wave_present,
+                wave_counts,
+                zombie_costs,
+            )
+            profile.count("wave_fill.steps")
+            profile.count("wave_fill.candidates", len(valid_candidates))
             if not valid_candidates:
                 break
             valid_candidates = apply_jam_candidate_bias(
+                wave_rng,
                 valid_candidates,
                 active_jam,
                 jam_state,
@@ -5928,27 +7310,39 @@ def build_level(template):
             )
             if not valid_candidates:
                 break
+            if fill_mode == "knapsack":
+                # Keep only picks that still let the wave land closest to its budget.
+                valid_candidates = filter_knapsack_candidates(
+                    valid_candidates,
+                    fill_pool,
+                    fill_reachable,
+                    remaining,
+                    wave_present,
+                    wave_counts,
+                    zombie_costs,
+                )
+                profile.count("wave_fill.knapsack_candidates", len(valid_candidates))
 
-            zombie_name = pick_greedy_zombie(valid_candidates, zombie_costs, greediness)
+            zombie_name = pick_greedy_zombie(wave_rng, valid_candidates, greediness)
             remaining -= zombie_costs[zombie_name]
             append_wave_zombie(
-                zombies_list,
+                wave_rng,
+                wave_zombies,
                 wave_present,
                 wave_counts,
                 zombie_name,
-                zombie_rtid,
                 spawn_row_range,
                 planks,
                 zombies_used=zombies_used,
                 zombie_variant_groups=zombie_variant_groups,
             )
             remaining = add_required_wave_companions(
+                wave_rng,
                 zombie_name,
                 remaining,
-                zombies_list,
+                wave_zombies,
                 wave_present,
                 wave_counts,
-                zombie_rtid,
                 spawn_row_range,
                 planks,
                 zombie_costs,
@@ -5956,8 +7350,10 @@ def build_level(template):
                 allow_flag_zombies=is_flag_wave,
                 zombies_used=zombies_used,
                 zombie_variant_groups=zombie_variant_groups,
+                zombie_classes=zombie_classes,
             )
             schedule_followup_wave_companions(
+                wave_rng,
                 pending_wave_companions,
                 zombie_name,
                 wave_companion_rules,
@@ -5965,8 +7361,8 @@ def build_level(template):
                 wave_count,
             )
 
-        apply_wave_layout_rules(zombies_list, spawn_row_range, active_jam)
-        wave_zombies_by_wave.append(zombies_list)
+        apply_wave_layout_rules(wave_rng, wave_zombies, spawn_row_range, active_jam)
+        wave_zombies_by_wave.append(wave_zombies)
         wave_alias = f"{wave_alias_prefix}{wave}"
         wave_objects.append(
             {
@@ -5974,7 +7370,7 @@ def build_level(template):
                 "objclass": "SpawnZombiesJitteredWaveActionProps",
                 "objdata": {
                     "AdditionalPlantfood": 1 if wave in pf_waves else 0,
-                    "Zombies": zombies_list,
+                    "Zombies": wave_zombies,
                 },
             }
         )
@@ -5989,261 +7385,109 @@ def build_level(template):
             )
             jam_event_objects.append(jam_obj)
             wave_refs[-1].insert(0, jam_ref)
+        phase_started = profile.lap("wave_fill", phase_started)
 
     ambush_chance = as_number(events_cfg.get("ambush_chance", 0), "events.ambush_chance")
     max_per_wave = as_int(events_cfg.get("max_per_wave", 0), "events.max_per_wave")
     max_per_wave = max(0, max_per_wave)
 
     grid_event_objects = []
-    sun_crash_state = {"triggered": False}
-    last_tide_end = 4
+    ambush_table = None
+    ambush_context = {
+        "events_cfg": events_cfg,
+        "existing_aliases": existing_aliases,
+        "selected_pool": selected_pool,
+        "all_zombie_aliases": all_zombie_aliases,
+        "all_zombie_costs": all_zombie_costs,
+        "zombie_variant_groups": zombie_variant_groups,
+        "zombie_classes": zombie_classes,
+        "variant_alias_to_roll": variant_alias_to_roll,
+        "portal_costs": portal_costs,
+        "generation_context": generation_context,
+        "ptero_support_types": {
+            zombie_type for alias, zombie_type in zombie_rtid.items() if alias in DINO_PTERO_SUPPORT_ZOMBIES
+        },
+        "wave_count": wave_count,
+        "wave_zombies_by_wave": wave_zombies_by_wave,
+        "sun_crash_state": {"triggered": False},
+        "last_tide_end": 4,
+        "tide_change_sampler": None,
+        "extra_ambushes": 0,
+    }
 
     for wave in range(1, wave_count + 1):
         is_flag_wave = wave % flag_interval == 0
         ambush_points_remaining = max(0.0, wave_points[wave - 1])
         ambush_count = 0
         current_wave_zombies = wave_zombies_by_wave[wave - 1]
+        ambush_context["allow_flag_zombies"] = is_flag_wave
+        ambush_context["current_wave_zombies"] = current_wave_zombies
+        ambush_rng = level_random.stream("ambush", wave)
 
-        while ambush_count < max_per_wave and random.random() < ambush_chance:
+        while ambush_count < max_per_wave and ambush_rng.random() < ambush_chance:
             ambush_count += 1
-            available = get_enabled_ambushes(events_cfg, zombies_used, current_wave_zombies)
+            if ambush_table is None:
+                phase_started = profile.lap("ambush_selection", phase_started)
+                ambush_table = compile_ambush_table(events_cfg, zombies_used, ambush_context)
+                phase_started = profile.lap("ambush_table", phase_started)
+            available, ambush_sampler = get_enabled_ambushes(ambush_table, current_wave_zombies)
             if not available:
                 break
 
-            chosen_event = pick_weighted_dict(available, "enabled ambushes")
+            chosen_event = pick_sampled_dict(ambush_rng, available, ambush_sampler, "enabled ambushes")
             event_kind = chosen_event["kind"]
-            event_cfg = chosen_event["config"]
+            event_cfg = chosen_event.get("compiled", chosen_event["config"])
+            event_rng = level_random.stream("ambush", wave, ambush_count, event_kind)
 
-            if event_kind == "market":
-                event_obj, event_ref = build_market_event(wave, ambush_count, event_cfg)
-                grid_event_objects.append(event_obj)
-                wave_refs[wave - 1].append(event_ref)
+            ambush_builder = AMBUSH_BUILDERS.get(event_kind)
+            if ambush_builder is None:
+                continue
+            phase_started = profile.lap("ambush_selection", phase_started)
+            event_objs, refs, points_remaining = ambush_builder["build"](
+                event_rng,
+                wave,
+                ambush_count,
+                event_cfg,
+                ambush_points_remaining,
+                ambush_context,
+            )
+            phase_started = profile.lap(f"ambush.{event_kind}", phase_started)
+            if ambush_builder["spends_points"]:
+                ambush_points_remaining = points_remaining
+            ambush_count += ambush_context["extra_ambushes"]
+            ambush_context["extra_ambushes"] = 0
+            grid_event_objects.extend(event_objs)
+            wave_refs[wave - 1].extend(refs)
+            for event_obj in event_objs:
                 for alias in event_obj.get("aliases", []):
                     if isinstance(alias, str):
                         existing_aliases.add(alias)
-            elif event_kind == "raidpty":
-                event_objs, refs, ambush_points_remaining = build_raidpty_events(
-                    wave, ambush_count, event_cfg, ambush_points_remaining,
-                )
-                grid_event_objects.extend(event_objs)
-                wave_refs[wave - 1].extend(refs)
-                for event_obj in event_objs:
-                    for alias in event_obj.get("aliases", []):
-                        if isinstance(alias, str):
-                            existing_aliases.add(alias)
-            elif event_kind == "Parrotrousle":
-                event_objs, refs, ambush_points_remaining = build_Parrotrousle_events(
-                    wave, ambush_count, event_cfg, ambush_points_remaining,
-                )
-                grid_event_objects.extend(event_objs)
-                wave_refs[wave - 1].extend(refs)
-                for event_obj in event_objs:
-                    for alias in event_obj.get("aliases", []):
-                        if isinstance(alias, str):
-                            existing_aliases.add(alias)
-            elif event_kind == "parachute_rain":
-                event_obj, ambush_points_remaining = build_parachute_rain_event(
-                    wave,
-                    ambush_count,
-                    event_cfg,
-                    ambush_points_remaining,
-                    all_zombie_costs,
-                    all_zombie_aliases,
-                    existing_aliases,
-                    allow_flag_zombies=is_flag_wave,
-                    zombie_variant_groups=zombie_variant_groups,
-                    variant_alias_to_roll=variant_alias_to_roll,
-                )
-                if event_obj is not None:
-                    grid_event_objects.append(event_obj)
-                    wave_refs[wave - 1].append(f"RTID({event_obj['aliases'][0]}@.)")
-            elif event_kind == "sun_crash":
-                event_objs, refs = build_sun_crash_events(
-                    wave, ambush_count, event_cfg, sun_crash_state
-                )
-                grid_event_objects.extend(event_objs)
-                wave_refs[wave - 1].extend(refs)
-                for event_obj in event_objs:
-                    for alias in event_obj.get("aliases", []):
-                        if isinstance(alias, str):
-                            existing_aliases.add(alias)
-            elif event_kind == "imp_ambush":
-                event_obj, ambush_points_remaining = build_imp_ambush_event(
-                    wave,
-                    event_cfg,
-                    ambush_points_remaining,
-                    allow_flag_zombies=is_flag_wave,
-                    all_zombie_aliases=all_zombie_aliases,
-                    zombie_variant_groups=zombie_variant_groups,
-                    variant_alias_to_roll=variant_alias_to_roll,
-                )
-                if event_obj is not None:
-                    grid_event_objects.append(event_obj)
-                    wave_refs[wave - 1].append(f"RTID({event_obj['aliases'][0]}@.)")
-                    for alias in event_obj.get("aliases", []):
-                        if isinstance(alias, str):
-                            existing_aliases.add(alias)
-            elif event_kind == "storm_ambush":
-                storm_objects, storm_refs, ambush_points_remaining = build_sandstorm_ambush_events(
-                    wave,
-                    event_cfg,
-                    selected_pool,
-                    all_zombie_aliases,
-                    existing_aliases,
-                    all_zombie_costs,
-                    ambush_points_remaining,
-                    allow_flag_zombies=is_flag_wave,
-                    zombie_variant_groups=zombie_variant_groups,
-                    variant_alias_to_roll=variant_alias_to_roll,
-                )
-                grid_event_objects.extend(storm_objects)
-                wave_refs[wave - 1].extend(storm_refs)
-            elif event_kind == "portal_spawn":
-                event_obj, event_ref, points_cost = build_portal_spawn_event(wave, ambush_count, event_cfg, portal_costs, ambush_points_remaining)
-                if event_obj is not None and event_ref is not None:
-                    grid_event_objects.append(event_obj)
-                    wave_refs[wave - 1].append(event_ref)
-                    ambush_points_remaining -= points_cost
-                    for alias in event_obj.get("aliases", []):
-                        if isinstance(alias, str):
-                            existing_aliases.add(alias)
-            elif event_kind == "grid_spawn":
-                event_obj, event_ref, ambush_points_remaining = build_grid_spawn_event(
-                    wave,
-                    ambush_count,
-                    event_cfg,
-                    existing_aliases,
-                    ambush_points_remaining,
-                    generation_context=generation_context,
-                )
-                if event_obj is not None and event_ref is not None:
-                    grid_event_objects.append(event_obj)
-                    wave_refs[wave - 1].append(event_ref)
-            elif event_kind == "frost_wind":
-                event_obj, event_ref, ambush_points_remaining = build_frost_wind_event(
-                    wave,
-                    ambush_count,
-                    event_cfg,
-                    existing_aliases,
-                    ambush_points_remaining,
-                )
-                if event_obj is not None and event_ref is not None:
-                    grid_event_objects.append(event_obj)
-                    wave_refs[wave - 1].append(event_ref)
-            elif event_kind == "low_tide":
-                event_objs, refs, ambush_points_remaining, last_tide_end = build_low_tide_events(
-                    wave,
-                    ambush_count,
-                    event_cfg,
-                    ambush_points_remaining,
-                    all_zombie_aliases,
-                    all_zombie_costs,
-                    existing_aliases,
-                    allow_flag_zombies=is_flag_wave,
-                    zombie_variant_groups=zombie_variant_groups,
-                    variant_alias_to_roll=variant_alias_to_roll,
-                    last_tide_end=last_tide_end,
-                )
-                grid_event_objects.extend(event_objs)
-                wave_refs[wave - 1].extend(refs)
-                # Add tide change with low tide
-                tide_cfgs = events_cfg.get("tide_changes", [])
-                if tide_cfgs:
-                    tide_cfg = pick_weighted_dict(tide_cfgs, "tide_changes")
-                    if tide_cfg:
-                        # Make it more intense for low tide
-                        tide_cfg = copy.deepcopy(tide_cfg)
-                        if random.random() < 0.7:  # 70% chance for intense pullback
-                            tide_cfg["dry_lane_count_range"] = [5, 7]
-                            tide_cfg["event_name"] = "intense_pullback"
-                        event_obj, event_ref = build_tide_change_event(wave, ambush_count, tide_cfg, existing_aliases)
-                        if event_obj and event_ref:
-                            grid_event_objects.append(event_obj)
-                            wave_refs[wave - 1].append(event_ref)
-                            for alias in event_obj.get("aliases", []):
-                                if isinstance(alias, str):
-                                    existing_aliases.add(alias)
-                            ambush_count += 1
-            elif event_kind == "necromancy_spawn":
-                objects, refs, ambush_points_remaining = build_grid_item_spawner_event(
-                    wave,
-                    ambush_count,
-                    event_cfg,
-                    all_zombie_aliases,
-                    existing_aliases,
-                    ambush_points_remaining,
-                    all_zombie_costs,
-                    allow_flag_zombies=is_flag_wave,
-                    zombie_variant_groups=zombie_variant_groups,
-                    variant_alias_to_roll=variant_alias_to_roll,
-                )
-                if objects:
-                    grid_event_objects.extend(objects)
-                    wave_refs[wave - 1].extend(refs)
-            elif event_kind == "dino_ambush":
-                event_objs, refs, ambush_points_remaining = build_dino_events(
-                    wave,
-                    ambush_count,
-                    event_cfg,
-                    existing_aliases,
-                    ambush_points_remaining,
-                    current_wave_zombies,
-                )
-                grid_event_objects.extend(event_objs)
-                wave_refs[wave - 1].extend(refs)
-                # Row-pressure: for each dino spawned, bias zombies in the next 3 waves
-                # into the same row.  Ptero only allows DINO_PTERO_SUPPORT_ZOMBIES; others
-                # allow any zombie type.  A fraction cap prevents all zombies going to one row.
-                for dino_obj in event_objs:
-                    objdata = dino_obj.get("objdata", {})
-                    dino_row = objdata.get("DinoRow")
-                    dino_type = objdata.get("DinoType", "")
-                    if dino_row is None:
-                        continue
-                    is_ptero = "ptero" in dino_type.lower()
-                    for future_wave in range(wave + 1, min(wave + 4, wave_count + 1)):
-                        apply_dino_row_pressure(
-                            wave_zombies_by_wave[future_wave - 1],
-                            dino_row,
-                            is_ptero,
-                            zombie_rtid,
-                        )
-            elif event_kind == "tide_change":
-                event_obj, event_ref = build_tide_change_event(
-                    wave,
-                    ambush_count,
-                    event_cfg,
-                    existing_aliases,
-                )
-                if event_obj is not None and event_ref is not None:
-                    grid_event_objects.append(event_obj)
-                    wave_refs[wave - 1].append(event_ref)
+    phase_started = profile.lap("ambush_selection", phase_started)
 
-    level_definition = copy.deepcopy(level_definition_template)
+    level_definition = copy_config_value(level_definition_template)
+    if isinstance(level_definition.get("Modules"), list):
+        level_definition["Modules"] = list(level_definition["Modules"])
     level_definition["Name"] = level_name
     level_definition["StartingSun"] = starting_sun
 
-    music_choice = random.choice(["MiniGame_A", "MiniGame_B", None])
+    music_choice = level_random.stream("music").choice(["MiniGame_A", "MiniGame_B", None])
     if music_choice is not None:
         level_definition["MusicType"] = music_choice
+    phase_started = profile.lap("level_assembly", phase_started)
 
+    # Each placement builder marks what it places, so later builders avoid it.
+    lawn = LawnOccupancy()
     initial_grid_item_entry = build_initial_grid_item_object(
+        level_random.stream("initial_grid_items"),
         template.get("initial_grid_items", {}),
-        {"plank_rows": plankrows if planks else []},
+        {"plank_rows": plankrows if planks else [], "lawn": lawn},
     )
-    initial_grid_item_cells = set()
-    if initial_grid_item_entry is not None:
-        for placement in initial_grid_item_entry["object"]["objdata"].get("InitialGridItemPlacements", []):
-            initial_grid_item_cells.add(
-                (
-                    as_int(placement.get("GridX"), "InitialGridItemPlacements[].GridX"),
-                    as_int(placement.get("GridY"), "InitialGridItemPlacements[].GridY"),
-                )
-            )
+    phase_started = profile.lap("initial_grid_items", phase_started)
     initial_zombie_entry = build_initial_zombie_object(
+        level_random.stream("initial_zombies"),
         template.get("initial_zombies", {}),
         {
-            "blocked_cells": initial_grid_item_cells,
+            "lawn": lawn,
             "default_zombie_pool": selected_pool,
             "plank_rows": plankrows if planks else [],
         },
@@ -6251,6 +7495,7 @@ def build_level(template):
         zombie_costs=all_zombie_costs,
         variant_alias_to_roll=variant_alias_to_roll,
     )
+    phase_started = profile.lap("initial_zombies", phase_started)
     initial_tide_entry = build_initial_tide_object(template.get("initial_tide"))
     required_modules = []
     for module in normalize_module_list(
@@ -6280,12 +7525,12 @@ def build_level(template):
             if module_rtid not in modules:
                 modules.append(module_rtid)
 
-    seed_bank = copy.deepcopy(template.get("seed_bank", {}))
+    seed_bank = copy_config_value(template.get("seed_bank", {}))
 
     if not isinstance(seed_bank, dict):
         raise ValueError("seed_bank must be an object")
 
-    escalation = copy.deepcopy(template.get("escalation", {}))
+    escalation = copy_config_value(template.get("escalation", {}))
     if not isinstance(escalation, dict):
         raise ValueError("escalation must be an object")
     escalation["FlagCount"] = flag_count
@@ -6295,11 +7540,11 @@ def build_level(template):
     )
     escalation["ZombiePool"] = [zombie_rtid[name] for name in selected_pool]
 
-    wave_manager_module = copy.deepcopy(template.get("wave_manager_module", {}))
+    wave_manager_module = copy_config_value(template.get("wave_manager_module", {}))
     if not isinstance(wave_manager_module, dict):
         raise ValueError("wave_manager_module must be an object")
 
-    wave_manager = copy.deepcopy(template.get("wave_manager", {}))
+    wave_manager = copy_config_value(template.get("wave_manager", {}))
     if not isinstance(wave_manager, dict):
         raise ValueError("wave_manager must be an object")
     wave_manager["FlagWaveInterval"] = flag_interval
@@ -6310,7 +7555,7 @@ def build_level(template):
 
     if "railcarts" in template:
 
-        railcarts = generate_random_railcarts()
+        railcarts = generate_random_railcarts(level_random.stream("railcarts"))
 
     level_objects = [
         {
@@ -6387,15 +7632,11 @@ def build_level(template):
         "version": as_int(template.get("version", 1), "version"),
     }
 
+    phase_started = profile.lap("level_assembly", phase_started)
     output_file.parent.mkdir(parents=True, exist_ok=True)
-    dump_kwargs = {}
-    if json_indent is None:
-        dump_kwargs["separators"] = (",", ":")
-    else:
-        dump_kwargs["indent"] = json_indent
-
     with output_file.open("w", encoding="utf-8") as file:
-        json.dump(level, file, **dump_kwargs)
+        write_level_json(file, level, json_indent)
+    profile.lap("serialization", phase_started)
 
     print(
         f"Generated {output_file} with {wave_count} waves, "
@@ -6404,17 +7645,202 @@ def build_level(template):
     )
 
 
-def main():
-    template_path = Path(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_TEMPLATE_PATH
+def load_level_template(template_path):
     template = load_json_file(template_path, "Level template")
     if not isinstance(template, dict):
         raise ValueError("Template root must be a JSON object")
-    build_level(template)
+    return template
+
+
+def parse_seed_list(raw_value):
+    seeds = []
+    for part in str(raw_value).split(","):
+        part = part.strip()
+        if not part:
+            continue
+        low_text, separator, high_text = part.partition("-")
+        try:
+            low = int(low_text)
+            high = int(high_text) if separator else low
+        except ValueError as exc:
+            raise argparse.ArgumentTypeError(f"--seeds must look like 1-100 or 1,5,9, got {raw_value!r}") from exc
+        if low > high:
+            raise argparse.ArgumentTypeError(f"--seeds range {part!r} min cannot be greater than max")
+        seeds.extend(range(low, high + 1))
+    if not seeds:
+        raise argparse.ArgumentTypeError("--seeds cannot be empty")
+    return list(dict.fromkeys(seeds))
+
+
+def build_batch_jobs(template_paths, seeds, output_dir, profile=False):
+    jobs = []
+    output_owners = {}
+    for template_path in template_paths:
+        template = load_level_template(template_path)
+        for seed in seeds or [None]:
+            job_template = copy.deepcopy(template)
+            label = template_path.stem
+            if seed is not None:
+                job_template["random_seed"] = seed
+                label = f"{label}_{seed}"
+            output_file = output_dir / f"{label}.json"
+            owner = output_owners.setdefault(output_file, template_path)
+            if owner != template_path:
+                raise ValueError(
+                    f"{template_path} and {owner} would both write {output_file}; rename one template"
+                )
+            job_template["output_file"] = str(output_file)
+            jobs.append({"label": label, "template": job_template, "profile": profile})
+    return jobs
+
+
+def warm_zombie_catalogs(source_specs):
+    for types_file, props_file, catalog_snapshot in source_specs:
+        get_zombie_catalog(types_file, props_file, catalog_snapshot)
+
+
+def run_batch_job(job):
+    started = time.perf_counter()
+    profile = LevelProfile()
+    try:
+        build_level(job["template"], profile)
+    except Exception as error:
+        return job["label"], time.perf_counter() - started, str(error), None
+    profile_data = profile.as_dict() if job["profile"] else None
+    return job["label"], time.perf_counter() - started, None, profile_data
+
+
+def run_batch(template_paths, seeds, output_dir, jobs_count, profile=False):
+    jobs = build_batch_jobs(template_paths, seeds, output_dir, profile)
+    source_specs = list(dict.fromkeys(resolve_zombie_sources(job["template"]) for job in jobs))
+    # Load (and snapshot) each catalog once up front; forked workers inherit it,
+    # spawned workers read the fresh snapshot in the initializer.
+    warm_zombie_catalogs(source_specs)
+
+    started = time.perf_counter()
+    if jobs_count <= 1 or len(jobs) <= 1:
+        results = [run_batch_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=min(jobs_count, len(jobs)),
+            initializer=warm_zombie_catalogs,
+            initargs=(source_specs,),
+        ) as executor:
+            results = list(executor.map(run_batch_job, jobs))
+    elapsed = time.perf_counter() - started
+
+    label_width = max(len(label) for label, _, _, _ in results)
+    print("")
+    print(f"{'Level'.ljust(label_width)}  Seconds")
+    failures = 0
+    for label, seconds, error, _ in results:
+        line = f"{label.ljust(label_width)}  {seconds:7.3f}"
+        if error is not None:
+            failures += 1
+            line += f"  ERROR: {error}"
+        print(line)
+    print(
+        f"{len(results) - failures}/{len(results)} level(s) generated in {elapsed:.2f}s "
+        f"({sum(seconds for _, seconds, _, _ in results):.2f}s of build time)"
+    )
+    profiles = {label: profile_data for label, _, _, profile_data in results if profile_data is not None}
+    return failures, profiles
+
+
+def print_level_profile(profile, level_count):
+    total_seconds = sum(entry["seconds"] for entry in profile.phases.values())
+    name_width = max(len(name) for name in ["Counter", *profile.phases, *profile.counters])
+    print("")
+    print(f"Profile of {level_count} level(s)")
+    print(f"{'Phase'.ljust(name_width)}  {'Calls':>7}  {'Seconds':>9}  {'Share':>6}")
+    for phase, entry in profile.phases.items():
+        share = entry["seconds"] / total_seconds if total_seconds else 0.0
+        print(f"{phase.ljust(name_width)}  {entry['calls']:>7}  {entry['seconds']:>9.4f}  {share:>6.1%}")
+    print(f"{'total'.ljust(name_width)}  {'':>7}  {total_seconds:>9.4f}  {1.0:>6.1%}")
+    if profile.counters:
+        print("")
+        print(f"{'Counter'.ljust(name_width)}  {'Count':>9}")
+        for counter, amount in profile.counters.items():
+            print(f"{counter.ljust(name_width)}  {amount:>9}")
+
+
+def report_level_profiles(profiles, json_path=None):
+    if not profiles:
+        print("No level finished, nothing to profile.")
+        return
+    total = LevelProfile()
+    for profile_data in profiles.values():
+        total.merge(profile_data)
+    print_level_profile(total, len(profiles))
+    if json_path is not None:
+        json_path.parent.mkdir(parents=True, exist_ok=True)
+        report = {"levels": profiles, "total": total.as_dict()}
+        json_path.write_text(json_backend.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"Wrote profile to {json_path}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Generate PvZ2 levels from one or more level templates."
+    )
+    parser.add_argument(
+        "templates",
+        nargs="*",
+        type=Path,
+        help=f"Level template(s) to build. Default: {DEFAULT_TEMPLATE_PATH}",
+    )
+    parser.add_argument(
+        "--seeds",
+        type=parse_seed_list,
+        help="Batch mode: build every template once per seed, for example 1-100 or 1,5,9.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Batch mode: number of worker processes. Default: CPU count",
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=Path("batch_output"),
+        help="Batch mode: directory for <template>_<seed>.json outputs. Default: ./batch_output",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print time and call counts per build phase and ambush builder, plus wave fill counters.",
+    )
+    parser.add_argument(
+        "--profile-json",
+        type=Path,
+        help="Also write the profile (per level and totals) to this JSON file. Implies --profile.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    template_paths = args.templates or [DEFAULT_TEMPLATE_PATH]
+    profile = args.profile or args.profile_json is not None
+    if args.seeds is None and len(template_paths) == 1:
+        level_profile = LevelProfile()
+        build_level(load_level_template(template_paths[0]), level_profile)
+        if profile:
+            report_level_profiles({template_paths[0].stem: level_profile.as_dict()}, args.profile_json)
+        return
+
+    failures, profiles = run_batch(template_paths, args.seeds, args.output_dir, args.jobs, profile)
+    if profile:
+        report_level_profiles(profiles, args.profile_json)
+    if failures:
+        raise SystemExit(1)
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     try:
         main()
     except Exception as error:
         print(f"ERROR: {error}", file=sys.stderr)
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
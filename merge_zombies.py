@@ -1,8 +1,10 @@
-import json
 import random
 from dataclasses import dataclass, field
 from pathlib import Path
 
+import json_backend
+from lawn import LAWN_COLUMN_REGIONS, LawnOccupancy, iter_bits, region_column_mask
+
 
 @dataclass(frozen=True)
 class ZombieType:
@@ -154,8 +156,8 @@ def pick_plantfood_waves(rng: random.Random, cfg: LevelConfig) -> list[int]:
     return sorted(rng.sample(population, count))
 
 
-def make_empty_occupancy(cfg: LevelConfig) -> set[tuple[int, int]]:
-    return set()
+def make_empty_occupancy(cfg: LevelConfig) -> LawnOccupancy:
+    return LawnOccupancy()
 
 
 def lane_allowed_for_stage(stage: str, row: int) -> bool:
@@ -182,23 +184,13 @@ def random_grave_count(rng: random.Random, cfg: LevelConfig) -> int:
 
 
 def allowed_columns_for_zone(zone: str) -> list[int]:
-    back = list(range(0, 5))
-    middle = list(range(3, 6))
-    front = list(range(5, 9))
-    if zone == "back":
-        return back
-    if zone == "middle":
-        return middle
-    if zone == "front":
-        return front
-    if zone == "back_middle":
-        return sorted(set(back + middle))
-    if zone == "middle_front":
-        return sorted(set(middle + front))
-    return list(range(0, 9))
-
-
-def place_graves(rng: random.Random, cfg: LevelConfig, occupied: set[tuple[int, int]]) -> list[dict]:
+    region_names = zone.split("_")
+    if not all(name in LAWN_COLUMN_REGIONS for name in region_names):
+        return list(range(0, 9))
+    return list(iter_bits(region_column_mask(region_names)))
+
+
+def place_graves(rng: random.Random, cfg: LevelConfig, occupied: LawnOccupancy) -> list[dict]:
     placements = []
     target = random_grave_count(rng, cfg)
     attempts = 0
@@ -212,7 +204,7 @@ def place_graves(rng: random.Random, cfg: LevelConfig, occupied: set[tuple[int,
             continue
         g = rng.choice(GRAVE_TYPES)
         placements.append({"GridX": x, "GridY": y, "TypeName": g})
-        occupied.add((x, y))
+        occupied.add(x, y)
     return placements
 
 
@@ -227,7 +219,7 @@ def slider_position_ok(item_type: str, row: int) -> bool:
 def place_neat_items(
     rng: random.Random,
     cfg: LevelConfig,
-    occupied: set[tuple[int, int]],
+    occupied: LawnOccupancy,
     candidate_types: list[str],
 ) -> list[dict]:
     placements = []
@@ -249,7 +241,7 @@ def place_neat_items(
             if (x, y) in occupied:
                 continue
             placements.append({"GridX": x, "GridY": y, "TypeName": item_type})
-            occupied.add((x, y))
+            occupied.add(x, y)
     return placements
 
 
@@ -279,8 +271,7 @@ def parse_rtid_alias(rtid: str) -> str | None:
 
 
 def load_json(path: Path) -> dict:
-    with path.open("r", encoding="utf-8") as f:
-        return json.load(f)
+    return json_backend.load_path(path)
 
 
 def load_zombies_from_types_and_properties(
@@ -540,4 +531,4 @@ if __name__ == "__main__":
             "No zombies loaded from ZOMBIETYPES_UPDATED.json + ZOMBIEPROPERTIES_UPDATED.json."
         )
     level = build_level(config, zombies)
-    print(json.dumps(level, indent=2))
+    print(json_backend.dumps(level, indent=2))
@@ -0,0 +1,124 @@
+class WeightedSampler:
+    """Walker/Vose alias table over a fixed list of non-negative weights.
+
+    Building costs O(n); every draw after that is O(1) and uses one rng.random().
+    When no weight is positive, pick() falls back to a uniform choice.
+    Both samplers share one interface: len(), total() and pick(rng).
+    """
+
+    def __init__(self, weights):
+        weights = list(weights)
+        self.size = len(weights)
+        positive = [(index, weight) for index, weight in enumerate(weights) if weight > 0]
+        self.positive_total = sum(weight for _, weight in positive)
+        self.indexes = [index for index, _ in positive]
+        self.probability = [1.0] * len(positive)
+        self.alias = list(range(len(positive)))
+        if not positive:
+            return
+
+        scaled = [weight * len(positive) / self.positive_total for _, weight in positive]
+        small = [slot for slot, value in enumerate(scaled) if value < 1.0]
+        large = [slot for slot, value in enumerate(scaled) if value >= 1.0]
+        while small and large:
+            small_slot = small.pop()
+            large_slot = large[-1]
+            self.probability[small_slot] = scaled[small_slot]
+            self.alias[small_slot] = large_slot
+            scaled[large_slot] -= 1.0 - scaled[small_slot]
+            if scaled[large_slot] < 1.0:
+                small.append(large.pop())
+        # Whatever is left over is 1.0 up to rounding and keeps its own slot.
+
+    def __len__(self):
+        return self.size
+
+    def total(self):
+        return self.positive_total
+
+    def pick(self, rng):
+        if self.size == 0:
+            raise ValueError("cannot sample from an empty pool")
+        if not self.indexes:
+            return rng.randrange(self.size)
+
+        roll = rng.random() * len(self.indexes)
+        slot = int(roll)
+        if roll - slot >= self.probability[slot]:
+            slot = self.alias[slot]
+        return self.indexes[slot]
+
+
+class ShrinkingWeightedSampler:
+    """Fenwick tree over weights that can be removed between draws.
+
+    Draws and removals are O(log n). A draw rolls rng.uniform(0, total) and
+    returns the first index whose running total reaches the roll, the same entry a
+    linear scan over the remaining weights would return.
+    """
+
+    def __init__(self, weights):
+        self.weights = [float(weight) for weight in weights]
+        self.size = len(self.weights)
+        self.live = bytearray(b"\x01") * self.size
+        self.live_count = self.size
+        self.positive_count = sum(1 for weight in self.weights if weight > 0)
+        self.tree = [0.0] + self.weights
+        for position in range(1, self.size + 1):
+            parent = position + (position & -position)
+            if parent <= self.size:
+                self.tree[parent] += self.tree[position]
+
+    def __len__(self):
+        return self.live_count
+
+    def __contains__(self, index):
+        return 0 <= index < self.size and bool(self.live[index])
+
+    def total(self):
+        # Removals can leave rounding dust in the tree, so an empty pool reports 0.0.
+        if self.positive_count == 0:
+            return 0.0
+        total = 0.0
+        position = self.size
+        while position > 0:
+            total += self.tree[position]
+            position -= position & -position
+        return total
+
+    def remove(self, index):
+        if not self.live[index]:
+            return
+        self.live[index] = 0
+        self.live_count -= 1
+        weight = self.weights[index]
+        self.weights[index] = 0.0
+        if weight > 0:
+            self.positive_count -= 1
+        position = index + 1
+        while position <= self.size:
+            self.tree[position] -= weight
+            position += position & -position
+
+    def pick(self, rng):
+        if self.live_count == 0:
+            raise ValueError("cannot sample from an empty pool")
+
+        if self.positive_count == 0:
+            return rng.choice([index for index, live in enumerate(self.live) if live])
+
+        roll = rng.uniform(0.0, self.total())
+        # Walk down the tree to the last position whose running total is below the roll.
+        position = 0
+        step = 1 << self.size.bit_length()
+        while step:
+            next_position = position + step
+            if next_position <= self.size and self.tree[next_position] < roll:
+                position = next_position
+                roll -= self.tree[next_position]
+            step >>= 1
+
+        index = self.live.find(1, position) if position < self.size else -1
+        if index == -1:
+            index = self.live.rfind(1)
+        return index
@@ -0,0 +1,68 @@
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import main
+
+
+def slider_config(count, columns, up_weight=1, down_weight=1, max_attempts=200):
+    return {
+        "enabled": True,
+        "x_range": [0, 8],
+        "y_range": [0, 4],
+        "types": [
+            {
+                "placement_mode": "slider_cells",
+                "up_type_name": "slider_up",
+                "down_type_name": "slider_down",
+                "up_weight": up_weight,
+                "down_weight": down_weight,
+                "count_range": [count, count],
+                "columns": columns,
+                "max_attempts": max_attempts,
+                "required": True,
+            }
+        ],
+    }
+
+
+def assert_valid_slider_layout(placements):
+    sliders = [
+        (placement["GridX"], placement["GridY"], "up" if placement["TypeName"] == "slider_up" else "down")
+        for placement in placements
+    ]
+    assert len({(x, y) for x, y, _ in sliders}) == len(sliders)
+    columns_by_row = {}
+    for x, y, direction in sliders:
+        assert y > 0 if direction == "up" else y < 4
+        columns_by_row.setdefault(y, []).append(x)
+    for row_value, row_columns in columns_by_row.items():
+        row_columns.sort()
+        for left_x, right_x in zip(row_columns, row_columns[1:]):
+            assert any(
+                left_x < x < right_x
+                and (y, direction) in ((row_value + 1, "up"), (row_value - 1, "down"))
+                for x, y, direction in sliders
+            ), f"sliders at x={left_x} and x={right_x} in row {row_value} are not enabled"
+
+
+@pytest.mark.parametrize("seed", [1, 2])
+def test_slider_cells_finds_crowded_layout(seed):
+    # 14 sliders in these columns only fit a few layouts; restarting greedy passes missed them.
+    result = main.build_initial_grid_item_object(
+        random.Random(seed),
+        slider_config(14, [0, 1, 2, 3, 5, 7, 8], up_weight=1, down_weight=2),
+        {},
+    )
+    placements = result["object"]["objdata"]["InitialGridItemPlacements"]
+    assert len(placements) == 14
+    assert_valid_slider_layout(placements)
+
+
+def test_slider_cells_reports_the_most_that_fit():
+    with pytest.raises(ValueError, match="can place at most 19 slider"):
+        main.build_initial_grid_item_object(random.Random(0), slider_config(20, list(range(9))), {})